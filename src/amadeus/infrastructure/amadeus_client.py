@@ -1,65 +1,236 @@
 """Amadeus API client for flight and location searches."""
-import requests
-from typing import List, Dict
+import asyncio
+import importlib.util
+import json
+from typing import Any, Dict, List, Optional
+import httpx
+from amadeus.infrastructure.resilience import CircuitBreaker, RetryBudget, RetryPolicy, parse_retry_after
+from amadeus.infrastructure.token_manager import AmadeusTokenManager
 from shared.config import settings
+from shared.quota_manager import quota_manager
 from shared.logging import setup_logger, log_function_call, log_function_result, log_function_error
 
 class AmadeusClient:
-  """Client for interacting with the Amadeus API.
-  
+  """Async client for interacting with the Amadeus API.
+
   Handles authentication, location searches, and flight searches
-  using the Amadeus Test API endpoints.
+  using the Amadeus Test API endpoints. All requests share one
+  keep-alive connection pool, so concurrent searches overlap their
+  network waits instead of blocking the event loop. Throttled (429) and
+  server error responses are retried with backoff under a per-endpoint
+  retry budget, and a per-endpoint circuit breaker fails fast while
+  Amadeus is degraded.
   """
   def __init__(self):
-    """Initialize the Amadeus client and obtain access token."""
+    """Initialize the Amadeus client.
+
+    The HTTP connection pool and the access token are created lazily
+    on the first request, so construction never touches the network.
+    The token is then kept fresh by an AmadeusTokenManager.
+    """
     self.logger = setup_logger("amadeus_client")
     self.logger.info("Initializing AmadeusClient")
     self.client_id = settings.AMADEUS_CLIENT_ID
     self.client_secret = settings.AMADEUS_CLIENT_SECRET
-    self.logger.debug("Getting access token")
-    self.access_token = self.get_access_token()
+    self.base_url = settings.AMADEUS_BASE_URL.rstrip("/")
+    self._http_client: Optional[httpx.AsyncClient] = None
+    self.token_manager = AmadeusTokenManager(
+      fetch_token=self._request_access_token,
+      client_id=self.client_id,
+      refresh_margin_seconds=settings.AMADEUS_TOKEN_REFRESH_MARGIN_SECONDS,
+      cache_dir=settings.AMADEUS_TOKEN_CACHE_DIR if settings.AMADEUS_TOKEN_SHARED_CACHE else None
+    )
+    self.retry_policy = RetryPolicy(
+      max_attempts=settings.AMADEUS_RETRY_MAX_ATTEMPTS,
+      base_delay=settings.AMADEUS_RETRY_BASE_DELAY_SECONDS,
+      max_delay=settings.AMADEUS_RETRY_MAX_DELAY_SECONDS
+    )
+    self._retry_budgets: Dict[str, RetryBudget] = {}
+    self._circuit_breakers: Dict[str, CircuitBreaker] = {}
     self.logger.info("AmadeusClient initialized successfully")
-  
-  def get_access_token(self) -> str:
-    """Obtain an OAuth2 access token from Amadeus API.
-    
+
+  def _get_http_client(self) -> httpx.AsyncClient:
+    """Get or create the shared pooled HTTP client.
+
+    HTTP/2 is only enabled when the optional ``h2`` package is installed.
+
+    Returns:
+      Shared httpx AsyncClient instance
+    """
+    if self._http_client is None or self._http_client.is_closed:
+      http2 = settings.AMADEUS_HTTP2 and importlib.util.find_spec("h2") is not None
+      self.logger.info(f"Creating Amadeus HTTP connection pool (http2={http2})")
+      self._http_client = httpx.AsyncClient(
+        base_url=self.base_url,
+        http2=http2,
+        headers={"Accept-Encoding": "gzip, deflate"},
+        limits=httpx.Limits(
+          max_connections=settings.AMADEUS_MAX_CONNECTIONS,
+          max_keepalive_connections=settings.AMADEUS_MAX_KEEPALIVE_CONNECTIONS,
+          keepalive_expiry=settings.AMADEUS_KEEPALIVE_EXPIRY_SECONDS
+        ),
+        timeout=httpx.Timeout(
+          settings.AMADEUS_TIMEOUT_SECONDS,
+          connect=settings.AMADEUS_CONNECT_TIMEOUT_SECONDS
+        )
+      )
+    return self._http_client
+
+  async def aclose(self) -> None:
+    """Stop token refreshes and close the shared HTTP connection pool."""
+    await self.token_manager.aclose()
+    if self._http_client is not None and not self._http_client.is_closed:
+      self.logger.info("Closing Amadeus HTTP connection pool")
+      await self._http_client.aclose()
+    self._http_client = None
+
+  async def get_access_token(self) -> str:
+    """Get a valid OAuth2 access token for the Amadeus API.
+
     Returns:
       Access token string for API authentication
-      
+    """
+    return await self.token_manager.get_token()
+
+  async def _request_access_token(self) -> dict:
+    """Request a new OAuth2 access token from Amadeus API.
+
+    Returns:
+      Token endpoint response including ``access_token`` and ``expires_in``
+
     Raises:
       Exception: If token request fails
     """
     self.logger.info("Getting access token from Amadeus API")
-    log_function_call(self.logger, "get_access_token", {"client_id": self.client_id[:8] + "..."})
-    
-    url = "https://test.api.amadeus.com/v1/security/oauth2/token"
+    log_function_call(self.logger, "request_access_token", {"client_id": self.client_id[:8] + "..."})
+
+    url = "/v1/security/oauth2/token"
     headers = {"Content-Type": "application/x-www-form-urlencoded"}
     data = {
         "grant_type": "client_credentials",
         "client_id": self.client_id,
         "client_secret": self.client_secret
     }
-    
+
     try:
       self.logger.debug("Making POST request to Amadeus token endpoint")
-      response = requests.post(url, headers=headers, data=data)
+      response = await self._get_http_client().post(url, headers=headers, data=data)
       response.raise_for_status()
-      
+
       token_data = response.json()
-      access_token = token_data["access_token"]
-      
-      log_function_result(self.logger, "get_access_token", {"token_length": len(access_token)})
+      log_function_result(self.logger, "request_access_token", {
+        "token_length": len(token_data["access_token"]),
+        "expires_in": token_data.get("expires_in")
+      })
       self.logger.info("Access token obtained successfully")
-      return access_token
-        
+      return token_data
+
     except Exception as e:
-      log_function_error(self.logger, "get_access_token", e)
+      log_function_error(self.logger, "request_access_token", e)
       self.logger.error("Failed to get access token")
       raise
-  
-  def search_flights(self, origin: str, destination: str, start_date: str, end_date: str, max_price: int = 99999, adults: int = 1) -> list[dict]:
-    """Search for flight offers between origin and destination.
-    
+
+  def _get_circuit_breaker(self, endpoint: str) -> CircuitBreaker:
+    if endpoint not in self._circuit_breakers:
+      self._circuit_breakers[endpoint] = CircuitBreaker(
+        endpoint,
+        failure_threshold=settings.AMADEUS_CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout=settings.AMADEUS_CIRCUIT_RESET_TIMEOUT_SECONDS
+      )
+    return self._circuit_breakers[endpoint]
+
+  def _get_retry_budget(self, endpoint: str) -> RetryBudget:
+    if endpoint not in self._retry_budgets:
+      self._retry_budgets[endpoint] = RetryBudget(ratio=settings.AMADEUS_RETRY_BUDGET_RATIO)
+    return self._retry_budgets[endpoint]
+
+  async def _send(self, url: str, params: Dict[str, Any]) -> httpx.Response:
+    """Send an authenticated GET request, refreshing the token once on a 401.
+
+    Each request sent, the 401 retry included, takes an Amadeus quota slot.
+    """
+    await quota_manager.acquire("amadeus")
+    access_token = await self.get_access_token()
+    response = await self._get_http_client().get(url, headers={"Authorization": f"Bearer {access_token}"}, params=params)
+    if response.status_code == 401:
+      access_token = await self.token_manager.invalidate(access_token)
+      await quota_manager.acquire("amadeus")
+      response = await self._get_http_client().get(url, headers={"Authorization": f"Bearer {access_token}"}, params=params)
+    return response
+
+  async def _get(self, url: str, params: Dict[str, Any], endpoint: str) -> dict:
+    """Perform an authenticated GET request and decode the JSON body.
+
+    Args:
+      url: Endpoint path relative to the Amadeus base URL
+      params: Query parameters; entries set to None are omitted
+      endpoint: Name used to scope the retry budget and circuit breaker
+
+    Returns:
+      Decoded JSON response body
+    """
+    return json.loads(await self._get_bytes(url, params, endpoint))
+
+  async def _get_bytes(self, url: str, params: Dict[str, Any], endpoint: str) -> bytes:
+    """Perform an authenticated GET request with retries and circuit breaking.
+
+    Args:
+      url: Endpoint path relative to the Amadeus base URL
+      params: Query parameters; entries set to None are omitted
+      endpoint: Name used to scope the retry budget and circuit breaker
+
+    Returns:
+      Raw response body
+
+    Raises:
+      CircuitOpenError: If the endpoint's circuit breaker is open
+      httpx.HTTPStatusError: If the response status is not successful
+      httpx.TransportError: If the request keeps failing at the network level
+    """
+    params = {key: value for key, value in params.items() if value is not None}
+    breaker = self._get_circuit_breaker(endpoint)
+    budget = self._get_retry_budget(endpoint)
+    probe = breaker.before_call()
+    budget.deposit()
+
+    try:
+      attempt = 0
+      while True:
+        retry_after = None
+        try:
+          response = await self._send(url, params)
+          if response.status_code not in self.retry_policy.retry_statuses:
+            breaker.record_success()
+            response.raise_for_status()
+            return response.content
+          retry_after = parse_retry_after(response.headers.get("Retry-After"))
+          response.raise_for_status()
+        except (httpx.HTTPStatusError, httpx.TransportError) as e:
+          if isinstance(e, httpx.HTTPStatusError) and e.response.status_code not in self.retry_policy.retry_statuses:
+            raise
+          attempt += 1
+          delay = retry_after if retry_after is not None else self.retry_policy.backoff(attempt)
+          if attempt >= self.retry_policy.max_attempts or delay > self.retry_policy.max_delay or not budget.try_withdraw():
+            breaker.record_failure()
+            raise
+          self.logger.warning(f"Amadeus {endpoint} request failed ({e}), retry {attempt} in {delay:.2f} seconds")
+          await asyncio.sleep(delay)
+    finally:
+      # A probe ending without success or failure (cancelled, rejected
+      # request, unexpected error) must not leave the circuit half-open.
+      if probe:
+        breaker.release_probe()
+
+  async def search_flights_raw(self, origin: str, destination: str, start_date: str, end_date: str, max_price: int = 99999, adults: int = 1,
+                               max_results: int = 1, non_stop: bool = False, included_airline_codes: Optional[List[str]] = None,
+                               excluded_airline_codes: Optional[List[str]] = None, travel_class: Optional[str] = None,
+                               currency: Optional[str] = None) -> bytes:
+    """Search for flight offers and return the undecoded response.
+
+    Every filter is passed to Amadeus so that filtering happens server-side.
+    The flight offers search is not paginated: ``max_results`` offers come
+    back in a single response.
+
     Args:
       origin: IATA code of the origin airport
       destination: IATA code of the destination airport
@@ -67,25 +238,19 @@ class AmadeusClient:
       end_date: Return date (YYYY-MM-DD)
       max_price: Maximum price filter in USD
       adults: Number of adult passengers
-      
+      max_results: Maximum number of offers to return
+      non_stop: Whether to return direct flights only
+      included_airline_codes: Airline codes to restrict the search to
+      excluded_airline_codes: Airline codes to leave out of the search
+      travel_class: Cabin class (ECONOMY, PREMIUM_ECONOMY, BUSINESS or FIRST)
+      currency: ISO 4217 currency of the prices
+
     Returns:
-      List of flight offers matching the search criteria
-      
+      Flight offers response body as JSON bytes
+
     Raises:
       Exception: If flight search fails
     """
-    self.logger.info(f"Searching flights from {origin} to {destination}")
-    log_function_call(self.logger, "search_flights", {
-      "origin": origin,
-      "destination": destination,
-      "start_date": start_date,
-      "end_date": end_date,
-      "max_price": max_price,
-      "adults": adults
-    })
-    
-    url = f"https://test.api.amadeus.com/v2/shopping/flight-offers"
-    headers = {"Authorization": f"Bearer {self.access_token}"}
     params = {
       "originLocationCode": origin,
       "destinationLocationCode": destination,
@@ -93,73 +258,66 @@ class AmadeusClient:
       "returnDate": end_date,
       "maxPrice": max_price,
       "adults": adults,
-      "max": 1
+      "max": max_results,
+      "nonStop": "true" if non_stop else None,
+      "includedAirlineCodes": ",".join(included_airline_codes) if included_airline_codes else None,
+      "excludedAirlineCodes": ",".join(excluded_airline_codes) if excluded_airline_codes else None,
+      "travelClass": travel_class,
+      "currencyCode": currency
     }
-    
+    self.logger.info(f"Searching flights from {origin} to {destination}")
+    log_function_call(self.logger, "search_flights", params)
+
+    url = "/v2/shopping/flight-offers"
+
     try:
       self.logger.debug(f"Making GET request to flight offers endpoint with params: {params}")
-      response = requests.get(url, headers=headers, params=params)
-      response.raise_for_status()
-      
-      result = response.json()
+      payload = await self._get_bytes(url, params, endpoint="flight_offers")
       log_function_result(self.logger, "search_flights", {
           "origin": origin,
           "destination": destination,
-          "result_count": len(result.get("data", [])) if isinstance(result, dict) else len(result) if isinstance(result, list) else "unknown"
+          "response_bytes": len(payload)
       })
       self.logger.info(f"Flight search completed from {origin} to {destination}")
-      return result
-        
+      return payload
+
     except Exception as e:
-      log_function_error(self.logger, "search_flights", e, {
-        "origin": origin,
-        "destination": destination,
-        "start_date": start_date,
-        "end_date": end_date,
-        "max_price": max_price,
-        "adults": adults
-      })
+      log_function_error(self.logger, "search_flights", e, params)
       self.logger.error(f"Failed to search flights from {origin} to {destination}")
       raise
-    
-  def search_locations(self, keyword: str) -> list[dict]:
+
+  async def search_locations(self, keyword: str) -> dict:
     """Search for location codes by city name.
-    
+
     Args:
       keyword: City name or keyword to search for
-      
+
     Returns:
-      List of location objects with IATA codes
-      
+      Raw locations response with IATA codes
+
     Raises:
       Exception: If location search fails
     """
     self.logger.info(f"Searching locations for keyword: {keyword}")
     log_function_call(self.logger, "search_locations", {"keyword": keyword})
-    
-    url = f"https://test.api.amadeus.com/v1/reference-data/locations"
-    headers = {
-      "Authorization": f"Bearer {self.access_token}"
-    }
+
+    url = "/v1/reference-data/locations"
     params = {
       "subType": "CITY",
       "keyword": keyword
     }
-    
+
     try:
       self.logger.debug(f"Making GET request to locations endpoint with params: {params}")
-      response =  requests.get(url, headers=headers, params=params)
-      response.raise_for_status()
-      
-      result = response.json()
+      result = await self._get(url, params, endpoint="locations")
       log_function_result(self.logger, "search_locations", {
         "keyword": keyword,
         "result_count": len(result.get("data", [])) if isinstance(result, dict) else len(result) if isinstance(result, list) else "unknown"
       })
       self.logger.info(f"Location search completed for keyword: {keyword}")
       return result
-      
+
     except Exception as e:
       log_function_error(self.logger, "search_locations", e, {"keyword": keyword})
       self.logger.error(f"Failed to search locations for keyword: {keyword}")
-      raise
\ No newline at end of file
+      raise
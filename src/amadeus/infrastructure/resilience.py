@@ -0,0 +1,168 @@
+"""Retry, backoff and circuit breaking primitives for Amadeus API calls."""
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import FrozenSet, Optional
+from shared.logging import setup_logger
+
+class CircuitOpenError(Exception):
+  """Raised when a call is rejected because the circuit breaker is open."""
+  def __init__(self, endpoint: str, retry_in: float):
+    super().__init__(f"Amadeus endpoint '{endpoint}' is unavailable, circuit open for another {retry_in:.1f} seconds")
+    self.endpoint = endpoint
+    self.retry_in = retry_in
+
+@dataclass
+class RetryPolicy:
+  """Retry settings with jittered exponential backoff."""
+  max_attempts: int = 3
+  base_delay: float = 0.5
+  max_delay: float = 8.0
+  retry_statuses: FrozenSet[int] = field(default_factory=lambda: frozenset({429, 500, 502, 503, 504}))
+
+  def backoff(self, attempt: int) -> float:
+    """Full-jitter exponential backoff delay for the given retry attempt.
+
+    Args:
+      attempt: Number of the retry, starting at 1
+
+    Returns:
+      Delay in seconds before the retry
+    """
+    return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+  """Parse a Retry-After header given either in seconds or as an HTTP date.
+
+  Args:
+    value: Raw header value
+
+  Returns:
+    Delay in seconds, or None if the header is missing or invalid
+  """
+  if not value:
+    return None
+  try:
+    return max(0.0, float(value))
+  except ValueError:
+    pass
+  try:
+    retry_at = parsedate_to_datetime(value)
+  except (TypeError, ValueError):
+    return None
+  if retry_at.tzinfo is None:
+    retry_at = retry_at.replace(tzinfo=timezone.utc)
+  return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+class RetryBudget:
+  """Token bucket limiting retries to a fraction of the request volume.
+
+  Every request deposits ``ratio`` tokens and every retry withdraws one,
+  so a degraded endpoint cannot multiply its own load with retries.
+  """
+  def __init__(self, ratio: float = 0.2, capacity: float = 10.0):
+    """Initialize the retry budget.
+
+    Args:
+      ratio: Tokens earned per request
+      capacity: Maximum number of stored tokens
+    """
+    self.ratio = ratio
+    self.capacity = capacity
+    self.tokens = capacity
+
+  def deposit(self) -> None:
+    """Record a request."""
+    self.tokens = min(self.capacity, self.tokens + self.ratio)
+
+  def try_withdraw(self) -> bool:
+    """Consume one retry token if available.
+
+    Returns:
+      True if the retry is allowed
+    """
+    if self.tokens >= 1.0:
+      self.tokens -= 1.0
+      return True
+    return False
+
+class CircuitBreaker:
+  """Consecutive-failure circuit breaker with a half-open probe.
+
+  After ``failure_threshold`` consecutive failed calls the circuit opens and
+  calls fail fast for ``reset_timeout`` seconds. A single probe call is then
+  let through; its outcome closes or re-opens the circuit. A probe that ends
+  without an outcome (cancelled, or failed for an unrelated reason) must be
+  released, and one that is never resolved expires after ``reset_timeout``.
+  """
+  CLOSED = "closed"
+  OPEN = "open"
+  HALF_OPEN = "half_open"
+
+  def __init__(self, endpoint: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+    """Initialize the circuit breaker.
+
+    Args:
+      endpoint: Name of the protected endpoint
+      failure_threshold: Consecutive failures that open the circuit
+      reset_timeout: Seconds to wait before probing an open circuit
+    """
+    self.endpoint = endpoint
+    self.failure_threshold = failure_threshold
+    self.reset_timeout = reset_timeout
+    self.state = self.CLOSED
+    self.failures = 0
+    self.opened_at = 0.0
+    self.probe_started_at = 0.0
+    self.logger = setup_logger("amadeus_circuit_breaker")
+
+  def before_call(self) -> bool:
+    """Check whether a call may proceed.
+
+    Returns:
+      True if the call is the half-open probe
+
+    Raises:
+      CircuitOpenError: If the circuit is open or a probe is already running
+    """
+    if self.state == self.CLOSED:
+      return False
+    now = time.monotonic()
+    if self.state == self.HALF_OPEN:
+      elapsed = now - self.probe_started_at
+      if elapsed >= self.reset_timeout:
+        self.logger.warning(f"Probe for {self.endpoint} expired, probing again")
+        self.probe_started_at = now
+        return True
+      raise CircuitOpenError(self.endpoint, max(0.0, self.reset_timeout - elapsed))
+    elapsed = now - self.opened_at
+    if elapsed >= self.reset_timeout:
+      self.logger.info(f"Circuit for {self.endpoint} half-open, probing")
+      self.state = self.HALF_OPEN
+      self.probe_started_at = now
+      return True
+    raise CircuitOpenError(self.endpoint, max(0.0, self.reset_timeout - elapsed))
+
+  def release_probe(self) -> None:
+    """Give back a half-open probe that ended without an outcome, so the next call probes again."""
+    if self.state == self.HALF_OPEN:
+      self.logger.info(f"Probe for {self.endpoint} ended without an outcome, circuit open")
+      self.state = self.OPEN
+
+  def record_success(self) -> None:
+    """Record a successful call."""
+    if self.state != self.CLOSED:
+      self.logger.info(f"Circuit for {self.endpoint} closed")
+    self.state = self.CLOSED
+    self.failures = 0
+
+  def record_failure(self) -> None:
+    """Record a failed call, opening the circuit if needed."""
+    self.failures += 1
+    if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+      if self.state != self.OPEN:
+        self.logger.warning(f"Circuit for {self.endpoint} opened after {self.failures} failures")
+      self.state = self.OPEN
+      self.opened_at = time.monotonic()
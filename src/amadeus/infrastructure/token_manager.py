@@ -0,0 +1,186 @@
+"""OAuth2 access token lifecycle management for the Amadeus API."""
+import asyncio
+import hashlib
+import json
+import os
+import random
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+from shared.logging import setup_logger, log_function_call, log_function_result, log_function_error
+
+try:
+  import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+  fcntl = None
+
+@dataclass
+class AccessToken:
+  """An OAuth2 access token with its absolute expiry time."""
+  value: str
+  expires_at: float
+
+  def remaining(self) -> float:
+    """Seconds left before the token expires."""
+    return self.expires_at - time.time()
+
+class AmadeusTokenManager:
+  """Keeps a valid Amadeus access token available.
+
+  The token is refreshed in the background shortly before it expires.
+  Concurrent refresh requests (for example several 401 responses at once)
+  share a single in-flight refresh. When a shared cache file is configured,
+  the token is stored on disk under an exclusive file lock so that every
+  worker process on the host reuses the same token instead of requesting
+  its own.
+  """
+  def __init__(self, fetch_token: Callable[[], Awaitable[dict]], client_id: str,
+               refresh_margin_seconds: float = 120.0, cache_dir: Optional[str] = None):
+    """Initialize the token manager.
+
+    Args:
+      fetch_token: Coroutine function returning the raw token endpoint response
+      client_id: Amadeus client ID, used to scope the shared cache file
+      refresh_margin_seconds: How long before expiry the token is refreshed
+      cache_dir: Directory for the cross-process token cache, or None to disable it
+    """
+    self.logger = setup_logger("amadeus_token_manager")
+    self._fetch_token = fetch_token
+    self.refresh_margin_seconds = refresh_margin_seconds
+    self._token: Optional[AccessToken] = None
+    self._refresh_task: Optional[asyncio.Task] = None
+    self._background_task: Optional[asyncio.Task] = None
+
+    self.cache_path: Optional[Path] = None
+    if cache_dir is not None:
+      scope = hashlib.sha256(client_id.encode("utf-8")).hexdigest()[:16]
+      self.cache_path = Path(cache_dir or tempfile.gettempdir()) / f"amadeus_token_{scope}.json"
+
+  def _is_fresh(self, token: Optional[AccessToken]) -> bool:
+    return token is not None and token.remaining() > self.refresh_margin_seconds
+
+  async def get_token(self) -> str:
+    """Return a valid access token, refreshing it if needed.
+
+    Returns:
+      Access token string for API authentication
+    """
+    if self._is_fresh(self._token):
+      return self._token.value
+    token = await self._refresh()
+    return token.value
+
+  async def invalidate(self, stale_token: str) -> str:
+    """Discard a token rejected by the API and return a replacement.
+
+    If another caller already replaced the stale token, the current token
+    is returned without a new refresh.
+
+    Args:
+      stale_token: Token value that was rejected with a 401
+
+    Returns:
+      A different, valid access token
+    """
+    if self._token is not None and self._token.value != stale_token and self._token.remaining() > 0:
+      return self._token.value
+    self.logger.warning("Access token rejected by Amadeus, refreshing")
+    token = await self._refresh(stale_token=stale_token)
+    return token.value
+
+  async def _refresh(self, stale_token: Optional[str] = None) -> AccessToken:
+    """Refresh the token, sharing one in-flight refresh between callers."""
+    if self._refresh_task is None or self._refresh_task.done():
+      self._refresh_task = asyncio.create_task(self._do_refresh(stale_token))
+    return await asyncio.shield(self._refresh_task)
+
+  async def _do_refresh(self, stale_token: Optional[str]) -> AccessToken:
+    log_function_call(self.logger, "refresh_token", {"shared_cache": str(self.cache_path)})
+    try:
+      if self.cache_path is not None:
+        token = await asyncio.to_thread(self._read_or_fetch_locked, stale_token, asyncio.get_running_loop())
+      else:
+        token = await self._fetch()
+      self._token = token
+      self._ensure_background_refresh()
+      log_function_result(self.logger, "refresh_token", {"expires_in": round(token.remaining())})
+      return token
+    except Exception as e:
+      log_function_error(self.logger, "refresh_token", e)
+      raise
+
+  async def _fetch(self) -> AccessToken:
+    token_data = await self._fetch_token()
+    expires_in = float(token_data.get("expires_in", 1799))
+    return AccessToken(value=token_data["access_token"], expires_at=time.time() + expires_in)
+
+  def _read_or_fetch_locked(self, stale_token: Optional[str], loop: asyncio.AbstractEventLoop) -> AccessToken:
+    """Reuse the shared cached token or fetch a new one under a file lock.
+
+    Runs in a worker thread so that waiting for the lock never blocks the
+    event loop; the actual HTTP request is scheduled back on the loop.
+    """
+    self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+    lock_path = self.cache_path.with_suffix(".lock")
+    with open(lock_path, "a+") as lock_file:
+      if fcntl is not None:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+      try:
+        cached = self._read_cache()
+        if self._is_fresh(cached) and cached.value != stale_token:
+          self.logger.info("Reusing access token from shared cache")
+          return cached
+        token = asyncio.run_coroutine_threadsafe(self._fetch(), loop).result()
+        self._write_cache(token)
+        return token
+      finally:
+        if fcntl is not None:
+          fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+  def _read_cache(self) -> Optional[AccessToken]:
+    try:
+      with open(self.cache_path, "r", encoding="utf-8") as cache_file:
+        data = json.load(cache_file)
+      return AccessToken(value=data["access_token"], expires_at=float(data["expires_at"]))
+    except (OSError, ValueError, KeyError):
+      return None
+
+  def _write_cache(self, token: AccessToken) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=self.cache_path.parent, prefix=".amadeus_token_")
+    try:
+      with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+        json.dump({"access_token": token.value, "expires_at": token.expires_at}, tmp_file)
+      os.chmod(tmp_path, 0o600)
+      os.replace(tmp_path, self.cache_path)
+    except OSError as e:
+      self.logger.warning(f"Could not write shared token cache: {e}")
+      if os.path.exists(tmp_path):
+        os.unlink(tmp_path)
+
+  def _ensure_background_refresh(self) -> None:
+    if self._background_task is None or self._background_task.done():
+      self._background_task = asyncio.create_task(self._background_refresh())
+
+  async def _background_refresh(self) -> None:
+    """Refresh the token proactively shortly before it expires."""
+    while True:
+      # Jitter spreads the wake-ups of different workers sharing one token.
+      delay = self._token.remaining() - self.refresh_margin_seconds + random.uniform(0, 5)
+      await asyncio.sleep(max(delay, 1.0))
+      try:
+        await self._refresh()
+      except asyncio.CancelledError:
+        raise
+      except Exception:
+        self.logger.error("Background token refresh failed, retrying shortly")
+        await asyncio.sleep(5.0)
+
+  async def aclose(self) -> None:
+    """Stop the background refresh task."""
+    for task in (self._background_task, self._refresh_task):
+      if task is not None and not task.done():
+        task.cancel()
+    self._background_task = None
+    self._refresh_task = None
@@ -0,0 +1,111 @@
+"""Application use case for flexible-date flight searches."""
+import asyncio
+from datetime import date, timedelta
+from typing import List, Tuple
+from flights.domain.flights_repository import FlightRepository
+from flights.domain.flights_entities import FlexibleDateSearchRequest, FlightSearchRequest, PriceMatrix, PriceMatrixCell
+from shared.logging import setup_logger, log_function_call, log_function_result, log_function_error
+
+class SearchFlexibleDates:
+  """Use case building a price matrix around the requested travel dates.
+
+  One flight search is issued per departure/return date combination. The
+  searches run concurrently, bounded by a semaphore shared by every call of
+  this use case, so a single tool invocation returns the whole matrix in
+  roughly the time of one search.
+  """
+  def __init__(self, repository: FlightRepository, max_concurrency: int = 4):
+    """Initialize the flexible-date search use case.
+
+    Args:
+      repository: Repository for flight data access
+      max_concurrency: Maximum number of flight searches running at once
+    """
+    self.repository = repository
+    self.max_concurrency = max_concurrency
+    self._semaphore = asyncio.Semaphore(max_concurrency)
+    self.logger = setup_logger("search_flexible_dates_use_case")
+
+  @staticmethod
+  def _date_range(center: str, flex_days: int) -> List[str]:
+    center_date = date.fromisoformat(center)
+    return [(center_date + timedelta(days=offset)).isoformat() for offset in range(-flex_days, flex_days + 1)]
+
+  async def execute(self, request: FlexibleDateSearchRequest) -> PriceMatrix:
+    """Execute the flexible-date search.
+
+    Args:
+      request: Flexible-date search request with approximate dates
+
+    Returns:
+      Price matrix with the cheapest offer of every date combination
+
+    Raises:
+      Exception: If the dates cannot be parsed
+    """
+    log_function_call(self.logger, "execute", {
+      "origin": request.origin_code,
+      "destination": request.destination_code,
+      "start_date": request.start_date,
+      "end_date": request.end_date,
+      "flex_days": request.flex_days
+    })
+
+    try:
+      departure_dates = self._date_range(request.start_date, request.flex_days)
+      return_dates = self._date_range(request.end_date, request.flex_days)
+      combinations: List[Tuple[str, str]] = [
+        (departure_date, return_date)
+        for departure_date in departure_dates
+        for return_date in return_dates
+        if return_date >= departure_date
+      ]
+      cells = await asyncio.gather(*(self._search_cell(request, departure_date, return_date) for departure_date, return_date in combinations))
+      matrix = PriceMatrix(
+        origin_code=request.origin_code,
+        destination_code=request.destination_code,
+        departure_dates=departure_dates,
+        return_dates=return_dates,
+        cells=list(cells)
+      )
+      cheapest = matrix.cheapest()
+      log_function_result(self.logger, "execute", {
+        "searches": len(cells),
+        "priced_cells": sum(1 for cell in cells if cell.price is not None),
+        "cheapest_price": cheapest.price if cheapest else None
+      })
+      return matrix
+    except Exception as e:
+      log_function_error(self.logger, "execute", e, {
+        "origin": request.origin_code,
+        "destination": request.destination_code
+      })
+      raise
+
+  async def _search_cell(self, request: FlexibleDateSearchRequest, departure_date: str, return_date: str) -> PriceMatrixCell:
+    """Search one date combination, recording failures in the cell instead of raising."""
+    cell_request = FlightSearchRequest(
+      origin_code=request.origin_code,
+      destination_code=request.destination_code,
+      start_date=departure_date,
+      end_date=return_date,
+      max_price=request.max_price,
+      adults=request.adults,
+      max_results=1
+    )
+    try:
+      async with self._semaphore:
+        flights = await self.repository.search_flights(cell_request)
+    except Exception as e:
+      self.logger.warning(f"Flexible search failed for {departure_date} / {return_date}: {e}")
+      return PriceMatrixCell(departure_date=departure_date, return_date=return_date, error=str(e))
+    if not flights:
+      return PriceMatrixCell(departure_date=departure_date, return_date=return_date)
+    cheapest = min(flights, key=lambda flight: flight.price)
+    return PriceMatrixCell(
+      departure_date=departure_date,
+      return_date=return_date,
+      price=cheapest.price,
+      currency=cheapest.currency,
+      flight=cheapest
+    )
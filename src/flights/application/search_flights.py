@@ -1,18 +1,25 @@
 """Application use case for searching flights."""
+import asyncio
+import heapq
+import itertools
 from typing import List
 from flights.domain.flights_repository import FlightRepository
-from flights.domain.flights_entities import FlightSearchRequest, Flight
+from flights.domain.flights_entities import FlightSearchRequest, Flight, FlightBatchSearchRequest, BatchFlightResult
 from shared.logging import setup_logger, log_function_call, log_function_result, log_function_error
 
 class SearchFlights:
   """Use case for searching flights based on travel criteria."""
-  def __init__(self, repository: FlightRepository):
+  def __init__(self, repository: FlightRepository, max_concurrency: int = 4, max_batch_routes: int = 9):
     """Initialize the search flights use case.
     
     Args:
       repository: Repository for flight data access
+      max_concurrency: Maximum number of batch route searches running at once, across all batches
+      max_batch_routes: Maximum number of routes a single batch may search
     """
     self.repository = repository
+    self.max_batch_routes = max_batch_routes
+    self._batch_semaphore = asyncio.Semaphore(max_concurrency)
     self.logger = setup_logger("flight_search_use_case")
   
   async def execute(self, request: FlightSearchRequest) -> List[Flight]:
@@ -43,4 +50,77 @@ class SearchFlights:
         "origin": request.origin_code,
         "destination": request.destination_code
       })
-      raise
\ No newline at end of file
+      raise
+
+  async def execute_batch(self, request: FlightBatchSearchRequest) -> BatchFlightResult:
+    """Search every origin/destination combination and merge the results.
+    
+    Route searches run concurrently under the use case's global concurrency
+    budget. Results are merged as each route completes, keeping only the
+    cheapest ``max_results`` flights across all routes.
+    
+    Args:
+      request: Batch search request with candidate origins and destinations
+      
+    Returns:
+      Price-ranked flights across all routes
+      
+    Raises:
+      ValueError: If the request has no routes or more than max_batch_routes
+    """
+    routes = request.routes()
+    log_function_call(self.logger, "execute_batch", {
+      "routes": [f"{origin}-{destination}" for origin, destination in routes],
+      "start_date": request.start_date,
+      "end_date": request.end_date
+    })
+    if not routes:
+      raise ValueError("Batch search needs at least one origin/destination pair with different codes")
+    if len(routes) > self.max_batch_routes:
+      raise ValueError(f"Batch search is limited to {self.max_batch_routes} routes, got {len(routes)}")
+    
+    async def search_route(origin: str, destination: str) -> tuple:
+      route_request = FlightSearchRequest(
+        origin_code=origin,
+        destination_code=destination,
+        start_date=request.start_date,
+        end_date=request.end_date,
+        max_price=request.max_price,
+        adults=request.adults,
+        max_results=request.max_results
+      )
+      try:
+        async with self._batch_semaphore:
+          return origin, destination, await self.repository.search_flights(route_request), None
+      except Exception as e:
+        return origin, destination, [], e
+    
+    # Max-heap on price (negated) holding the cheapest max_results flights seen so far.
+    cheapest: list = []
+    order = itertools.count()
+    failed_routes = {}
+    for completed in asyncio.as_completed([search_route(origin, destination) for origin, destination in routes]):
+      origin, destination, flights, error = await completed
+      if error is not None:
+        self.logger.warning(f"Batch route {origin}-{destination} failed: {error}")
+        failed_routes[f"{origin}-{destination}"] = str(error)
+        continue
+      for flight in flights:
+        entry = (-flight.price, next(order), flight, f"{origin}-{destination}")
+        if len(cheapest) < request.max_results:
+          heapq.heappush(cheapest, entry)
+        elif entry[0] > cheapest[0][0]:
+          heapq.heapreplace(cheapest, entry)
+    
+    ranked = sorted(cheapest, key=lambda entry: (-entry[0], entry[1]))
+    result = BatchFlightResult(
+      flights=[flight for _, _, flight, _ in ranked],
+      searched_routes=[f"{origin}-{destination}" for origin, destination in routes],
+      failed_routes=failed_routes,
+      flight_routes=[route for _, _, _, route in ranked]
+    )
+    log_function_result(self.logger, "execute_batch", {
+      "flights_count": len(ranked),
+      "failed_routes": list(failed_routes)
+    })
+    return result
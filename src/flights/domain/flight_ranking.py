@@ -0,0 +1,119 @@
+"""Deterministic ranking of flight offers.
+
+Offers are compared on price, total duration and number of stops. The
+Pareto front holds the offers no other offer beats on all three criteria;
+a weighted score over min-max normalized criteria orders the front first,
+then the dominated offers.
+"""
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+from flights.domain.flights_entities import Flight, Itinerary
+
+@dataclass(frozen=True)
+class RankingWeights:
+  """Relative importance of each criterion; only the ratios matter."""
+  price: float = 0.6
+  duration: float = 0.3
+  stops: float = 0.1
+
+@dataclass
+class RankedFlight:
+  """Flight offer with its ranking score (lower is better)."""
+  flight: Flight
+  score: float
+  pareto_optimal: bool
+
+  def summary(self) -> str:
+    """One-line description of the offer."""
+    flight = self.flight
+    parts = [f"{flight.price:.2f} {flight.currency}", flight.airline_names]
+    parts.append(_describe_itinerary("outbound", flight.outbound))
+    if flight.return_flight:
+      parts.append(_describe_itinerary("return", flight.return_flight))
+    parts.append("direct" if flight.stops == 0 else f"{flight.stops} stop{'s' if flight.stops > 1 else ''} in total")
+    if self.pareto_optimal:
+      parts.append("Pareto-optimal")
+    return " | ".join(parts)
+
+def _describe_itinerary(label: str, itinerary: Optional[Itinerary]) -> str:
+  if not itinerary or not itinerary.segments:
+    return f"{label} n/a"
+  first, last = itinerary.segments[0], itinerary.segments[-1]
+  minutes = itinerary.duration_minutes or 0
+  return f"{label} {first.departure_code} {first.departure_time} -> {last.arrival_code} {last.arrival_time} ({minutes // 60}h{minutes % 60:02d}m)"
+
+def _criteria(flight: Flight) -> Tuple[float, int, int]:
+  return flight.price, flight.duration_minutes, flight.stops
+
+def _identity(flight: Flight) -> tuple:
+  """Identity of an offer across searches; offer ids are only unique within one response."""
+  segments = [*(flight.outbound.segments if flight.outbound else []), *(flight.return_flight.segments if flight.return_flight else [])]
+  return flight.price, flight.currency, tuple((seg.carrier_code, seg.flight_number, seg.departure_epoch) for seg in segments)
+
+def pareto_front(flights: List[Flight]) -> List[bool]:
+  """Flag the offers not dominated on price, duration and stops.
+
+  An offer is dominated when another one is at least as good on every
+  criterion and strictly better on one.
+
+  Args:
+    flights: Offers to compare
+
+  Returns:
+    One flag per offer, True if it is on the Pareto front
+  """
+  criteria = [_criteria(flight) for flight in flights]
+  optimal = []
+  for candidate in criteria:
+    optimal.append(not any(
+      other != candidate and all(o <= c for o, c in zip(other, candidate))
+      for other in criteria
+    ))
+  return optimal
+
+def rank_flights(flights: Iterable[Flight], weights: RankingWeights = RankingWeights(), limit: Optional[int] = None) -> List[RankedFlight]:
+  """Rank offers: Pareto-optimal first, each group by weighted score.
+
+  Duplicate offers returned by several searches are ranked once.
+
+  Args:
+    flights: Offers to rank
+    weights: Weights of price, duration and stops
+    limit: Maximum number of ranked offers to return
+
+  Returns:
+    Ranked offers, best first
+  """
+  unique = list({_identity(flight): flight for flight in flights}.values())
+  if not unique:
+    return []
+  criteria = [_criteria(flight) for flight in unique]
+  ranges = [(min(values), max(values)) for values in zip(*criteria)]
+  total_weight = (weights.price + weights.duration + weights.stops) or 1.0
+  normalized_weights = (weights.price / total_weight, weights.duration / total_weight, weights.stops / total_weight)
+
+  ranked = []
+  for flight, values, optimal in zip(unique, criteria, pareto_front(unique)):
+    score = sum(
+      weight * ((value - low) / (high - low) if high > low else 0.0)
+      for weight, value, (low, high) in zip(normalized_weights, values, ranges)
+    )
+    ranked.append(RankedFlight(flight=flight, score=round(score, 4), pareto_optimal=optimal))
+  ranked.sort(key=lambda ranked_flight: (not ranked_flight.pareto_optimal, ranked_flight.score, ranked_flight.flight.price))
+  return ranked[:limit] if limit is not None else ranked
+
+def summarize_ranking(ranked: List[RankedFlight], total: int) -> str:
+  """Compact, numbered summary of ranked offers.
+
+  Args:
+    ranked: Ranked offers, best first
+    total: Number of offers that were ranked before limiting
+
+  Returns:
+    Summary text
+  """
+  if not ranked:
+    return "No flights found."
+  lines = [f"Best {len(ranked)} of {total} flight offers, ranked by price, duration and stops:"]
+  lines += [f"{position}. {ranked_flight.summary()}" for position, ranked_flight in enumerate(ranked, start=1)]
+  return "\n".join(lines)
@@ -1,19 +1,107 @@
 """Domain entities for flight searches and results."""
+import re
+import sys
 from dataclasses import dataclass, field
-from typing import Optional, List
-from pydantic import BaseModel, Field
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Literal, Optional, List, Dict
+from pydantic import BaseModel, Field, model_validator
 
-@dataclass
+_ISO_DURATION = re.compile(r"P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?)?")
+
+@lru_cache(maxsize=4096)
+def parse_iso_duration(value: Optional[str]) -> Optional[int]:
+  """Convert an ISO 8601 duration such as ``PT7H30M`` to minutes.
+
+  Args:
+    value: ISO 8601 duration
+
+  Returns:
+    Duration in minutes, or None if missing or unparseable
+  """
+  match = _ISO_DURATION.fullmatch(value or "")
+  if not value or not match:
+    return None
+  days, hours, minutes = (int(group) if group else 0 for group in match.groups())
+  return days * 1440 + hours * 60 + minutes
+
+def format_iso_duration(minutes: Optional[int]) -> str:
+  """Format minutes as an ISO 8601 duration such as ``PT7H30M`` ("" if unknown)."""
+  if minutes is None:
+    return ""
+  hours, minutes = divmod(minutes, 60)
+  return "PT" + (f"{hours}H" if hours else "") + (f"{minutes}M" if minutes or not hours else "")
+
+def parse_local_time(value: Optional[str]) -> Optional[int]:
+  """Convert an Amadeus local timestamp to epoch seconds.
+
+  Amadeus times are local to the airport and carry no offset; they are
+  read as UTC so that they format back to the same wall-clock time.
+
+  Args:
+    value: Timestamp such as ``2025-03-15T10:00:00``
+
+  Returns:
+    Epoch seconds, or None if missing or unparseable
+  """
+  try:
+    return int(datetime.fromisoformat(value).replace(tzinfo=timezone.utc).timestamp())
+  except (TypeError, ValueError):
+    return None
+
+def format_local_time(epoch: Optional[int]) -> str:
+  """Format epoch seconds from ``parse_local_time`` back to ``YYYY-MM-DDTHH:MM:SS`` ("" if unknown)."""
+  if epoch is None:
+    return ""
+  return datetime.fromtimestamp(epoch, timezone.utc).replace(tzinfo=None).isoformat()
+
+def _intern(code: Optional[str]) -> Optional[str]:
+  return sys.intern(code) if code else code
+
+@dataclass(slots=True, init=False, repr=False)
 class FlightSegment:
-  """Represents a single flight segment within an itinerary."""
+  """Represents a single flight segment within an itinerary.
+
+  Codes are interned and times and durations are parsed once into integers;
+  the ISO string attributes are formatted on access. Carrier and aircraft
+  names reference the lookup tables shared by all offers of a response.
+  """
   departure_code: str
-  departure_time: str
+  departure_epoch: Optional[int]
   arrival_code: str
-  arrival_time: str
+  arrival_epoch: Optional[int]
   carrier_code: str
   flight_number: str
-  aircraft_code: Optional[str] = None
-  duration: str = ""
+  aircraft_code: Optional[str]
+  duration_minutes: Optional[int]
+  carrier_name: Optional[str]
+  aircraft_name: Optional[str]
+
+  def __init__(self, departure_code: str, departure_time: str, arrival_code: str, arrival_time: str,
+               carrier_code: str, flight_number: str, aircraft_code: Optional[str] = None, duration: str = "",
+               carrier_name: Optional[str] = None, aircraft_name: Optional[str] = None):
+    self.departure_code = _intern(departure_code)
+    self.departure_epoch = parse_local_time(departure_time)
+    self.arrival_code = _intern(arrival_code)
+    self.arrival_epoch = parse_local_time(arrival_time)
+    self.carrier_code = _intern(carrier_code)
+    self.flight_number = flight_number
+    self.aircraft_code = _intern(aircraft_code)
+    self.duration_minutes = parse_iso_duration(duration)
+    self.carrier_name = carrier_name
+    self.aircraft_name = aircraft_name
+
+  @property
+  def departure_time(self) -> str:
+    return format_local_time(self.departure_epoch)
+
+  @property
+  def arrival_time(self) -> str:
+    return format_local_time(self.arrival_epoch)
+
+  @property
+  def duration(self) -> str:
+    return format_iso_duration(self.duration_minutes)
   
   def __str__(self) -> str:
     return f"{self.carrier_code}{self.flight_number}: {self.departure_code} -> {self.arrival_code} ({self.departure_time} - {self.arrival_time})"
@@ -21,11 +109,23 @@ class FlightSegment:
   def __repr__(self) -> str:
     return self.__str__()
 
-@dataclass
+@dataclass(slots=True, init=False, repr=False)
 class Itinerary:
   """Represents either an outbound or return itinerary with multiple segments."""
-  duration: str
+  duration_minutes: Optional[int]
   segments: List[FlightSegment]
+
+  def __init__(self, duration: str, segments: List[FlightSegment]):
+    self.duration_minutes = parse_iso_duration(duration)
+    self.segments = segments
+
+  @property
+  def duration(self) -> str:
+    return format_iso_duration(self.duration_minutes)
+
+  @property
+  def stops(self) -> int:
+    return max(len(self.segments) - 1, 0)
   
   def __str__(self) -> str:
     segments_str = " -> ".join([seg.arrival_code for seg in self.segments])
@@ -36,9 +136,14 @@ class Itinerary:
   def __repr__(self) -> str:
     return self.__str__()
 
-@dataclass
+@dataclass(slots=True, repr=False)
 class Flight:
-  """Represents a complete flight offer (both outbound and return)."""
+  """Represents a complete flight offer (both outbound and return).
+
+  The summary attributes kept for backward compatibility (``airline``,
+  ``departure_time``, ``duration``, ``origin_code``, ...) are computed on
+  access from the itineraries instead of being stored per offer.
+  """
   # Basic information
   offer_id: str
   price: float
@@ -52,42 +157,72 @@ class Flight:
   last_ticketing_date: Optional[str] = None
   number_of_bookable_seats: Optional[int] = None
   validating_airline_codes: Optional[List[str]] = None
-  
-  # Computed fields for backward compatibility
-  airline: str = field(init=False, default="")
-  departure_time: str = field(init=False, default="")
-  arrival_time: str = field(init=False, default="")
-  duration: str = field(init=False, default="")
-  origin_code: str = field(init=False, default="")
-  destination_code: str = field(init=False, default="")
-  
+
   def __post_init__(self):
-    """Set computed fields based on outbound itinerary."""
+    """Intern the codes shared by many offers."""
+    self.currency = _intern(self.currency)
+    if self.validating_airline_codes:
+      self.validating_airline_codes = [_intern(code) for code in self.validating_airline_codes]
+
+  def _segments(self) -> List[FlightSegment]:
+    segments = list(self.outbound.segments) if self.outbound else []
+    if self.return_flight:
+      segments.extend(self.return_flight.segments)
+    return segments
+
+  def _last_segment(self) -> Optional[FlightSegment]:
+    if self.return_flight and self.return_flight.segments:
+      return self.return_flight.segments[-1]
     if self.outbound and self.outbound.segments:
-      # Compute airline (unique carrier codes from all segments)
-      all_segments = self.outbound.segments.copy()
-      if self.return_flight and self.return_flight.segments:
-        all_segments.extend(self.return_flight.segments)
-      
-      object.__setattr__(self, 'airline', ", ".join({seg.carrier_code for seg in all_segments}))
-      object.__setattr__(self, 'departure_time', self.outbound.segments[0].departure_time)
-      
-      if self.return_flight and self.return_flight.segments:
-        object.__setattr__(self, 'arrival_time', self.return_flight.segments[-1].arrival_time)
-      else:
-        object.__setattr__(self, 'arrival_time', self.outbound.segments[-1].arrival_time)
-      
-      if self.return_flight:
-        object.__setattr__(self, 'duration', f"{self.outbound.duration} / {self.return_flight.duration}")
-      else:
-        object.__setattr__(self, 'duration', self.outbound.duration)
-      
-      object.__setattr__(self, 'origin_code', self.outbound.segments[0].departure_code)
-      
-      if self.return_flight and self.return_flight.segments:
-        object.__setattr__(self, 'destination_code', self.return_flight.segments[-1].arrival_code)
-      else:
-        object.__setattr__(self, 'destination_code', self.outbound.segments[-1].arrival_code)
+      return self.outbound.segments[-1]
+    return None
+
+  @property
+  def airline(self) -> str:
+    return ", ".join(dict.fromkeys(seg.carrier_code for seg in self._segments()))
+
+  @property
+  def airline_names(self) -> str:
+    """Carrier codes with their names, when the response provided them."""
+    carriers = dict.fromkeys((seg.carrier_code, seg.carrier_name) for seg in self._segments())
+    return ", ".join(f"{code} ({name})" if name else code for code, name in carriers)
+
+  @property
+  def departure_time(self) -> str:
+    return self.outbound.segments[0].departure_time if self.outbound and self.outbound.segments else ""
+
+  @property
+  def arrival_time(self) -> str:
+    last = self._last_segment()
+    return last.arrival_time if last else ""
+
+  @property
+  def duration(self) -> str:
+    if not self.outbound or not self.outbound.segments:
+      return ""
+    if self.return_flight:
+      return f"{self.outbound.duration} / {self.return_flight.duration}"
+    return self.outbound.duration
+
+  @property
+  def duration_minutes(self) -> int:
+    """Total travel time over all itineraries."""
+    itineraries = [self.outbound, self.return_flight]
+    return sum(itinerary.duration_minutes or 0 for itinerary in itineraries if itinerary)
+
+  @property
+  def stops(self) -> int:
+    """Total number of stops over all itineraries."""
+    return sum(itinerary.stops for itinerary in (self.outbound, self.return_flight) if itinerary)
+
+  @property
+  def origin_code(self) -> str:
+    return self.outbound.segments[0].departure_code if self.outbound and self.outbound.segments else ""
+
+  @property
+  def destination_code(self) -> str:
+    last = self._last_segment()
+    return last.arrival_code if last else ""
   
   def __str__(self) -> str:
     """String representation of the flight"""
@@ -96,12 +231,14 @@ class Flight:
     result += f"  Outbound: {self.outbound}\n"
     if self.return_flight:
       result += f"  Return: {self.return_flight}\n"
-    result += f"  Airlines: {self.airline}\n"
+    result += f"  Airlines: {self.airline_names}\n"
     return result
   
   def __repr__(self) -> str:
     return self.__str__()
 
+TravelClass = Literal["ECONOMY", "PREMIUM_ECONOMY", "BUSINESS", "FIRST"]
+
 class FlightSearchRequest(BaseModel):
   """Request model for flight searches."""
   origin_code: str = Field(description="The origin of the flight. Format: IATA code")
@@ -109,6 +246,143 @@ class FlightSearchRequest(BaseModel):
   start_date: str = Field(description="The start date of the flight. Format: YYYY-MM-DD")
   end_date: str = Field(description="The end date of the flight. Format: YYYY-MM-DD")
   max_price: Optional[float] = Field(description="The max price of the flight. Format: USD. If not mentioned, set this to null.")
+  adults: int = Field(default=1, description="The number of adult passengers. If not mentioned, set this to 1.")
+  max_results: int = Field(default=5, ge=1, le=250, description="How many flight offers to return. If not mentioned, set this to 5.")
+  non_stop: bool = Field(default=False, description="Whether to return only direct flights. If not mentioned, set this to false.")
+  included_airline_codes: Optional[List[str]] = Field(default=None, description="Only return flights operated by these airlines. Format: list of IATA airline codes. If not mentioned, set this to null.")
+  excluded_airline_codes: Optional[List[str]] = Field(default=None, description="Never return flights operated by these airlines. Format: list of IATA airline codes. If not mentioned, set this to null.")
+  travel_class: Optional[TravelClass] = Field(default=None, description="The cabin class. If not mentioned, set this to null.")
+  currency: Optional[str] = Field(default=None, description="The currency of the prices. Format: ISO 4217 code. If not mentioned, set this to null.")
+
+  @model_validator(mode="after")
+  def _check_airline_filters(self) -> "FlightSearchRequest":
+    if self.included_airline_codes and self.excluded_airline_codes:
+      raise ValueError("included_airline_codes and excluded_airline_codes cannot be combined")
+    return self
+
+  def search_key(self) -> tuple:
+    """Normalized identity of the search, used to coalesce and cache identical requests."""
+    def codes(values: Optional[List[str]]) -> Optional[tuple]:
+      return tuple(sorted({value.strip().upper() for value in values})) if values else None
+    return (
+      self.origin_code.strip().upper(),
+      self.destination_code.strip().upper(),
+      self.start_date.strip(),
+      self.end_date.strip(),
+      float(self.max_price) if self.max_price is not None else None,
+      self.adults,
+      self.max_results,
+      self.non_stop,
+      codes(self.included_airline_codes),
+      codes(self.excluded_airline_codes),
+      self.travel_class,
+      self.currency.strip().upper() if self.currency else None
+    )
+
+class FlightBatchSearchRequest(BaseModel):
+  """Request model for searching several origins and destinations at once."""
+  origin_codes: List[str] = Field(description="The possible origins of the flight. Format: list of IATA codes")
+  destination_codes: List[str] = Field(description="The possible destinations of the flight. Format: list of IATA codes")
+  start_date: str = Field(description="The start date of the flight. Format: YYYY-MM-DD")
+  end_date: str = Field(description="The end date of the flight. Format: YYYY-MM-DD")
+  max_price: Optional[float] = Field(description="The max price of the flight. Format: USD. If not mentioned, set this to null.")
+  adults: int = Field(default=1, description="The number of adult passengers. If not mentioned, set this to 1.")
+  max_results: int = Field(default=5, ge=1, le=20, description="How many of the cheapest flights to return across all routes")
+
+  def routes(self) -> List[tuple]:
+    """Distinct (origin, destination) pairs of the cartesian product, skipping same-code pairs."""
+    origins = list(dict.fromkeys(code.strip().upper() for code in self.origin_codes))
+    destinations = list(dict.fromkeys(code.strip().upper() for code in self.destination_codes))
+    return [(origin, destination) for origin in origins for destination in destinations if origin != destination]
+
+@dataclass
+class BatchFlightResult:
+  """Merged, price-ranked flights of a multi-route search.
+
+  flight_routes holds the searched "ORIGIN-DESTINATION" route of each
+  flight, in the same order as flights.
+  """
+  flights: List[Flight]
+  searched_routes: List[str]
+  failed_routes: Dict[str, str] = field(default_factory=dict)
+  flight_routes: List[str] = field(default_factory=list)
+  
+  def __str__(self) -> str:
+    """Ranked flights followed by the routes that were searched"""
+    result = f"Searched routes: {', '.join(self.searched_routes)}\n"
+    if self.failed_routes:
+      result += f"Failed routes: {', '.join(f'{route} ({error})' for route, error in self.failed_routes.items())}\n"
+    if not self.flights:
+      return result + "No flights found on any route\n"
+    for rank, (flight, route) in enumerate(zip(self.flights, self.flight_routes), start=1):
+      origin, destination = route.split("-", 1)
+      result += f"#{rank} {origin} -> {destination}\n{flight}"
+    return result
+  
+  def __repr__(self) -> str:
+    return self.__str__()
+
+class FlexibleDateSearchRequest(BaseModel):
+  """Request model for flexible-date flight searches returning a price matrix."""
+  origin_code: str = Field(description="The origin of the flight. Format: IATA code")
+  destination_code: str = Field(description="The destination of the flight. Format: IATA code")
+  start_date: str = Field(description="The approximate start date of the flight. Format: YYYY-MM-DD")
+  end_date: str = Field(description="The approximate end date of the flight. Format: YYYY-MM-DD")
+  max_price: Optional[float] = Field(description="The max price of the flight. Format: USD. If not mentioned, set this to null.")
+  adults: int = Field(default=1, description="The number of adult passengers. If not mentioned, set this to 1.")
+  flex_days: int = Field(default=2, ge=0, le=3, description="How many days before and after the start and end dates to search")
+
+@dataclass
+class PriceMatrixCell:
+  """Cheapest offer found for one departure/return date combination."""
+  departure_date: str
+  return_date: str
+  price: Optional[float] = None
+  currency: Optional[str] = None
+  flight: Optional[Flight] = None
+  error: Optional[str] = None
+
+@dataclass
+class PriceMatrix:
+  """Grid of cheapest prices around the requested departure and return dates."""
+  origin_code: str
+  destination_code: str
+  departure_dates: List[str]
+  return_dates: List[str]
+  cells: List[PriceMatrixCell]
+  
+  def cell(self, departure_date: str, return_date: str) -> Optional[PriceMatrixCell]:
+    """Get the cell for a date combination, if it was searched."""
+    for cell in self.cells:
+      if cell.departure_date == departure_date and cell.return_date == return_date:
+        return cell
+    return None
+  
+  def cheapest(self) -> Optional[PriceMatrixCell]:
+    """Get the cheapest priced cell of the matrix."""
+    priced = [cell for cell in self.cells if cell.price is not None]
+    return min(priced, key=lambda cell: cell.price) if priced else None
+  
+  def __str__(self) -> str:
+    """Price grid with departure dates as rows and return dates as columns"""
+    result = f"Price matrix {self.origin_code} -> {self.destination_code} (rows: departure, columns: return)\n"
+    result += "departure  | " + " | ".join(self.return_dates) + "\n"
+    for departure_date in self.departure_dates:
+      prices = []
+      for return_date in self.return_dates:
+        cell = self.cell(departure_date, return_date)
+        prices.append(f"{cell.price:>10.2f}" if cell and cell.price is not None else f"{'-':>10}")
+      result += f"{departure_date} | " + " | ".join(prices) + "\n"
+    best = self.cheapest()
+    if best:
+      result += f"Cheapest: {best.price} {best.currency} departing {best.departure_date}, returning {best.return_date}\n"
+      result += str(best.flight)
+    else:
+      result += "No flights found for any date combination\n"
+    return result
+  
+  def __repr__(self) -> str:
+    return self.__str__()
 
 class FlightSearchResult(BaseModel):
   """Result model for flight searches."""
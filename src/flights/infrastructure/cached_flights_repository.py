@@ -0,0 +1,90 @@
+"""Caching decorator for flight repositories."""
+import asyncio
+import time
+from typing import Dict, List, Set
+from flights.domain.flights_repository import FlightRepository
+from flights.domain.flights_entities import FlightSearchRequest, Flight
+from shared.single_flight import SingleFlight
+from shared.ttl_cache import TTLCache
+from shared.logging import setup_logger, log_function_call, log_function_result, log_function_error
+
+class CachedFlightRepository(FlightRepository):
+  """Flight repository that caches parsed results of another repository.
+
+  Results are kept in a bounded LRU cache keyed on the normalized search.
+  Fresh entries are served directly; entries past their TTL but inside the
+  stale window are served immediately while a background refresh fetches
+  new offers. Empty results are cached for a shorter negative TTL.
+  """
+  def __init__(self, repository: FlightRepository, max_entries: int = 1024, ttl_seconds: float = 300.0,
+               stale_seconds: float = 600.0, negative_ttl_seconds: float = 60.0):
+    """Initialize the caching repository.
+
+    Args:
+      repository: Repository used on cache misses and refreshes
+      max_entries: Maximum number of cached searches
+      ttl_seconds: Seconds a result is considered fresh
+      stale_seconds: Extra seconds a result may be served while it is refreshed
+      negative_ttl_seconds: Seconds an empty result is cached
+    """
+    self.repository = repository
+    self.ttl_seconds = ttl_seconds
+    self.stale_seconds = stale_seconds
+    self.negative_ttl_seconds = negative_ttl_seconds
+    self.cache: TTLCache[List[Flight]] = TTLCache(max_entries)
+    self.logger = setup_logger("cached_flights_repository")
+    self._single_flight = SingleFlight("cached_flights_refresh")
+    self._background_refreshes: Set[asyncio.Task] = set()
+
+  async def search_flights(self, request: FlightSearchRequest) -> List[Flight]:
+    """Search for flights, serving cached results when available.
+
+    Args:
+      request: Flight search request with criteria
+
+    Returns:
+      List of flight offers matching the search criteria
+
+    Raises:
+      Exception: If the search fails on a cache miss
+    """
+    key = request.search_key()
+    entry = self.cache.get(key)
+    if entry is not None:
+      if not entry.is_fresh(time.monotonic()) and key not in self._single_flight:
+        self._schedule_refresh(key, request)
+      return list(entry.value)
+
+    log_function_call(self.logger, "search_flights", {"cache": "miss", "key": key})
+    flights = await self._single_flight.do(key, lambda: self._refresh(key, request))
+    return list(flights)
+
+  async def _refresh(self, key: tuple, request: FlightSearchRequest) -> List[Flight]:
+    """Fetch flights from the wrapped repository and store them in the cache."""
+    flights = await self.repository.search_flights(request)
+    if flights:
+      self.cache.set(key, flights, self.ttl_seconds, self.stale_seconds)
+    else:
+      self.cache.set(key, flights, self.negative_ttl_seconds)
+    return flights
+
+  def _schedule_refresh(self, key: tuple, request: FlightSearchRequest) -> None:
+    """Refresh a stale entry in the background while it keeps being served."""
+    async def refresh() -> None:
+      try:
+        await self._single_flight.do(key, lambda: self._refresh(key, request))
+        log_function_result(self.logger, "background_refresh", {"key": key})
+      except Exception as e:
+        log_function_error(self.logger, "background_refresh", e, {"key": key})
+
+    task = asyncio.create_task(refresh())
+    self._background_refreshes.add(task)
+    task.add_done_callback(self._background_refreshes.discard)
+
+  def stats(self) -> Dict[str, int]:
+    """Cache hit, miss and eviction counters.
+
+    Returns:
+      Dictionary of counter values plus the current cache size
+    """
+    return {**self.cache.stats.as_dict(), "size": len(self.cache)}
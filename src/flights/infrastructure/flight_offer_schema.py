@@ -0,0 +1,73 @@
+"""Typed schema of the Amadeus flight offers response.
+
+Response bytes are decoded and validated in a single pass straight into
+these structs, without building an intermediate tree of dicts. Fields the
+application does not use are skipped by the decoder.
+"""
+from typing import Dict, List, Optional
+import msgspec
+
+class Endpoint(msgspec.Struct, rename="camel"):
+  """Departure or arrival of a segment."""
+  iata_code: str
+  at: str
+  terminal: Optional[str] = None
+
+class Aircraft(msgspec.Struct):
+  """Aircraft operating a segment."""
+  code: str
+
+class Segment(msgspec.Struct, rename="camel"):
+  """Single flight segment."""
+  departure: Endpoint
+  arrival: Endpoint
+  carrier_code: str
+  number: str
+  aircraft: Optional[Aircraft] = None
+  duration: str = ""
+
+class ItineraryData(msgspec.Struct):
+  """Outbound or return itinerary."""
+  segments: List[Segment]
+  duration: str = ""
+
+class Price(msgspec.Struct):
+  """Offer price; amounts are decimal strings."""
+  total: str
+  currency: str = "USD"
+
+class Offer(msgspec.Struct, rename="camel"):
+  """Single flight offer."""
+  id: str
+  itineraries: List[ItineraryData]
+  price: Price
+  last_ticketing_date: Optional[str] = None
+  number_of_bookable_seats: Optional[int] = None
+  validating_airline_codes: List[str] = []
+
+class Dictionaries(msgspec.Struct):
+  """Lookup tables shared by every offer of a response."""
+  carriers: Dict[str, str] = {}
+  aircraft: Dict[str, str] = {}
+
+class FlightOffersResponse(msgspec.Struct):
+  """Flight offers response."""
+  data: List[Offer] = []
+  dictionaries: Dictionaries = msgspec.field(default_factory=Dictionaries)
+
+_decoder = msgspec.json.Decoder(FlightOffersResponse)
+
+def decode_flight_offers(payload: bytes) -> FlightOffersResponse:
+  """Decode and validate a raw flight offers response body.
+
+  Args:
+    payload: Response body bytes
+
+  Returns:
+    Typed flight offers response
+
+  Raises:
+    msgspec.ValidationError: If the payload does not match the schema
+    msgspec.DecodeError: If the payload is not valid JSON
+  """
+  return _decoder.decode(payload)
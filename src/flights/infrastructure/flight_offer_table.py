@@ -0,0 +1,186 @@
+"""Columnar view over decoded Amadeus flight offers.
+
+Offers are reduced to a handful of NumPy columns when a response is
+received, so filtering, sorting and top-K ranking run vectorized over the
+whole result set. ``Flight`` entities are only built for the rows that are
+finally returned, and at most once per offer.
+"""
+from typing import Callable, Dict, Iterable, List, Optional
+import numpy as np
+from flights.domain.flights_entities import Flight, parse_iso_duration, parse_local_time
+from flights.infrastructure.flight_offer_schema import FlightOffersResponse, Offer
+
+SORT_COLUMNS = ("price", "duration_minutes", "stops", "departure_epoch", "arrival_epoch")
+
+class FlightOfferTable:
+  """Columnar, immutable table of flight offers.
+
+  Every operation returns a new table sharing the raw offers and the
+  materialized ``Flight`` cache with its parent.
+
+  Attributes:
+    price: Total price per offer
+    duration_minutes: Total travel time over all itineraries
+    stops: Total number of stops over all itineraries
+    departure_epoch: Outbound departure time in epoch seconds
+    arrival_epoch: Outbound arrival time in epoch seconds
+    carrier_id: Interned id of the main carrier, see ``carriers``
+    carriers: Carrier codes indexed by carrier id
+  """
+  def __init__(self, offers: List[Offer], parse_offer: Callable[[Offer], Flight], carriers: List[str],
+               rows: np.ndarray, price: np.ndarray, duration_minutes: np.ndarray, stops: np.ndarray,
+               departure_epoch: np.ndarray, arrival_epoch: np.ndarray, carrier_id: np.ndarray,
+               materialized: Optional[Dict[int, Flight]] = None):
+    self._offers = offers
+    self._parse_offer = parse_offer
+    self._materialized = materialized if materialized is not None else {}
+    self.carriers = carriers
+    self.rows = rows
+    self.price = price
+    self.duration_minutes = duration_minutes
+    self.stops = stops
+    self.departure_epoch = departure_epoch
+    self.arrival_epoch = arrival_epoch
+    self.carrier_id = carrier_id
+
+  @classmethod
+  def from_response(cls, response: FlightOffersResponse, parse_offer: Callable[[Offer], Flight]) -> "FlightOfferTable":
+    """Build the table from a decoded Amadeus flight offers response.
+
+    Args:
+      response: Decoded flight offers response
+      parse_offer: Function converting one offer to a Flight
+
+    Returns:
+      Table with one row per offer
+    """
+    offers = response.data
+    count = len(offers)
+    price = np.empty(count, dtype=np.float64)
+    duration_minutes = np.zeros(count, dtype=np.int32)
+    stops = np.zeros(count, dtype=np.int16)
+    departure_epoch = np.zeros(count, dtype=np.int64)
+    arrival_epoch = np.zeros(count, dtype=np.int64)
+    carrier_id = np.zeros(count, dtype=np.int32)
+    carriers: List[str] = []
+    carrier_ids: Dict[str, int] = {}
+
+    for row, offer in enumerate(offers):
+      price[row] = float(offer.price.total)
+      for itinerary in offer.itineraries:
+        duration_minutes[row] += parse_iso_duration(itinerary.duration) or 0
+        stops[row] += max(len(itinerary.segments) - 1, 0)
+      outbound_segments = offer.itineraries[0].segments if offer.itineraries else []
+      if outbound_segments:
+        departure_epoch[row] = parse_local_time(outbound_segments[0].departure.at) or 0
+        arrival_epoch[row] = parse_local_time(outbound_segments[-1].arrival.at) or 0
+      validating = offer.validating_airline_codes
+      carrier = validating[0] if validating else (outbound_segments[0].carrier_code if outbound_segments else "")
+      if carrier not in carrier_ids:
+        carrier_ids[carrier] = len(carriers)
+        carriers.append(carrier)
+      carrier_id[row] = carrier_ids[carrier]
+
+    return cls(
+      offers, parse_offer, carriers, np.arange(count, dtype=np.intp),
+      price, duration_minutes, stops, departure_epoch, arrival_epoch, carrier_id
+    )
+
+  def __len__(self) -> int:
+    return len(self.rows)
+
+  def take(self, positions: np.ndarray) -> "FlightOfferTable":
+    """Select rows by position or boolean mask.
+
+    Args:
+      positions: Integer positions or a boolean mask over the rows
+
+    Returns:
+      Table with the selected rows, in the given order
+    """
+    return FlightOfferTable(
+      self._offers, self._parse_offer, self.carriers, self.rows[positions],
+      self.price[positions], self.duration_minutes[positions], self.stops[positions],
+      self.departure_epoch[positions], self.arrival_epoch[positions], self.carrier_id[positions],
+      self._materialized
+    )
+
+  def filter(self, max_price: Optional[float] = None, max_stops: Optional[int] = None,
+             max_duration_minutes: Optional[int] = None, carriers: Optional[Iterable[str]] = None,
+             departure_after: Optional[int] = None, departure_before: Optional[int] = None) -> "FlightOfferTable":
+    """Keep the rows matching every given criterion.
+
+    Args:
+      max_price: Maximum total price
+      max_stops: Maximum total number of stops
+      max_duration_minutes: Maximum total travel time
+      carriers: Allowed main carrier codes
+      departure_after: Earliest outbound departure, epoch seconds
+      departure_before: Latest outbound departure, epoch seconds
+
+    Returns:
+      Filtered table
+    """
+    mask = np.ones(len(self), dtype=bool)
+    if max_price is not None:
+      mask &= self.price <= max_price
+    if max_stops is not None:
+      mask &= self.stops <= max_stops
+    if max_duration_minutes is not None:
+      mask &= self.duration_minutes <= max_duration_minutes
+    if carriers is not None:
+      wanted = set(carriers)
+      allowed = [carrier_id for carrier_id, carrier in enumerate(self.carriers) if carrier in wanted]
+      mask &= np.isin(self.carrier_id, allowed)
+    if departure_after is not None:
+      mask &= self.departure_epoch >= departure_after
+    if departure_before is not None:
+      mask &= self.departure_epoch <= departure_before
+    return self.take(mask)
+
+  def _column(self, by: str) -> np.ndarray:
+    if by not in SORT_COLUMNS:
+      raise ValueError(f"Cannot sort flight offers by {by!r}, expected one of {SORT_COLUMNS}")
+    return getattr(self, by)
+
+  def sort(self, by: str = "price", descending: bool = False) -> "FlightOfferTable":
+    """Sort the rows by a column, ties kept in their current order.
+
+    Args:
+      by: Column name, one of ``SORT_COLUMNS``
+      descending: Whether to sort from largest to smallest
+
+    Returns:
+      Sorted table
+    """
+    column = self._column(by)
+    order = np.argsort(-column if descending else column, kind="stable")
+    return self.take(order)
+
+  def top_k(self, k: int, by: str = "price") -> "FlightOfferTable":
+    """Select the k smallest rows of a column, sorted.
+
+    Args:
+      k: Number of rows to keep
+      by: Column name, one of ``SORT_COLUMNS``
+
+    Returns:
+      Table with at most k rows
+    """
+    if k >= len(self):
+      return self.sort(by)
+    if k <= 0:
+      return self.take(np.empty(0, dtype=np.intp))
+    column = self._column(by)
+    candidates = np.argpartition(column, k - 1)[:k]
+    return self.take(candidates[np.argsort(column[candidates], kind="stable")])
+
+  def to_flights(self) -> List[Flight]:
+    """Materialize the rows as Flight entities, parsing each offer only once."""
+    flights = []
+    for row in self.rows.tolist():
+      flight = self._materialized.get(row)
+      if flight is None:
+        flight = self._materialized[row] = self._parse_offer(self._offers[row])
+      flights.append(flight)
+    return flights
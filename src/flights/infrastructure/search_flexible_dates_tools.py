@@ -0,0 +1,90 @@
+"""LangChain tool for flexible-date flight searches."""
+from typing import Optional, Tuple
+import asyncio
+
+from langchain_core.tools import BaseTool
+from langchain_core.tools.base import ArgsSchema
+from pydantic import Field
+from flights.domain.flights_entities import FlexibleDateSearchRequest, PriceMatrix
+from flights.application.search_flexible_dates import SearchFlexibleDates
+from shared.logging import setup_logger, log_function_call, log_function_result, log_function_error
+
+class SearchFlexibleDatesTools(BaseTool):
+  """LangChain tool wrapper for the flexible-date price matrix search."""
+  name: str = "flexible_date_flight_search"
+  description: str = (
+    "Search flights for every combination of departure and return dates within flex_days of the "
+    "given start and end dates, and return a price matrix with the cheapest option. Use it when the "
+    "user's dates are approximate or flexible."
+  )
+  args_schema: ArgsSchema = FlexibleDateSearchRequest
+  return_direct: bool = True
+  response_format: str = "content_and_artifact"
+  search_flexible_dates: Optional[SearchFlexibleDates] = Field(default=None, exclude=True)
+
+  def __init__(self, search_flexible_dates: SearchFlexibleDates):
+    """Initialize the flexible-date flight search tool.
+
+    Args:
+      search_flexible_dates: Flexible-date search use case instance
+    """
+    super().__init__()
+    object.__setattr__(self, 'search_flexible_dates', search_flexible_dates)
+    object.__setattr__(self, 'logger', setup_logger("search_flexible_dates_tools"))
+
+  def _run(self, origin_code: str, destination_code: str, start_date: str, end_date: str, max_price: int, adults: int = 1, flex_days: int = 2) -> Tuple[str, PriceMatrix]:
+    """Synchronous wrapper for the async flexible-date search.
+
+    Args:
+      origin_code: Origin IATA code
+      destination_code: Destination IATA code
+      start_date: Approximate departure date
+      end_date: Approximate return date
+      max_price: Maximum price filter
+      adults: Number of adult passengers
+      flex_days: Days to search before and after each date
+
+    Returns:
+      Text of the price matrix for the model, and the matrix as artifact
+
+    Raises:
+      Exception: If search fails
+    """
+    params = {"origin_code": origin_code, "destination_code": destination_code, "start_date": start_date, "end_date": end_date, "max_price": max_price, "adults": adults, "flex_days": flex_days}
+    log_function_call(self.logger, "SearchFlexibleDatesTools._run", params)
+    try:
+      return asyncio.run(self._arun(origin_code, destination_code, start_date, end_date, max_price, adults, flex_days))
+    except Exception as e:
+      log_function_error(self.logger, "SearchFlexibleDatesTools._run", e, params)
+      raise
+
+  async def _arun(self, origin_code: str, destination_code: str, start_date: str, end_date: str, max_price: int, adults: int = 1, flex_days: int = 2) -> Tuple[str, PriceMatrix]:
+    """Asynchronously search the price matrix.
+
+    Args:
+      origin_code: Origin IATA code
+      destination_code: Destination IATA code
+      start_date: Approximate departure date
+      end_date: Approximate return date
+      max_price: Maximum price filter
+      adults: Number of adult passengers
+      flex_days: Days to search before and after each date
+
+    Returns:
+      Text of the price matrix for the model, and the matrix as artifact
+
+    Raises:
+      Exception: If search fails
+    """
+    self.logger.info(f"Searching flexible dates from {origin_code} to {destination_code}")
+    params = {"origin_code": origin_code, "destination_code": destination_code, "start_date": start_date, "end_date": end_date, "max_price": max_price, "adults": adults, "flex_days": flex_days}
+    log_function_call(self.logger, "SearchFlexibleDatesTools._arun", params)
+
+    try:
+      request = FlexibleDateSearchRequest(**params)
+      matrix = await self.search_flexible_dates.execute(request)
+      log_function_result(self.logger, "SearchFlexibleDatesTools._arun", {"cells_count": len(matrix.cells)})
+      return str(matrix), matrix
+    except Exception as e:
+      log_function_error(self.logger, "SearchFlexibleDatesTools._arun", e, params)
+      raise
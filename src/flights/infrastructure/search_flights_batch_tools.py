@@ -0,0 +1,90 @@
+"""LangChain tool for multi-origin / multi-destination flight searches."""
+from typing import List, Optional, Tuple
+import asyncio
+
+from langchain_core.tools import BaseTool
+from langchain_core.tools.base import ArgsSchema
+from pydantic import Field
+from flights.domain.flights_entities import FlightBatchSearchRequest, BatchFlightResult
+from flights.application.search_flights import SearchFlights
+from shared.logging import setup_logger, log_function_call, log_function_result, log_function_error
+
+class SearchFlightsBatchTools(BaseTool):
+  """LangChain tool wrapper for batch flight search over several routes."""
+  name: str = "flight_batch_search"
+  description: str = (
+    "Search flights for every combination of several origins and destinations in one call and return "
+    "the cheapest flights across all routes. Use it when the user accepts several airports or wants to "
+    "compare destinations."
+  )
+  args_schema: ArgsSchema = FlightBatchSearchRequest
+  return_direct: bool = True
+  response_format: str = "content_and_artifact"
+  search_flights: Optional[SearchFlights] = Field(default=None, exclude=True)
+
+  def __init__(self, search_flights: SearchFlights):
+    """Initialize the batch flight search tool.
+
+    Args:
+      search_flights: Search flights use case instance
+    """
+    super().__init__()
+    object.__setattr__(self, 'search_flights', search_flights)
+    object.__setattr__(self, 'logger', setup_logger("search_flights_batch_tools"))
+
+  def _run(self, origin_codes: List[str], destination_codes: List[str], start_date: str, end_date: str, max_price: int, adults: int = 1, max_results: int = 5) -> Tuple[str, BatchFlightResult]:
+    """Synchronous wrapper for the async batch flight search.
+
+    Args:
+      origin_codes: Candidate origin IATA codes
+      destination_codes: Candidate destination IATA codes
+      start_date: Departure date
+      end_date: Return date
+      max_price: Maximum price filter
+      adults: Number of adult passengers
+      max_results: Number of cheapest flights to return
+
+    Returns:
+      Text of the price-ranked flights for the model, and the result as artifact
+
+    Raises:
+      Exception: If search fails
+    """
+    params = {"origin_codes": origin_codes, "destination_codes": destination_codes, "start_date": start_date, "end_date": end_date, "max_price": max_price, "adults": adults, "max_results": max_results}
+    log_function_call(self.logger, "SearchFlightsBatchTools._run", params)
+    try:
+      return asyncio.run(self._arun(origin_codes, destination_codes, start_date, end_date, max_price, adults, max_results))
+    except Exception as e:
+      log_function_error(self.logger, "SearchFlightsBatchTools._run", e, params)
+      raise
+
+  async def _arun(self, origin_codes: List[str], destination_codes: List[str], start_date: str, end_date: str, max_price: int, adults: int = 1, max_results: int = 5) -> Tuple[str, BatchFlightResult]:
+    """Asynchronously search all routes.
+
+    Args:
+      origin_codes: Candidate origin IATA codes
+      destination_codes: Candidate destination IATA codes
+      start_date: Departure date
+      end_date: Return date
+      max_price: Maximum price filter
+      adults: Number of adult passengers
+      max_results: Number of cheapest flights to return
+
+    Returns:
+      Text of the price-ranked flights for the model, and the result as artifact
+
+    Raises:
+      Exception: If search fails
+    """
+    self.logger.info(f"Batch searching flights from {origin_codes} to {destination_codes}")
+    params = {"origin_codes": origin_codes, "destination_codes": destination_codes, "start_date": start_date, "end_date": end_date, "max_price": max_price, "adults": adults, "max_results": max_results}
+    log_function_call(self.logger, "SearchFlightsBatchTools._arun", params)
+
+    try:
+      request = FlightBatchSearchRequest(**params)
+      result = await self.search_flights.execute_batch(request)
+      log_function_result(self.logger, "SearchFlightsBatchTools._arun", {"flights_count": len(result.flights)})
+      return str(result), result
+    except Exception as e:
+      log_function_error(self.logger, "SearchFlightsBatchTools._arun", e, params)
+      raise
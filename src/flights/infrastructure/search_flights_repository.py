@@ -1,12 +1,22 @@
 """Repository implementation for flight searches using Amadeus API."""
-from typing import List
+import sys
+from typing import Dict, List
 from amadeus.infrastructure.amadeus_client import AmadeusClient
 from flights.domain.flights_repository import FlightRepository
 from flights.domain.flights_entities import FlightSearchRequest, Flight, Itinerary, FlightSegment
+from flights.infrastructure.flight_offer_schema import FlightOffersResponse, ItineraryData, Offer, decode_flight_offers
+from flights.infrastructure.flight_offer_table import FlightOfferTable
+from shared.single_flight import SingleFlight
 from shared.logging import setup_logger, log_function_call, log_function_result, log_function_error
 
 class SearchFlightsRepository(FlightRepository):
-  """Repository implementation for searching flights via Amadeus API."""
+  """Repository implementation for searching flights via Amadeus API.
+  
+  Concurrent identical searches are coalesced into a single Amadeus request.
+  Response bytes are decoded straight into typed structs and held as a
+  columnar FlightOfferTable; Flight entities are only built for the offers
+  that are returned.
+  """
   def __init__(self, client: AmadeusClient):
     """Initialize the flight search repository.
     
@@ -15,6 +25,7 @@ class SearchFlightsRepository(FlightRepository):
     """
     self.client = client
     self.logger = setup_logger("search_flights_repository")
+    self._single_flight = SingleFlight("search_flights")
     
   async def search_flights(self, request: FlightSearchRequest) -> List[Flight]:
     """Search for flights using the Amadeus API.
@@ -36,14 +47,8 @@ class SearchFlightsRepository(FlightRepository):
     })
     
     try:
-      raw_data = self.client.search_flights(
-        origin=request.origin_code,
-        destination=request.destination_code,
-        start_date=request.start_date,
-        end_date=request.end_date,
-        max_price=request.max_price
-      )
-      flights = self._parse_flights(raw_data)
+      flights = await self._single_flight.do(request.search_key(), lambda: self._fetch_flights(request))
+      flights = list(flights)
       log_function_result(self.logger, "search_flights", {"flights_count": len(flights)})
       return flights
     except Exception as e:
@@ -55,73 +60,99 @@ class SearchFlightsRepository(FlightRepository):
       })
       raise
       
-  def _parse_flights(self, raw_data: dict) -> List[Flight]:
-    """Parse raw flight data from Amadeus API into domain entities.
+  def _search_params(self, request: FlightSearchRequest) -> dict:
+    """Map a search request to the Amadeus client's search arguments."""
+    return {
+      "origin": request.origin_code,
+      "destination": request.destination_code,
+      "start_date": request.start_date,
+      "end_date": request.end_date,
+      "max_price": request.max_price,
+      "adults": request.adults,
+      "max_results": request.max_results,
+      "non_stop": request.non_stop,
+      "included_airline_codes": request.included_airline_codes,
+      "excluded_airline_codes": request.excluded_airline_codes,
+      "travel_class": request.travel_class,
+      "currency": request.currency
+    }
+
+  async def _fetch_flights(self, request: FlightSearchRequest) -> List[Flight]:
+    """Fetch up to ``max_results`` flight offers for a request, cheapest first.
     
     Args:
-      raw_data: Raw flight data from API response
+      request: Flight search request with criteria
       
     Returns:
       List of Flight domain entities
     """
-    flights = []
-    if isinstance(raw_data, dict) and "data" in raw_data:
-      for offer in raw_data["data"]:
-        # Parse itineraries
-        itineraries_data = offer.get("itineraries", [])
-        
-        # Parse outbound itinerary (first one)
-        outbound = self._parse_itinerary(itineraries_data[0]) if itineraries_data else None
-        
-        # Parse return itinerary (second one, if exists)
-        return_flight = self._parse_itinerary(itineraries_data[1]) if len(itineraries_data) > 1 else None
-        
-        # Parse price and additional info
-        price_data = offer.get("price", {})
-        validating_airlines = offer.get("validatingAirlineCodes", [])
-        
-        flight = Flight(
-          offer_id=offer.get("id", ""),
-          price=float(price_data.get("total", "0")),
-          currency=price_data.get("currency", "USD"),
-          outbound=outbound,
-          return_flight=return_flight,
-          last_ticketing_date=offer.get("lastTicketingDate"),
-          number_of_bookable_seats=offer.get("numberOfBookableSeats"),
-          validating_airline_codes=validating_airlines
-        )
-        flights.append(flight)
-    return flights
+    payload = await self.client.search_flights_raw(**self._search_params(request))
+    table = self._offer_table(decode_flight_offers(payload)).filter(
+      max_price=request.max_price,
+      max_stops=0 if request.non_stop else None
+    )
+    return table.top_k(request.max_results).to_flights()
+      
+  def _offer_table(self, response: FlightOffersResponse) -> FlightOfferTable:
+    """Build the offer table of a decoded response, sharing its dictionaries between offers."""
+    carriers = {code: sys.intern(name) for code, name in response.dictionaries.carriers.items()}
+    aircraft = {code: sys.intern(name) for code, name in response.dictionaries.aircraft.items()}
+    return FlightOfferTable.from_response(response, lambda offer: self._parse_offer(offer, carriers, aircraft))
   
-  def _parse_itinerary(self, itinerary_data: dict) -> Itinerary:
-    """Parse a single itinerary (outbound or return).
+  def _parse_offer(self, offer: Offer, carriers: Dict[str, str], aircraft: Dict[str, str]) -> Flight:
+    """Convert a single decoded flight offer.
     
     Args:
-      itinerary_data: Raw itinerary data from API
+      offer: Decoded flight offer
+      carriers: Carrier names by carrier code
+      aircraft: Aircraft names by aircraft code
       
     Returns:
-      Itinerary domain entity with parsed segments
+      Flight domain entity
     """
-    segments_data = itinerary_data.get("segments", [])
-    segments = []
+    itineraries = [self._parse_itinerary(itinerary, carriers, aircraft) for itinerary in offer.itineraries[:2]]
+    
+    return Flight(
+      offer_id=offer.id,
+      price=float(offer.price.total),
+      currency=offer.price.currency,
+      outbound=itineraries[0] if itineraries else None,
+      return_flight=itineraries[1] if len(itineraries) > 1 else None,
+      last_ticketing_date=offer.last_ticketing_date,
+      number_of_bookable_seats=offer.number_of_bookable_seats,
+      validating_airline_codes=offer.validating_airline_codes
+    )
+
+  def _parse_itinerary(self, itinerary: ItineraryData, carriers: Dict[str, str], aircraft: Dict[str, str]) -> Itinerary:
+    """Convert a single decoded itinerary (outbound or return).
     
-    for seg in segments_data:
-      departure = seg.get("departure", {})
-      arrival = seg.get("arrival", {})
+    Args:
+      itinerary: Decoded itinerary
+      carriers: Carrier names by carrier code
+      aircraft: Aircraft names by aircraft code
       
+    Returns:
+      Itinerary domain entity with its segments
+    """
+    segments = []
+    
+    for seg in itinerary.segments:
+      aircraft_code = seg.aircraft.code if seg.aircraft else None
       segment = FlightSegment(
-        departure_code=departure.get("iataCode", ""),
-        departure_time=departure.get("at", ""),
-        arrival_code=arrival.get("iataCode", ""),
-        arrival_time=arrival.get("at", ""),
-        carrier_code=seg.get("carrierCode", ""),
-        flight_number=seg.get("number", ""),
-        aircraft_code=seg.get("aircraft", {}).get("code"),
-        duration=seg.get("duration", "")
+        departure_code=seg.departure.iata_code,
+        departure_time=seg.departure.at,
+        arrival_code=seg.arrival.iata_code,
+        arrival_time=seg.arrival.at,
+        carrier_code=seg.carrier_code,
+        flight_number=seg.number,
+        aircraft_code=aircraft_code,
+        duration=seg.duration,
+        carrier_name=carriers.get(seg.carrier_code),
+        aircraft_name=aircraft.get(aircraft_code) if aircraft_code else None
       )
       segments.append(segment)
     
     return Itinerary(
-      duration=itinerary_data.get("duration", ""),
+      duration=itinerary.duration,
       segments=segments
-    )
\ No newline at end of file
+    )
@@ -1,5 +1,5 @@
 """LangChain tool for flight searches."""
-from typing import List, Optional
+from typing import List, Optional, Tuple
 import asyncio
 
 from langchain_core.tools import BaseTool
@@ -12,9 +12,14 @@ from shared.logging import setup_logger, log_function_call, log_function_result,
 class SearchFlightsTools(BaseTool):
   """LangChain tool wrapper for flight search functionality."""
   name: str = "flight_search"
-  description: str = "Search for a flight based on origin, destination, start date, end date, and max price"
+  description: str = (
+    "Search for flights based on origin, destination, start date, end date, max price and number of adults. "
+    "Optionally limit the number of results, restrict to direct flights, include or exclude airlines, "
+    "and choose the cabin class and currency; these filters are applied by the flight provider."
+  )
   args_schema: ArgsSchema = FlightSearchRequest 
   return_direct: bool = True
+  response_format: str = "content_and_artifact"
   search_flights: Optional[SearchFlights] = Field(default=None, exclude=True)
 
   def __init__(self, search_flights: SearchFlights):
@@ -27,7 +32,10 @@ class SearchFlightsTools(BaseTool):
     object.__setattr__(self, 'search_flights', search_flights)
     object.__setattr__(self, 'logger', setup_logger("search_flights_tools"))
     
-  def _run(self, origin_code: str, destination_code: str, start_date: str, end_date: str, max_price: int) -> List[Flight]:
+  def _run(self, origin_code: str, destination_code: str, start_date: str, end_date: str, max_price: int, adults: int = 1,
+           max_results: int = 5, non_stop: bool = False, included_airline_codes: Optional[List[str]] = None,
+           excluded_airline_codes: Optional[List[str]] = None, travel_class: Optional[str] = None,
+           currency: Optional[str] = None) -> Tuple[str, List[Flight]]:
     """Synchronous wrapper for the async flight search.
     
     Args:
@@ -36,22 +44,34 @@ class SearchFlightsTools(BaseTool):
       start_date: Departure date
       end_date: Return date
       max_price: Maximum price filter
+      adults: Number of adult passengers
+      max_results: Number of offers to return
+      non_stop: Whether to return direct flights only
+      included_airline_codes: Airline codes to restrict the search to
+      excluded_airline_codes: Airline codes to leave out of the search
+      travel_class: Cabin class
+      currency: Currency of the prices
       
     Returns:
-      List of available flights
+      Text of the available flights for the model, and the flights as artifact
       
     Raises:
       Exception: If search fails
     """
-    log_function_call(self.logger, "SearchFlightsTools._run", {"origin_code": origin_code, "destination_code": destination_code, "start_date": start_date, "end_date": end_date, "max_price": max_price})
+    params = {"origin_code": origin_code, "destination_code": destination_code, "start_date": start_date, "end_date": end_date, "max_price": max_price, "adults": adults,
+              "max_results": max_results, "non_stop": non_stop, "included_airline_codes": included_airline_codes,
+              "excluded_airline_codes": excluded_airline_codes, "travel_class": travel_class, "currency": currency}
+    log_function_call(self.logger, "SearchFlightsTools._run", params)
     try: 
-      flights = asyncio.run(self._arun(origin_code, destination_code, start_date, end_date, max_price))
-      return flights
+      return asyncio.run(self._arun(**params))
     except Exception as e:
-      log_function_error(self.logger, "SearchFlightsTools._run", e, {"origin_code": origin_code, "destination_code": destination_code, "start_date": start_date, "end_date": end_date, "max_price": max_price})
+      log_function_error(self.logger, "SearchFlightsTools._run", e, params)
       raise
     
-  async def _arun(self, origin_code: str, destination_code: str, start_date: str, end_date: str, max_price: int) -> List[Flight]:
+  async def _arun(self, origin_code: str, destination_code: str, start_date: str, end_date: str, max_price: int, adults: int = 1,
+                 max_results: int = 5, non_stop: bool = False, included_airline_codes: Optional[List[str]] = None,
+                 excluded_airline_codes: Optional[List[str]] = None, travel_class: Optional[str] = None,
+                 currency: Optional[str] = None) -> Tuple[str, List[Flight]]:
     """Asynchronously search for flights.
     
     Args:
@@ -60,21 +80,31 @@ class SearchFlightsTools(BaseTool):
       start_date: Departure date
       end_date: Return date
       max_price: Maximum price filter
+      adults: Number of adult passengers
+      max_results: Number of offers to return
+      non_stop: Whether to return direct flights only
+      included_airline_codes: Airline codes to restrict the search to
+      excluded_airline_codes: Airline codes to leave out of the search
+      travel_class: Cabin class
+      currency: Currency of the prices
       
     Returns:
-      List of available flights
+      Text of the available flights for the model, and the flights as artifact
       
     Raises:
       Exception: If search fails
     """
     self.logger.info(f"Searching for flights from {origin_code} to {destination_code}")
-    log_function_call(self.logger, "SearchFlightsTools._arun", {"origin_code": origin_code, "destination_code": destination_code, "start_date": start_date, "end_date": end_date, "max_price": max_price})
+    params = {"origin_code": origin_code, "destination_code": destination_code, "start_date": start_date, "end_date": end_date, "max_price": max_price, "adults": adults,
+              "max_results": max_results, "non_stop": non_stop, "included_airline_codes": included_airline_codes,
+              "excluded_airline_codes": excluded_airline_codes, "travel_class": travel_class, "currency": currency}
+    log_function_call(self.logger, "SearchFlightsTools._arun", params)
     
     try:
-      request = FlightSearchRequest(origin_code=origin_code, destination_code=destination_code, start_date=start_date, end_date=end_date, max_price=max_price)
+      request = FlightSearchRequest(**params)
       flights = await self.search_flights.execute(request)
       log_function_result(self.logger, "SearchFlightsTools._arun", {"flights_count": len(flights)})
-      return flights
+      return str(flights), flights
     except Exception as e:
-      log_function_error(self.logger, "SearchFlightsTools._arun", e, {"origin_code": origin_code, "destination_code": destination_code, "start_date": start_date, "end_date": end_date, "max_price": max_price})
-      raise
\ No newline at end of file
+      log_function_error(self.logger, "SearchFlightsTools._arun", e, params)
+      raise
@@ -1,8 +1,9 @@
 """Domain entities for LLM operations."""
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import cached_property
 from typing import List, Any, Optional, Type
 from pydantic import BaseModel
-from langchain_core.runnables import Runnable
+from langchain_core.runnables import Runnable, RunnableSequence
 from shared.config import settings
 
 @dataclass
@@ -23,10 +24,29 @@ class LLMResponse:
 class LLM:
   """Configuration for an LLM model."""
   temperature: float = 0.0
-  model: str = settings.MODEL_NAME
-  api_key: str = settings.GOOGLE_API_KEY
+  model: str = field(default_factory=lambda: settings.MODEL_NAME)
+  api_key: str = field(default_factory=lambda: settings.GOOGLE_API_KEY)
 
 @dataclass
 class LLMChain:
-  """Wrapper for a LangChain runnable chain."""
-  chain: Runnable
\ No newline at end of file
+  """Wrapper for a LangChain runnable chain.
+
+  Attributes:
+    chain: Prompt piped into the model
+    model: Name of the model the chain calls
+    schema_tokens: Estimated input tokens of the bound tool and output schemas
+  """
+  chain: Runnable
+  model: str = ""
+  schema_tokens: int = 0
+
+  @property
+  def prompt(self) -> Runnable:
+    """The chain's prompt template."""
+    return self.chain.first
+
+  @cached_property
+  def after_prompt(self) -> Runnable:
+    """The chain's steps after the prompt, to run on an already rendered prompt."""
+    steps = self.chain.steps[1:]
+    return steps[0] if len(steps) == 1 else RunnableSequence(*steps)
\ No newline at end of file
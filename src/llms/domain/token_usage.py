@@ -0,0 +1,83 @@
+"""Prompt token estimation and actual token usage tracking."""
+import json
+import math
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, List, Optional
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import ChatGeneration, LLMResult
+from langchain_core.tracers.context import register_configure_hook
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+# Characters per token of English text and JSON for Gemini models
+CHARS_PER_TOKEN = 4
+# Tokens of role and turn markers around each message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+class InputTokenCounter(BaseCallbackHandler):
+  """Callback handler summing the input tokens reported by chat models.
+
+  Attributes:
+    input_tokens: Input tokens reported so far (None until a model reports usage)
+  """
+  def __init__(self):
+    self.input_tokens: Optional[int] = None
+    self._lock = threading.Lock()
+
+  def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+    for generations in response.generations:
+      for generation in generations:
+        usage = getattr(generation.message, "usage_metadata", None) if isinstance(generation, ChatGeneration) else None
+        if usage:
+          with self._lock:
+            self.input_tokens = (self.input_tokens or 0) + usage.get("input_tokens", 0)
+
+_usage_callback: ContextVar[Optional[InputTokenCounter]] = ContextVar("token_usage_callback", default=None)
+# Registered once: every chat model run inside track_usage() reports to the active handler
+register_configure_hook(_usage_callback, inheritable=True)
+
+def estimate_text_tokens(text: str) -> int:
+  """Estimate the token count of a text."""
+  return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+def estimate_tool_tokens(tools: Optional[List[Any]]) -> int:
+  """Estimate the tokens taken by the schemas of bound tools."""
+  if not tools:
+    return 0
+  return sum(estimate_text_tokens(json.dumps(convert_to_openai_tool(tool), default=str)) for tool in tools)
+
+def estimate_prompt_tokens(messages: List[Any]) -> int:
+  """Estimate the input tokens of rendered prompt messages.
+
+  Args:
+    messages: Rendered messages (system prompt and conversation)
+
+  Returns:
+    Estimated token count
+  """
+  tokens = 0
+  for message in messages:
+    content = message.content if isinstance(message.content, str) else json.dumps(message.content, default=str)
+    tokens += estimate_text_tokens(content) + MESSAGE_OVERHEAD_TOKENS
+    tool_calls = getattr(message, "tool_calls", None)
+    if tool_calls:
+      tokens += estimate_text_tokens(json.dumps(tool_calls, default=str))
+  return tokens
+
+@contextmanager
+def track_usage() -> Iterator[InputTokenCounter]:
+  """Count the input tokens of the chat model calls made inside the block.
+
+  The handler is attached through the callback configuration, so callbacks
+  passed by the caller (tracing) are kept.
+
+  Yields:
+    Counter of the reported input tokens
+  """
+  handler = InputTokenCounter()
+  token = _usage_callback.set(handler)
+  try:
+    yield handler
+  finally:
+    _usage_callback.reset(token)
@@ -1,39 +1,75 @@
 """Google Generative AI client implementation."""
-from langchain_google_genai import ChatGoogleGenerativeAI
+import asyncio
+from importlib.metadata import PackageNotFoundError, version
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 from llms.domain.llm_client import LLMClient
 from shared.config import settings
 from shared.logging import setup_logger, log_function_call, log_function_result, log_function_error
 
+if TYPE_CHECKING:
+  from google.ai.generativelanguage_v1beta.services.generative_service import GenerativeServiceAsyncClient
+  from langchain_google_genai import ChatGoogleGenerativeAI
+
+# langchain-google-genai releases whose async client setup _build_async_client mirrors
+SUPPORTED_GENAI_VERSIONS = ("3.",)
+
+def _keepalive_supported() -> bool:
+  """Whether the installed langchain-google-genai lets the async channel be replaced safely."""
+  try:
+    return version("langchain-google-genai").startswith(SUPPORTED_GENAI_VERSIONS)
+  except PackageNotFoundError:
+    return False
+
 class GoogleClient(LLMClient):
-  """Client for interacting with Google's Generative AI."""
+  """Client for interacting with Google's Generative AI.
+
+  Holds one long-lived model instance per (model, temperature). Its async
+  gRPC channel is created with keep-alive options and shared by every chain
+  built on that configuration, so connection setup, TLS and auth happen once
+  instead of on every node invocation. The Google SDK is imported on first
+  use. On langchain-google-genai versions other than SUPPORTED_GENAI_VERSIONS
+  the library's own async client is kept, without keep-alive options.
+  """
   def __init__(self):
     """Initialize the Google Generative AI client."""
     self.logger = setup_logger("google_client")
     self.logger.info("Initializing GoogleClient")
-    
-  def get_llm(self, temperature: float = 0.0, model: str = settings.MODEL_NAME) -> ChatGoogleGenerativeAI:
-    """Get a configured LLM instance.
-    
+    self._llms: Dict[Tuple[str, float], "ChatGoogleGenerativeAI"] = {}
+    self._channel_loops: Dict[Tuple[str, float], asyncio.AbstractEventLoop] = {}
+    self.keepalive_enabled = _keepalive_supported()
+    if not self.keepalive_enabled:
+      self.logger.warning("Unsupported langchain-google-genai version, Gemini channels use the library defaults")
+
+  def get_llm(self, temperature: float = 0.0, model: Optional[str] = None) -> "ChatGoogleGenerativeAI":
+    """Get the shared LLM instance of a model configuration.
+
     Args:
       temperature: Sampling temperature for the model
-      model: Name of the model to use
-      
+      model: Name of the model to use (MODEL_NAME if omitted)
+
     Returns:
       Configured ChatGoogleGenerativeAI instance
-      
+
     Raises:
       Exception: If LLM creation fails
     """
+    model = model or settings.MODEL_NAME
+    key = (model, temperature)
+    llm = self._llms.get(key)
+    if llm is not None:
+      return llm
     log_function_call(self.logger, "get_llm", {
       "temperature": temperature,
       "model": model
     })
     try:
+      from langchain_google_genai import ChatGoogleGenerativeAI
       llm = ChatGoogleGenerativeAI(
         model=model,
         temperature=temperature,
         api_key=settings.GOOGLE_API_KEY
       )
+      self._llms[key] = llm
       log_function_result(self.logger, "get_llm", {"llm": llm})
       return llm
     except Exception as e:
@@ -41,4 +77,95 @@ class GoogleClient(LLMClient):
         "temperature": temperature,
         "model": model
       })
-      raise
\ No newline at end of file
+      raise
+
+  @staticmethod
+  def _channel_options() -> List[Tuple[str, int]]:
+    """gRPC channel arguments keeping the connection warm between bursts."""
+    return [
+      ("grpc.keepalive_time_ms", int(settings.GEMINI_KEEPALIVE_TIME_SECONDS * 1000)),
+      ("grpc.keepalive_timeout_ms", int(settings.GEMINI_KEEPALIVE_TIMEOUT_SECONDS * 1000)),
+      ("grpc.keepalive_permit_without_calls", int(settings.GEMINI_KEEPALIVE_WITHOUT_CALLS)),
+      ("grpc.http2.max_pings_without_data", 0),
+      ("grpc.client_idle_timeout_ms", int(settings.GEMINI_CHANNEL_IDLE_TIMEOUT_SECONDS * 1000)),
+    ]
+
+  def _build_async_client(self, llm: "ChatGoogleGenerativeAI") -> "GenerativeServiceAsyncClient":
+    """Async client configured like the model's own, with keep-alive options on its channel.
+
+    Credentials, API key, client options (endpoint, proxy...) and client
+    info are prepared by the library exactly as in
+    ChatGoogleGenerativeAI.async_client; only the transport is replaced.
+    """
+    from pydantic import SecretStr
+    from google.ai.generativelanguage_v1beta.services.generative_service import GenerativeServiceAsyncClient
+    from google.ai.generativelanguage_v1beta.services.generative_service.transports.grpc_asyncio import GenerativeServiceGrpcAsyncIOTransport
+    from langchain_google_genai import _genai_extension as genaix
+    from langchain_google_genai._common import get_client_info
+
+    def create_channel(*args, options: Optional[list] = None, **kwargs):
+      return GenerativeServiceGrpcAsyncIOTransport.create_channel(
+        *args, options=[*(options or []), *self._channel_options()], **kwargs
+      )
+
+    def create_transport(**kwargs) -> GenerativeServiceGrpcAsyncIOTransport:
+      return GenerativeServiceGrpcAsyncIOTransport(channel=create_channel, **kwargs)
+
+    api_key = None
+    if not llm.credentials:
+      api_key = llm.google_api_key.get_secret_value() if isinstance(llm.google_api_key, SecretStr) else llm.google_api_key
+    config = genaix._prepare_config(
+      credentials=llm.credentials,
+      api_key=api_key,
+      client_options=llm.client_options,
+      client_info=get_client_info(f"ChatGoogleGenerativeAI:{llm.model}"),
+      transport="grpc_asyncio"
+    )
+    config["transport"] = create_transport
+    return GenerativeServiceAsyncClient(**config)
+
+  def bind_to_running_loop(self) -> None:
+    """Give every shared LLM an async channel bound to the running event loop.
+
+    gRPC asyncio channels belong to the loop they were created in; channels
+    from another loop are replaced. Must be called from a coroutine. Does
+    nothing on unsupported langchain-google-genai versions.
+    """
+    if not self.keepalive_enabled:
+      return
+    loop = asyncio.get_running_loop()
+    for key, llm in self._llms.items():
+      if self._channel_loops.get(key) is not loop:
+        llm.async_client_running = self._build_async_client(llm)
+        self._channel_loops[key] = loop
+
+  async def warm_up(self) -> None:
+    """Open the channel of every shared LLM ahead of the first request.
+
+    Sends a token count request, which establishes the connection and
+    authenticates without generating content. Failures are logged only, so
+    the application still starts when the API is unreachable.
+    """
+    from google.ai.generativelanguage_v1beta import Content, CountTokensRequest, Part
+
+    self.bind_to_running_loop()
+    for (model, temperature), llm in self._llms.items():
+      try:
+        await llm.async_client.count_tokens(
+          request=CountTokensRequest(model=llm.model, contents=[Content(parts=[Part(text="ping")])]),
+          retry=None,
+          timeout=settings.GEMINI_WARM_UP_TIMEOUT_SECONDS
+        )
+        self.logger.info(f"Warmed up Gemini channel for {model} (temperature={temperature})")
+      except Exception as e:
+        log_function_error(self.logger, "warm_up", e, {
+          "temperature": temperature,
+          "model": model
+        })
+
+  async def aclose(self) -> None:
+    """Close the async channels of the shared LLMs."""
+    for key, llm in self._llms.items():
+      if self._channel_loops.pop(key, None) is not None and llm.async_client_running is not None:
+        await llm.async_client_running.transport.close()
+        llm.async_client_running = None
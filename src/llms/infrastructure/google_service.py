@@ -1,6 +1,8 @@
 """Google service implementation for LLM operations."""
+from typing import Dict, Hashable, Iterable, Optional, Tuple
 from llms.domain.llm_service import LLMService
 from llms.domain.llm_entities import LLMChainRequest, LLMResponse, LLMChain
+from llms.domain.token_usage import estimate_tool_tokens
 from llms.infrastructure.google_client import GoogleClient
 from shared.logging import setup_logger, log_function_call, log_function_result, log_function_error
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
@@ -8,10 +10,92 @@ from shared.config import settings
 
 class GoogleService(LLMService):
   """Service implementation for Google Generative AI."""
-  def __init__(self):
-    """Initialize the Google LLM service."""
+  def __init__(self, cache_chains: Optional[bool] = None):
+    """Initialize the Google LLM service.
+    
+    Args:
+      cache_chains: Reuse the chain built for an identical configuration
+        (LLM_CHAIN_CACHE_ENABLED if omitted)
+    """
     self.client = GoogleClient()
     self.logger = setup_logger("google_service")
+    self.cache_chains = settings.LLM_CHAIN_CACHE_ENABLED if cache_chains is None else cache_chains
+    self._chains: Dict[Tuple[Hashable, ...], LLMChain] = {}
+  
+  @staticmethod
+  def _chain_key(request: LLMChainRequest, model: str) -> Tuple[Hashable, ...]:
+    """Stable identity of a chain configuration.
+    
+    Tools are identified by name and the structured output by its type, so
+    requests rebuilt on every call still hit the same chain.
+    """
+    tools = tuple(getattr(tool, "name", None) or getattr(tool, "__name__", repr(tool)) for tool in request.tools or [])
+    structured_output = request.structured_output
+    output_key = f"{structured_output.__module__}.{structured_output.__qualname__}" if structured_output else None
+    return request.prompt, tools, output_key, request.temperature, model
+  
+  def _build_chain(self, request: LLMChainRequest, model: str) -> LLMChain:
+    llm = self.client.get_llm(temperature=request.temperature, model=model)
+    
+    if request.tools:
+      llm = llm.bind_tools(request.tools)
+      self.logger.info("Tools bound to LLM")
+    
+    if request.structured_output:
+      llm = llm.with_structured_output(request.structured_output)
+      self.logger.info("Structured output bound to LLM")
+    
+    prompt = ChatPromptTemplate.from_messages([
+      ("system", request.prompt),
+      MessagesPlaceholder(variable_name="messages")
+      ],
+      template_format="jinja2", 
+    )
+    chain = prompt | llm 
+    schemas = [*(request.tools or []), *([request.structured_output] if request.structured_output else [])]
+    return LLMChain(chain=chain, model=model, schema_tokens=estimate_tool_tokens(schemas))
+  
+  def chain_for(self, request: LLMChainRequest) -> LLMChain:
+    """Return the chain of a configuration, building it on first use.
+    
+    Args:
+      request: Request containing chain configuration
+      
+    Returns:
+      LLMChain with configured prompt and tools
+    """
+    model = settings.MODEL_NAME
+    if not self.cache_chains:
+      return self._build_chain(request, model)
+    key = self._chain_key(request, model)
+    chain = self._chains.get(key)
+    if chain is None:
+      chain = self._chains[key] = self._build_chain(request, model)
+      self.logger.info(f"Cached LLM chain ({len(self._chains)} cached)")
+    return chain
+  
+  def warm_up(self, requests: Iterable[LLMChainRequest]) -> int:
+    """Build the chains of known configurations ahead of the first request.
+    
+    Args:
+      requests: Chain configurations used by the application
+      
+    Returns:
+      Number of cached chains
+    """
+    for request in requests:
+      self.chain_for(request)
+    self.logger.info(f"LLM chain cache warmed with {len(self._chains)} chains")
+    return len(self._chains)
+  
+  async def warm_up_connections(self) -> None:
+    """Open the Gemini connection of the default model configuration ahead of the first request."""
+    self.client.get_llm(temperature=0.0, model=settings.MODEL_NAME)
+    await self.client.warm_up()
+  
+  async def aclose(self) -> None:
+    """Close the Gemini connections."""
+    await self.client.aclose()
     
   async def get_chain(self, request: LLMChainRequest) -> LLMResponse:
     """Create an LLM chain based on the request.
@@ -32,24 +116,9 @@ class GoogleService(LLMService):
       "temperature": request.temperature
     })
     try:
-      llm = self.client.get_llm(temperature=request.temperature, model=settings.MODEL_NAME)
-      
-      if request.tools:
-        llm = llm.bind_tools(request.tools)
-        self.logger.info("Tools bound to LLM")
-      
-      if request.structured_output:
-        llm = llm.with_structured_output(request.structured_output)
-        self.logger.info("Structured output bound to LLM")
-      
-      prompt = ChatPromptTemplate.from_messages([
-        ("system", request.prompt),
-        MessagesPlaceholder(variable_name="messages")
-        ],
-        template_format="jinja2", 
-      )
-      chain = prompt | llm 
-      return LLMChain(chain=chain)
+      chain = self.chain_for(request)
+      self.client.bind_to_running_loop()
+      return chain
     except Exception as e:
       log_function_error(self.logger, "generate_response", e, {
         "prompt": request.prompt,
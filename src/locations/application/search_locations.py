@@ -1,18 +1,23 @@
 """Application use case for searching locations."""
-from typing import List
+from typing import List, Optional
 from locations.domain.location_repository import LocationRepository
 from locations.domain.location_entities import LocationSearchRequest, Location
 from shared.logging import setup_logger, log_function_call, log_function_result, log_function_error
 
 class SearchLocations:
   """Use case for searching locations by city name."""
-  def __init__(self, repository: LocationRepository):
+  def __init__(self, repository: LocationRepository, fallback_repository: Optional[LocationRepository] = None,
+               last_resort_repository: Optional[LocationRepository] = None):
     """Initialize the search locations use case.
     
     Args:
-      repository: Repository for location data access
+      repository: Primary repository for location data access
+      fallback_repository: Repository consulted when the primary one finds nothing
+      last_resort_repository: Repository consulted when the fallback finds nothing either
     """
     self.repository = repository
+    self.fallback_repository = fallback_repository
+    self.last_resort_repository = last_resort_repository
     self.logger = setup_logger("search_locations")
   
   async def execute(self, request: LocationSearchRequest) -> List[Location]:
@@ -32,6 +37,12 @@ class SearchLocations:
     })
     try:
       locations = await self.repository.search_locations(request)
+      if not locations and self.fallback_repository is not None:
+        self.logger.info(f"No locations found for {request.city} in primary repository, using fallback")
+        locations = await self.fallback_repository.search_locations(request)
+      if not locations and self.last_resort_repository is not None:
+        self.logger.info(f"No locations found for {request.city} in fallback repository, using last resort")
+        locations = await self.last_resort_repository.search_locations(request)
       log_function_result(self.logger, "execute", {"locations_count": len(locations)})
       return locations
     except Exception as e:
@@ -1,18 +1,37 @@
 """Domain entities for location searches."""
+import unicodedata
 from dataclasses import dataclass
+from typing import Optional
 from pydantic import BaseModel, Field
 
+CITY = "CITY"
+AIRPORT = "AIRPORT"
+
 @dataclass
 class Location:
   """Represents a location with IATA code."""
   name: str
   iata_code: str
   country: str
+  subtype: Optional[str] = None
+
+def normalize_keyword(keyword: str) -> str:
+  """Fold case, accents and whitespace so equivalent city names compare equal.
+  
+  Example: "  São   Paulo " -> "sao paulo"
+  """
+  decomposed = unicodedata.normalize("NFKD", keyword)
+  without_accents = "".join(char for char in decomposed if not unicodedata.combining(char))
+  return " ".join(without_accents.split()).casefold()
 
 class LocationSearchRequest(BaseModel):
   """Request model for location searches."""
   city: str = Field(description="The city to search for")
 
+  def search_key(self) -> str:
+    """Normalized identity of the search, used to coalesce and cache identical requests."""
+    return normalize_keyword(self.city)
+
 class LocationSearchResult(BaseModel):
   """Result model for location searches."""
   origin_code: str = Field(description="The IATA code of the origin city")
@@ -0,0 +1,32 @@
+"""Deterministic selection of an IATA code from location search results."""
+from typing import List, Optional
+from locations.domain.location_entities import AIRPORT, CITY, Location, normalize_keyword
+
+def resolve_location_code(query: str, locations: List[Location]) -> Optional[str]:
+  """Pick the IATA code for a searched city when the results are unambiguous.
+
+  The results are unambiguous when:
+    - they all share a single code;
+    - they are one metro city code followed by its airports;
+    - exactly one city's name matches the searched name.
+
+  Args:
+    query: City name that was searched
+    locations: Results of the location search
+
+  Returns:
+    The IATA code, or None if picking one requires judgement
+  """
+  codes = {location.iata_code for location in locations}
+  if len(codes) == 1:
+    return codes.pop()
+
+  cities = [location for location in locations if location.subtype == CITY]
+  if len(cities) == 1 and all(location.subtype == AIRPORT for location in locations if location is not cities[0]):
+    return cities[0].iata_code
+
+  key = normalize_keyword(query)
+  named = {location.iata_code for location in locations if normalize_keyword(location.name) == key and location.subtype != AIRPORT}
+  if len(named) == 1:
+    return named.pop()
+  return None
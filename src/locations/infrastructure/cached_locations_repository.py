@@ -0,0 +1,67 @@
+"""Caching decorator for location repositories."""
+import asyncio
+from typing import List
+from locations.domain.location_repository import LocationRepository
+from locations.domain.location_entities import LocationSearchRequest, Location
+from locations.infrastructure.sqlite_location_cache import SQLiteLocationCache
+from shared.logging import setup_logger, log_function_call, log_function_result, log_function_error
+
+class CachedLocationRepository(LocationRepository):
+  """Location repository backed by a persistent cache with a long TTL.
+
+  City to IATA code mappings rarely change, so results of the wrapped
+  repository are kept for days. Lookups are keyed on the normalized city
+  name, so "Bogotá", "bogota" and " BOGOTA " share one entry.
+  """
+  def __init__(self, repository: LocationRepository, cache: SQLiteLocationCache,
+               ttl_seconds: float, negative_ttl_seconds: float):
+    """Initialize the caching repository.
+
+    Args:
+      repository: Repository used on cache misses
+      cache: Persistent location cache
+      ttl_seconds: Seconds a non-empty result is cached
+      negative_ttl_seconds: Seconds an empty result is cached
+    """
+    self.repository = repository
+    self.cache = cache
+    self.ttl_seconds = ttl_seconds
+    self.negative_ttl_seconds = negative_ttl_seconds
+    self.logger = setup_logger("cached_locations_repository")
+
+  async def search_locations(self, request: LocationSearchRequest) -> List[Location]:
+    """Search for locations, serving cached results when available.
+
+    Args:
+      request: Location search request with city name
+
+    Returns:
+      List of location objects matching the city name
+
+    Raises:
+      Exception: If the search fails on a cache miss
+    """
+    keyword = request.search_key()
+    locations = self.cache.get_cached(keyword)
+    if locations is None:
+      locations = await asyncio.to_thread(self.cache.get, keyword)
+    if locations is not None:
+      return list(locations)
+
+    log_function_call(self.logger, "search_locations", {"cache": "miss", "keyword": keyword})
+    locations = await self.repository.search_locations(request)
+    ttl = self.ttl_seconds if locations else self.negative_ttl_seconds
+    try:
+      await asyncio.to_thread(self.cache.set, keyword, locations, ttl)
+      log_function_result(self.logger, "search_locations", {"cached": keyword, "locations_count": len(locations)})
+    except Exception as e:
+      log_function_error(self.logger, "search_locations", e, {"keyword": keyword})
+    return list(locations)
+
+  def warm_load(self) -> int:
+    """Load the persistent cache into memory.
+
+    Returns:
+      Number of entries loaded
+    """
+    return self.cache.warm_load()
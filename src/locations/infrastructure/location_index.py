@@ -0,0 +1,273 @@
+"""Offline, memory-mapped index of cities, metro areas and airports.
+
+The bundled CSV dataset is compiled into a compact binary file that is
+memory-mapped read-only, so loading takes milliseconds and the pages are
+shared by every worker process through the OS page cache.
+
+Binary layout (little endian)::
+
+  header   magic, source sha256, counts and section offsets
+  records  code, type, country, name, metro record, member range
+  members  record indices of the airports belonging to each metro area
+  keys     normalized lookup keys sorted bytewise, each pointing to a record
+  strings  UTF-8 string blob referenced by records and keys
+
+Build the index explicitly with::
+
+  python -m locations.infrastructure.location_index --output cache/locations.idx
+"""
+import argparse
+import csv
+import difflib
+import hashlib
+import io
+import mmap
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+from locations.domain.location_entities import AIRPORT as LOCATION_AIRPORT, CITY as LOCATION_CITY, Location, normalize_keyword
+from shared.config import resolve_project_path
+from shared.logging import setup_logger
+
+DEFAULT_SOURCE_PATH = Path(__file__).parent / "data" / "locations.csv"
+
+_MAGIC = b"LOCIDX01"
+_HEADER = struct.Struct("<8s32s7I")
+_RECORD = struct.Struct("<4sc2sIHiIH")
+_MEMBER = struct.Struct("<I")
+_KEY = struct.Struct("<IHI")
+
+CITY = b"C"
+AIRPORT = b"A"
+
+# Shorter keys are IATA codes or abbreviations that fuzzy-match unrelated
+# names ("bern" scores 0.86 against "ber").
+FUZZY_MIN_KEY_LENGTH = 4
+
+logger = setup_logger("location_index")
+
+def build_location_index(source_path: Path, index_path: Path) -> int:
+  """Compile the CSV dataset into the binary index file.
+
+  The CSV has the columns ``code,type,name,country,metro,aliases`` where
+  ``type`` is C (city or metro area) or A (airport), ``metro`` is the city
+  code an airport belongs to and ``aliases`` is a ``|``-separated list of
+  alternative, possibly multilingual, names.
+
+  Args:
+    source_path: Path of the CSV dataset
+    index_path: Path of the index file to write
+
+  Returns:
+    Number of records written
+  """
+  raw = Path(source_path).read_bytes()
+  rows = list(csv.DictReader(io.StringIO(raw.decode("utf-8"))))
+  # Cities first, so that they win key collisions against airports.
+  rows.sort(key=lambda row: row["type"] != "C")
+  record_by_code = {}
+  for index, row in enumerate(rows):
+    record_by_code.setdefault(row["code"], index)
+
+  members: Dict[int, List[int]] = {}
+  for index, row in enumerate(rows):
+    if row["metro"]:
+      members.setdefault(record_by_code[row["metro"]], []).append(index)
+
+  strings = bytearray()
+  def add_string(value: str) -> tuple:
+    encoded = value.encode("utf-8")
+    offset = len(strings)
+    strings.extend(encoded)
+    return offset, len(encoded)
+
+  keys: Dict[bytes, int] = {}
+  records = bytearray()
+  member_table = bytearray()
+  member_count = 0
+  for index, row in enumerate(rows):
+    name_offset, name_length = add_string(row["name"])
+    metro = record_by_code[row["metro"]] if row["metro"] else -1
+    record_members = members.get(index, [])
+    records += _RECORD.pack(
+      row["code"].encode("ascii"), row["type"].encode("ascii"), row["country"].encode("ascii"),
+      name_offset, name_length, metro, member_count, len(record_members)
+    )
+    for member in record_members:
+      member_table += _MEMBER.pack(member)
+    member_count += len(record_members)
+
+    aliases = [alias for alias in (row["aliases"] or "").split("|") if alias]
+    for alias in [row["code"], row["name"], *aliases]:
+      keys.setdefault(normalize_keyword(alias).encode("utf-8"), index)
+
+  key_table = bytearray()
+  for key in sorted(keys):
+    key_offset = len(strings)
+    strings.extend(key)
+    key_table += _KEY.pack(key_offset, len(key), keys[key])
+
+  records_offset = _HEADER.size
+  members_offset = records_offset + len(records)
+  keys_offset = members_offset + len(member_table)
+  strings_offset = keys_offset + len(key_table)
+  header = _HEADER.pack(
+    _MAGIC, hashlib.sha256(raw).digest(), len(rows), member_count, len(keys),
+    records_offset, members_offset, keys_offset, strings_offset
+  )
+
+  index_path = Path(index_path)
+  index_path.parent.mkdir(parents=True, exist_ok=True)
+  fd, tmp_path = tempfile.mkstemp(dir=index_path.parent, prefix=".locations_idx_")
+  with os.fdopen(fd, "wb") as tmp_file:
+    tmp_file.write(header + records + member_table + key_table + strings)
+  os.chmod(tmp_path, 0o644)
+  os.replace(tmp_path, index_path)
+  logger.info(f"Built location index with {len(rows)} records and {len(keys)} keys at {index_path}")
+  return len(rows)
+
+class LocationIndex:
+  """Read-only view over a memory-mapped location index file."""
+  def __init__(self, index_path: Path, fuzzy_cutoff: float = 0.85):
+    """Memory-map an index file.
+
+    Args:
+      index_path: Path of the index file
+      fuzzy_cutoff: Minimum similarity (0-1) for fuzzy matches
+
+    Raises:
+      ValueError: If the file is not a location index
+    """
+    self.index_path = Path(index_path)
+    self.fuzzy_cutoff = fuzzy_cutoff
+    with open(self.index_path, "rb") as index_file:
+      self._map = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+    (magic, self.source_digest, self.record_count, _, self.key_count,
+     self._records_offset, self._members_offset, self._keys_offset, self._strings_offset) = _HEADER.unpack_from(self._map, 0)
+    if magic != _MAGIC:
+      self._map.close()
+      raise ValueError(f"{self.index_path} is not a location index")
+    self._all_keys: Optional[List[str]] = None
+    self._fuzzy_keys: Optional[List[str]] = None
+
+  def _string(self, offset: int, length: int) -> bytes:
+    start = self._strings_offset + offset
+    return self._map[start:start + length]
+
+  def _key(self, position: int) -> tuple:
+    key_offset, key_length, record = _KEY.unpack_from(self._map, self._keys_offset + position * _KEY.size)
+    return self._string(key_offset, key_length), record
+
+  def _find(self, key: bytes) -> Optional[int]:
+    low, high = 0, self.key_count
+    while low < high:
+      middle = (low + high) // 2
+      candidate, record = self._key(middle)
+      if candidate == key:
+        return record
+      if candidate < key:
+        low = middle + 1
+      else:
+        high = middle
+    return None
+
+  def _location(self, record: int) -> tuple:
+    code, kind, country, name_offset, name_length, metro, members_start, members_count = _RECORD.unpack_from(
+      self._map, self._records_offset + record * _RECORD.size
+    )
+    location = Location(
+      name=self._string(name_offset, name_length).decode("utf-8"),
+      iata_code=code.rstrip(b"\0").decode("ascii"),
+      country=country.decode("ascii"),
+      subtype=LOCATION_CITY if kind == CITY else LOCATION_AIRPORT
+    )
+    return location, kind, members_start, members_count
+
+  def keys(self) -> List[str]:
+    """All normalized lookup keys (names, aliases and codes)."""
+    if self._all_keys is None:
+      self._all_keys = [self._key(position)[0].decode("utf-8") for position in range(self.key_count)]
+    return self._all_keys
+
+  def fuzzy_keys(self) -> List[str]:
+    """Lookup keys eligible for fuzzy matching: names and aliases, not codes."""
+    if self._fuzzy_keys is None:
+      fuzzy_keys = []
+      for position in range(self.key_count):
+        key, record = self._key(position)
+        if len(key) < FUZZY_MIN_KEY_LENGTH:
+          continue
+        code = _RECORD.unpack_from(self._map, self._records_offset + record * _RECORD.size)[0]
+        if key == code.rstrip(b"\0").lower():
+          continue
+        fuzzy_keys.append(key.decode("utf-8"))
+      self._fuzzy_keys = fuzzy_keys
+    return self._fuzzy_keys
+
+  def lookup(self, keyword: str, fuzzy: bool = True) -> List[Location]:
+    """Resolve a city, alias, airport or code to locations.
+
+    A metro area resolves to its city code followed by its member airports.
+
+    Args:
+      keyword: Free-form city or airport name
+      fuzzy: Whether to fall back to the closest name or alias on an exact miss
+
+    Returns:
+      Matching locations, or an empty list
+    """
+    key = normalize_keyword(keyword)
+    record = self._find(key.encode("utf-8"))
+    if record is None and fuzzy and len(key) >= FUZZY_MIN_KEY_LENGTH:
+      matches = difflib.get_close_matches(key, self.fuzzy_keys(), n=1, cutoff=self.fuzzy_cutoff)
+      if matches:
+        record = self._find(matches[0].encode("utf-8"))
+    if record is None:
+      return []
+
+    location, kind, members_start, members_count = self._location(record)
+    locations = [location]
+    if kind == CITY:
+      for position in range(members_start, members_start + members_count):
+        (member,) = _MEMBER.unpack_from(self._map, self._members_offset + position * _MEMBER.size)
+        locations.append(self._location(member)[0])
+    return locations
+
+  def close(self) -> None:
+    """Unmap the index file."""
+    self._map.close()
+
+def load_location_index(index_path: Path, source_path: Path = DEFAULT_SOURCE_PATH, fuzzy_cutoff: float = 0.85) -> LocationIndex:
+  """Memory-map the index, (re)building it first if missing or outdated.
+
+  Relative paths are resolved against the project root, so every worker
+  maps the same file whatever its working directory.
+
+  Args:
+    index_path: Path of the index file
+    source_path: Path of the CSV dataset the index is built from
+    fuzzy_cutoff: Minimum similarity (0-1) for fuzzy matches
+
+  Returns:
+    Loaded LocationIndex
+  """
+  index_path = resolve_project_path(index_path)
+  source_path = resolve_project_path(source_path)
+  source_digest = hashlib.sha256(source_path.read_bytes()).digest()
+  if index_path.exists():
+    index = LocationIndex(index_path, fuzzy_cutoff)
+    if index.source_digest == source_digest:
+      return index
+    index.close()
+    logger.info(f"Location index {index_path} is outdated, rebuilding")
+  build_location_index(source_path, index_path)
+  return LocationIndex(index_path, fuzzy_cutoff)
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description="Build the offline location index.")
+  parser.add_argument("--source", default=str(DEFAULT_SOURCE_PATH), help="CSV dataset to compile")
+  parser.add_argument("--output", default="cache/locations.idx", help="Index file to write")
+  args = parser.parse_args()
+  build_location_index(resolve_project_path(args.source), resolve_project_path(args.output))
@@ -0,0 +1,44 @@
+"""Repository implementation for location searches using the offline index."""
+from typing import List
+from locations.domain.location_repository import LocationRepository
+from locations.domain.location_entities import LocationSearchRequest, Location
+from locations.infrastructure.location_index import LocationIndex
+from shared.logging import setup_logger, log_function_call, log_function_result, log_function_error
+
+class OfflineLocationRepository(LocationRepository):
+  """Repository resolving cities to IATA codes from the bundled offline index.
+
+  No network call is made; unknown cities return an empty list so that a
+  fallback repository can be consulted.
+  """
+  def __init__(self, index: LocationIndex, fuzzy: bool = False):
+    """Initialize the offline location repository.
+
+    Args:
+      index: Memory-mapped location index
+      fuzzy: Whether to return the closest name or alias on an exact miss
+    """
+    self.index = index
+    self.fuzzy = fuzzy
+    self.logger = setup_logger("offline_locations_repository")
+
+  async def search_locations(self, request: LocationSearchRequest) -> List[Location]:
+    """Search for locations in the offline index.
+
+    Args:
+      request: Location search request with city name
+
+    Returns:
+      List of matching locations; a metro area is followed by its airports
+
+    Raises:
+      Exception: If the index cannot be read
+    """
+    log_function_call(self.logger, "search_locations", {"city": request.city})
+    try:
+      locations = self.index.lookup(request.city, fuzzy=self.fuzzy)
+      log_function_result(self.logger, "search_locations", {"locations_count": len(locations)})
+      return locations
+    except Exception as e:
+      log_function_error(self.logger, "search_locations", e, {"city": request.city})
+      raise
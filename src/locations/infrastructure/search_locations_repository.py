@@ -3,10 +3,14 @@ from typing import List
 from amadeus.infrastructure.amadeus_client import AmadeusClient
 from locations.domain.location_repository import LocationRepository
 from locations.domain.location_entities import LocationSearchRequest, Location
+from shared.single_flight import SingleFlight
 from shared.logging import setup_logger, log_function_call, log_function_result, log_function_error
 
 class SearchLocationsRepository(LocationRepository):
-  """Repository implementation for searching locations via Amadeus API."""
+  """Repository implementation for searching locations via Amadeus API.
+  
+  Concurrent searches for the same city are coalesced into a single Amadeus request.
+  """
   def __init__(self, client: AmadeusClient):
     """Initialize the location search repository.
     
@@ -15,6 +19,7 @@ class SearchLocationsRepository(LocationRepository):
     """
     self.client = client
     self.logger = setup_logger("search_locations_repository")
+    self._single_flight = SingleFlight("search_locations")
     
   async def search_locations(self, request: LocationSearchRequest) -> List[Location]:
     """Search for locations using the Amadeus API.
@@ -32,8 +37,8 @@ class SearchLocationsRepository(LocationRepository):
       "city": request.city
     })
     try:
-      raw_data = self.client.search_locations(request.city)
-      locations = self._parse_locations(raw_data)
+      locations = await self._single_flight.do(request.search_key(), lambda: self._fetch_locations(request))
+      locations = list(locations)
       log_function_result(self.logger, "search_locations", {"locations_count": len(locations)})
       return locations
     except Exception as e:
@@ -42,6 +47,18 @@ class SearchLocationsRepository(LocationRepository):
       })
       raise
       
+  async def _fetch_locations(self, request: LocationSearchRequest) -> List[Location]:
+    """Fetch and parse locations for a request from the Amadeus API.
+    
+    Args:
+      request: Location search request with city name
+      
+    Returns:
+      List of Location domain entities
+    """
+    raw_data = await self.client.search_locations(request.city)
+    return self._parse_locations(raw_data)
+      
   def _parse_locations(self, raw_data: dict) -> List[Location]:
     """Parse raw location data from Amadeus API into domain entities.
     
@@ -57,6 +74,7 @@ class SearchLocationsRepository(LocationRepository):
         locations.append(Location(
           name=location["name"],
           iata_code=location["iataCode"],
-          country=location["address"]["countryCode"]
+          country=location["address"]["countryCode"],
+          subtype=location.get("subType")
         ))
     return locations
\ No newline at end of file
@@ -1,5 +1,5 @@
 """LangChain tool for location searches."""
-from typing import List, Optional
+from typing import List, Optional, Tuple
 import asyncio
 
 from langchain_core.tools import BaseTool
@@ -15,6 +15,7 @@ class SearchLocationTools(BaseTool):
   description: str = "Search for a location code based on a keyword. The keyword is the city name."
   args_schema: ArgsSchema = LocationSearchRequest  
   return_direct: bool = True
+  response_format: str = "content_and_artifact"
   search_locations: Optional[SearchLocations] = Field(default=None, exclude=True)
   
   def __init__(self, search_locations: SearchLocations):
@@ -27,34 +28,33 @@ class SearchLocationTools(BaseTool):
     object.__setattr__(self, 'search_locations', search_locations)
     object.__setattr__(self, 'logger', setup_logger("search_location_tools"))
     
-  def _run(self, city: str) -> List[Location]:
+  def _run(self, city: str) -> Tuple[str, List[Location]]:
     """Synchronous wrapper for the async location search.
     
     Args:
       city: City name to search for
       
     Returns:
-      List of location results
+      Text of the location results for the model, and the locations as artifact
       
     Raises:
       Exception: If search fails
     """
     log_function_call(self.logger, "SearchLocationTools._run", {"city": city})
     try: 
-      locations = asyncio.run(self._arun(city))
-      return locations
+      return asyncio.run(self._arun(city))
     except Exception as e:
       log_function_error(self.logger, "SearchLocationTools._run", e, {"city": city})
       raise
     
-  async def _arun(self, city: str) -> List[Location]:
+  async def _arun(self, city: str) -> Tuple[str, List[Location]]:
     """Asynchronously search for locations.
     
     Args:
       city: City name to search for
       
     Returns:
-      List of location results
+      Text of the location results for the model, and the locations as artifact
       
     Raises:
       Exception: If search fails
@@ -66,7 +66,7 @@ class SearchLocationTools(BaseTool):
       request = LocationSearchRequest(city=city)
       locations = await self.search_locations.execute(request)
       log_function_result(self.logger, "SearchLocationTools._arun", {"locations_count": len(locations)})
-      return locations
+      return str(locations), locations
     except Exception as e:
       log_function_error(self.logger, "SearchLocationTools._arun", e, {"city": city})
       raise
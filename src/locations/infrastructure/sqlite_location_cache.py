@@ -0,0 +1,132 @@
+"""Persistent SQLite cache for location search results."""
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import asdict
+from typing import List, Optional
+from locations.domain.location_entities import Location
+from shared.config import resolve_project_path
+from shared.logging import setup_logger
+from shared.ttl_cache import TTLCache
+
+class SQLiteLocationCache:
+  """Disk-backed location cache shared by all worker processes on a host.
+
+  The database runs in WAL mode so readers in one process never block
+  writers in another. The most recently used entries loaded or written by
+  this process are also kept in a bounded LRU, so repeated lookups do not
+  touch the disk at all.
+  """
+  def __init__(self, path: str, max_memory_entries: int = 10000):
+    """Open (and create if needed) the cache database.
+
+    Args:
+      path: Path of the SQLite database file (relative paths are resolved
+        against the project root)
+      max_memory_entries: Maximum number of entries kept in memory
+    """
+    self.logger = setup_logger("sqlite_location_cache")
+    self.path = resolve_project_path(path)
+    self.path.parent.mkdir(parents=True, exist_ok=True)
+    self._lock = threading.Lock()
+    self._memory_lock = threading.Lock()
+    self._memory: TTLCache[List[Location]] = TTLCache(max_memory_entries)
+    self._connection = sqlite3.connect(self.path, check_same_thread=False, timeout=5.0)
+    with self._lock:
+      self._connection.execute("PRAGMA journal_mode=WAL")
+      self._connection.execute("PRAGMA synchronous=NORMAL")
+      self._connection.execute(
+        "CREATE TABLE IF NOT EXISTS location_cache ("
+        " keyword TEXT PRIMARY KEY,"
+        " payload TEXT NOT NULL,"
+        " expires_at REAL NOT NULL)"
+      )
+      self._connection.commit()
+
+  def get_cached(self, keyword: str) -> Optional[List[Location]]:
+    """Look up a keyword in the in-memory layer only.
+
+    Args:
+      keyword: Normalized keyword
+
+    Returns:
+      Cached locations, or None if not loaded in memory or expired
+    """
+    with self._memory_lock:
+      entry = self._memory.get(keyword)
+    return entry.value if entry is not None else None
+
+  def get(self, keyword: str) -> Optional[List[Location]]:
+    """Look up a keyword in memory, then on disk.
+
+    Args:
+      keyword: Normalized keyword
+
+    Returns:
+      Cached locations, or None on a miss
+    """
+    locations = self.get_cached(keyword)
+    if locations is not None:
+      return locations
+    with self._lock:
+      row = self._connection.execute(
+        "SELECT payload, expires_at FROM location_cache WHERE keyword = ? AND expires_at > ?",
+        (keyword, time.time())
+      ).fetchone()
+    if row is None:
+      return None
+    locations = self._decode(row[0])
+    self._remember(keyword, locations, row[1])
+    return locations
+
+  def set(self, keyword: str, locations: List[Location], ttl_seconds: float) -> None:
+    """Store the locations found for a keyword.
+
+    Args:
+      keyword: Normalized keyword
+      locations: Locations to cache (may be empty)
+      ttl_seconds: Seconds until the entry expires
+    """
+    expires_at = time.time() + ttl_seconds
+    payload = json.dumps([asdict(location) for location in locations])
+    with self._lock:
+      self._connection.execute(
+        "INSERT OR REPLACE INTO location_cache (keyword, payload, expires_at) VALUES (?, ?, ?)",
+        (keyword, payload, expires_at)
+      )
+      self._connection.commit()
+    self._remember(keyword, list(locations), expires_at)
+
+  def warm_load(self) -> int:
+    """Purge expired rows and load the remaining entries into memory, latest expiry first.
+
+    Returns:
+      Number of entries loaded
+    """
+    now = time.time()
+    with self._lock:
+      self._connection.execute("DELETE FROM location_cache WHERE expires_at <= ?", (now,))
+      self._connection.commit()
+      rows = self._connection.execute(
+        "SELECT keyword, payload, expires_at FROM location_cache ORDER BY expires_at DESC LIMIT ?",
+        (self._memory.max_entries,)
+      ).fetchall()
+    for keyword, payload, expires_at in reversed(rows):
+      self._remember(keyword, self._decode(payload), expires_at)
+    self.logger.info(f"Warm-loaded {len(rows)} cached locations from {self.path}")
+    return len(rows)
+
+  def close(self) -> None:
+    """Close the database connection."""
+    with self._lock:
+      self._connection.close()
+
+  def _remember(self, keyword: str, locations: List[Location], expires_at: float) -> None:
+    """Keep an entry in memory until its wall-clock expiry."""
+    with self._memory_lock:
+      self._memory.set(keyword, locations, ttl=expires_at - time.time())
+
+  @staticmethod
+  def _decode(payload: str) -> List[Location]:
+    return [Location(**item) for item in json.loads(payload)]
@@ -1,19 +1,83 @@
-from langfuse import Langfuse
-from langfuse.langchain import CallbackHandler
+"""Langfuse tracing client, created on first use.
+
+Nothing is imported from Langfuse and no network call is made at import
+time. The authentication check runs in the background warm-up task (or on
+demand) instead of blocking startup.
+"""
+import asyncio
+from typing import TYPE_CHECKING, Optional
 from shared.config import settings
 from shared.logging import setup_logger
 
+if TYPE_CHECKING:
+  from langfuse import Langfuse
+  from langfuse.langchain import CallbackHandler
+
 logger = setup_logger("langfuse_client")
-langfuse_client = Langfuse(
-  public_key=settings.LANGFUSE_PUBLIC_KEY,
-  secret_key=settings.LANGFUSE_SECRET_KEY,
-  host=settings.LANGFUSE_HOST
-)
-
-langfuse_handler = CallbackHandler(
-  public_key=settings.LANGFUSE_PUBLIC_KEY
-)
-if langfuse_client.auth_check():
+_langfuse_client: Optional["Langfuse"] = None
+_langfuse_handler: Optional["CallbackHandler"] = None
+
+def get_langfuse_client() -> "Langfuse":
+  """Get or create the Langfuse client.
+  
+  Returns:
+    Singleton Langfuse client
+  """
+  global _langfuse_client
+  if _langfuse_client is None:
+    from langfuse import Langfuse
+    _langfuse_client = Langfuse(
+      public_key=settings.LANGFUSE_PUBLIC_KEY,
+      secret_key=settings.LANGFUSE_SECRET_KEY,
+      host=settings.LANGFUSE_HOST
+    )
+  return _langfuse_client
+
+def get_langfuse_handler() -> "CallbackHandler":
+  """Get or create the LangChain callback handler tracing to Langfuse.
+  
+  Returns:
+    Singleton CallbackHandler
+  """
+  global _langfuse_handler
+  if _langfuse_handler is None:
+    get_langfuse_client()
+    from langfuse.langchain import CallbackHandler
+    _langfuse_handler = CallbackHandler(
+      public_key=settings.LANGFUSE_PUBLIC_KEY
+    )
+  return _langfuse_handler
+
+def check_langfuse_auth() -> bool:
+  """Verify the Langfuse credentials against the host (blocking network call).
+  
+  Returns:
+    True if the client is authenticated
+  """
+  try:
+    authenticated = get_langfuse_client().auth_check()
+  except Exception as e:
+    logger.error(f"Langfuse authentication check failed: {e}")
+    return False
+  if authenticated:
     logger.info("Langfuse client is authenticated and ready!")
-else:
-    logger.error("Authentication failed. Please check your credentials and host.")
\ No newline at end of file
+  else:
+    logger.error("Authentication failed. Please check your credentials and host.")
+  return authenticated
+
+async def warm_up_langfuse() -> bool:
+  """Create the tracing handler and check the credentials off the event loop.
+  
+  Returns:
+    True if the client is authenticated
+  """
+  await asyncio.to_thread(get_langfuse_handler)
+  return await asyncio.to_thread(check_langfuse_auth)
+
+def __getattr__(name: str):
+  # Module attributes of the former eager client
+  if name == "langfuse_client":
+    return get_langfuse_client()
+  if name == "langfuse_handler":
+    return get_langfuse_handler()
+  raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,8 +1,18 @@
 """Configuration settings for the Flight Search Agent application."""
 from pathlib import Path
+from typing import Optional, Union
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Relative data file paths are resolved here rather than against the working
+# directory, so workers started from different directories share one file.
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+def resolve_project_path(path: Union[str, Path]) -> Path:
+  """Resolve a configured path against the project root unless it is absolute."""
+  path = Path(path)
+  return path if path.is_absolute() else PROJECT_ROOT / path
+
 class Settings(BaseSettings):
   """Application settings loaded from environment variables.
   
@@ -12,24 +22,170 @@ class Settings(BaseSettings):
   Attributes:
     GOOGLE_API_KEY: API key for Google Generative AI services
     MODEL_NAME: Name of the LLM model to use
+    LAZY_STARTUP: Whether to serve immediately and build the graph and open connections in a background task
+    LLM_CHAIN_CACHE_ENABLED: Whether to reuse LLM chains built for an identical prompt, tools, output schema, temperature and model
+    GEMINI_WARM_UP_ENABLED: Whether to open the Gemini connection at application start
+    GEMINI_WARM_UP_TIMEOUT_SECONDS: Timeout in seconds of the startup warm-up call
+    GEMINI_KEEPALIVE_TIME_SECONDS: Interval of the keep-alive pings on the Gemini gRPC connection
+    GEMINI_KEEPALIVE_TIMEOUT_SECONDS: Seconds without a ping acknowledgement before the connection is considered dead
+    GEMINI_KEEPALIVE_WITHOUT_CALLS: Whether to keep pinging while no call is in flight, so idle connections stay open
+    GEMINI_CHANNEL_IDLE_TIMEOUT_SECONDS: Seconds without calls before the Gemini channel releases its connection
     AMADEUS_CLIENT_ID: Client ID for Amadeus API
     AMADEUS_CLIENT_SECRET: Secret key for Amadeus API
     LANGFUSE_PUBLIC_KEY: Public key for Langfuse observability
     LANGFUSE_SECRET_KEY: Secret key for Langfuse observability
     LANGFUSE_HOST: Host URL for Langfuse service
-    RATE_LIMIT_MAX_REQUESTS: Maximum number of requests per time window
-    RATE_LIMIT_WINDOW_SECONDS: Time window in seconds for rate limiting
+    RATE_LIMIT_BACKEND: Where rate limit state lives: "memory" (per process), "sqlite" (shared by the processes of a host) or "redis" (shared across hosts)
+    RATE_LIMIT_SQLITE_PATH: Path of the SQLite rate limit database shared by worker processes (relative to the project root)
+    RATE_LIMIT_REDIS_URL: URL of the Redis server of the redis rate limit backend
+    RATE_LIMIT_REDIS_KEY_PREFIX: Prefix of the rate limit keys in Redis
+    QUOTA_HEADROOM: Fraction (0-1) of each upstream quota the application uses
+    QUOTA_BURST_RATIO: Fraction (0-1) of each quota usable at once on top of the sustained rate, so that one query's calls run back to back; a window starting with a full burst can exceed the sustained budget by the burst
+    GEMINI_RATE_LIMIT_MAX_REQUESTS: Maximum number of Gemini requests per time window and model
+    GEMINI_RATE_LIMIT_MAX_TOKENS: Maximum number of Gemini input tokens per time window and model
+    GEMINI_RATE_LIMIT_WINDOW_SECONDS: Time window in seconds of the Gemini quotas
+    AMADEUS_BASE_URL: Base URL of the Amadeus API
+    AMADEUS_HTTP2: Whether to negotiate HTTP/2 with Amadeus when available
+    AMADEUS_MAX_CONNECTIONS: Maximum number of pooled Amadeus connections
+    AMADEUS_MAX_KEEPALIVE_CONNECTIONS: Maximum number of idle keep-alive connections
+    AMADEUS_KEEPALIVE_EXPIRY_SECONDS: Idle time before a keep-alive connection is closed
+    AMADEUS_TIMEOUT_SECONDS: Timeout in seconds for Amadeus requests
+    AMADEUS_CONNECT_TIMEOUT_SECONDS: Timeout in seconds for opening an Amadeus connection
+    AMADEUS_TOKEN_REFRESH_MARGIN_SECONDS: Seconds before expiry at which the access token is refreshed
+    AMADEUS_TOKEN_SHARED_CACHE: Whether worker processes share the access token through a cache file
+    AMADEUS_TOKEN_CACHE_DIR: Directory of the shared token cache (system temp dir if empty)
+    AMADEUS_RETRY_MAX_ATTEMPTS: Maximum attempts per Amadeus call, including the first one
+    AMADEUS_RETRY_BASE_DELAY_SECONDS: Base delay of the exponential retry backoff
+    AMADEUS_RETRY_MAX_DELAY_SECONDS: Longest delay (backoff or Retry-After) worth waiting for
+    AMADEUS_RETRY_BUDGET_RATIO: Retries earned per request, per endpoint
+    AMADEUS_CIRCUIT_FAILURE_THRESHOLD: Consecutive failed calls that open an endpoint's circuit
+    AMADEUS_CIRCUIT_RESET_TIMEOUT_SECONDS: Seconds an open circuit fails fast before probing again
+    AMADEUS_RATE_LIMIT_MAX_REQUESTS: Maximum number of Amadeus requests per time window
+    AMADEUS_RATE_LIMIT_WINDOW_SECONDS: Time window in seconds for the Amadeus rate limit
+    FLIGHT_CACHE_ENABLED: Whether flight search results are cached in memory
+    FLIGHT_CACHE_MAX_ENTRIES: Maximum number of cached flight searches (LRU eviction)
+    FLIGHT_CACHE_TTL_SECONDS: Seconds a cached flight search result is fresh
+    FLIGHT_CACHE_STALE_SECONDS: Extra seconds a stale result is served while it is refreshed
+    FLIGHT_CACHE_NEGATIVE_TTL_SECONDS: Seconds an empty flight search result is cached
+    LOCATION_CACHE_ENABLED: Whether location search results are cached on disk
+    LOCATION_CACHE_PATH: Path of the SQLite location cache shared by worker processes (relative to the project root)
+    LOCATION_CACHE_TTL_DAYS: Days a cached location search result is kept
+    LOCATION_CACHE_NEGATIVE_TTL_SECONDS: Seconds an empty location search result is cached
+    LOCATION_CACHE_WARM_LOAD: Whether the location cache is loaded into memory at startup
+    LOCATION_CACHE_MEMORY_MAX_ENTRIES: Maximum number of location search results kept in memory per process (LRU eviction)
+    LOCATION_INDEX_ENABLED: Whether cities are resolved from the offline index before Amadeus
+    LOCATION_INDEX_PATH: Path of the compiled, memory-mapped location index (relative to the project root)
+    LOCATION_INDEX_SOURCE_PATH: CSV dataset the index is built from (bundled dataset if empty, relative to the project root)
+    LOCATION_INDEX_FUZZY_CUTOFF: Minimum similarity (0-1) for fuzzy city name matches
+    LOCATION_DIRECT_LOOKUP: Whether to resolve origin and destination codes directly, without the LLM tool loop
+    FUSED_QUERY_VALIDATION: Whether to validate the query and extract its details with a single LLM call
+    QUERY_PREPARSER_ENABLED: Whether to try the rule-based query parser before the LLM validation and extraction
+    QUERY_PREPARSER_CONFIDENCE_THRESHOLD: Minimum parser confidence (0-1) to skip the LLM validation and extraction
+    FLEXIBLE_SEARCH_MAX_CONCURRENCY: Maximum concurrent flight searches for flexible-date price matrices
+    FLIGHT_BATCH_MAX_CONCURRENCY: Maximum concurrent route searches across all batch flight searches
+    FLIGHT_BATCH_MAX_ROUTES: Maximum number of origin/destination pairs in one batch search
+    FLIGHT_RANKING_MAX_RESULTS: Number of ranked flight offers passed to the travel proposal
+    FLIGHT_RANKING_PRICE_WEIGHT: Weight of the price in the flight ranking score
+    FLIGHT_RANKING_DURATION_WEIGHT: Weight of the total duration in the flight ranking score
+    FLIGHT_RANKING_STOPS_WEIGHT: Weight of the number of stops in the flight ranking score
   """
   model_config = SettingsConfigDict(env_file=".env")
   GOOGLE_API_KEY: str
   MODEL_NAME: str 
+  LAZY_STARTUP: bool = False
+  LLM_CHAIN_CACHE_ENABLED: bool = True
+  GEMINI_WARM_UP_ENABLED: bool = True
+  GEMINI_WARM_UP_TIMEOUT_SECONDS: float = 10.0
+  GEMINI_KEEPALIVE_TIME_SECONDS: float = 60.0
+  GEMINI_KEEPALIVE_TIMEOUT_SECONDS: float = 20.0
+  GEMINI_KEEPALIVE_WITHOUT_CALLS: bool = True
+  GEMINI_CHANNEL_IDLE_TIMEOUT_SECONDS: float = 1800.0
   AMADEUS_CLIENT_ID: str
   AMADEUS_CLIENT_SECRET: str
   LANGFUSE_PUBLIC_KEY: str
   LANGFUSE_SECRET_KEY: str
   LANGFUSE_HOST: str
   
-  RATE_LIMIT_MAX_REQUESTS: int = 5
-  RATE_LIMIT_WINDOW_SECONDS: int = 60
+  RATE_LIMIT_BACKEND: str = "memory"
+  RATE_LIMIT_SQLITE_PATH: str = "cache/rate_limits.sqlite3"
+  RATE_LIMIT_REDIS_URL: str = "redis://localhost:6379/0"
+  RATE_LIMIT_REDIS_KEY_PREFIX: str = "flights-agent:rate-limit:"
+  QUOTA_HEADROOM: float = 0.95
+  QUOTA_BURST_RATIO: float = 0.5
+  GEMINI_RATE_LIMIT_MAX_REQUESTS: int = 10
+  GEMINI_RATE_LIMIT_MAX_TOKENS: int = 250000
+  GEMINI_RATE_LIMIT_WINDOW_SECONDS: int = 60
+  
+  AMADEUS_BASE_URL: str = "https://test.api.amadeus.com"
+  AMADEUS_HTTP2: bool = True
+  AMADEUS_MAX_CONNECTIONS: int = 20
+  AMADEUS_MAX_KEEPALIVE_CONNECTIONS: int = 10
+  AMADEUS_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+  AMADEUS_TIMEOUT_SECONDS: float = 30.0
+  AMADEUS_CONNECT_TIMEOUT_SECONDS: float = 5.0
+  AMADEUS_TOKEN_REFRESH_MARGIN_SECONDS: float = 120.0
+  AMADEUS_TOKEN_SHARED_CACHE: bool = True
+  AMADEUS_TOKEN_CACHE_DIR: str = ""
+  AMADEUS_RETRY_MAX_ATTEMPTS: int = 3
+  AMADEUS_RETRY_BASE_DELAY_SECONDS: float = 0.5
+  AMADEUS_RETRY_MAX_DELAY_SECONDS: float = 8.0
+  AMADEUS_RETRY_BUDGET_RATIO: float = 0.2
+  AMADEUS_CIRCUIT_FAILURE_THRESHOLD: int = 5
+  AMADEUS_CIRCUIT_RESET_TIMEOUT_SECONDS: float = 30.0
+  AMADEUS_RATE_LIMIT_MAX_REQUESTS: int = 10
+  AMADEUS_RATE_LIMIT_WINDOW_SECONDS: int = 1
+  
+  FLIGHT_CACHE_ENABLED: bool = True
+  FLIGHT_CACHE_MAX_ENTRIES: int = 1024
+  FLIGHT_CACHE_TTL_SECONDS: float = 300.0
+  FLIGHT_CACHE_STALE_SECONDS: float = 600.0
+  FLIGHT_CACHE_NEGATIVE_TTL_SECONDS: float = 60.0
+  
+  LOCATION_CACHE_ENABLED: bool = True
+  LOCATION_CACHE_PATH: str = "cache/locations.sqlite3"
+  LOCATION_CACHE_TTL_DAYS: float = 30.0
+  LOCATION_CACHE_NEGATIVE_TTL_SECONDS: float = 3600.0
+  LOCATION_CACHE_WARM_LOAD: bool = True
+  LOCATION_CACHE_MEMORY_MAX_ENTRIES: int = 10000
+  
+  LOCATION_INDEX_ENABLED: bool = True
+  LOCATION_INDEX_PATH: str = "cache/locations.idx"
+  LOCATION_INDEX_SOURCE_PATH: str = ""
+  LOCATION_INDEX_FUZZY_CUTOFF: float = 0.85
+  LOCATION_DIRECT_LOOKUP: bool = True
+  FUSED_QUERY_VALIDATION: bool = True
+  QUERY_PREPARSER_ENABLED: bool = True
+  QUERY_PREPARSER_CONFIDENCE_THRESHOLD: float = 0.9
+  
+  FLEXIBLE_SEARCH_MAX_CONCURRENCY: int = 4
+  FLIGHT_BATCH_MAX_CONCURRENCY: int = 6
+  FLIGHT_BATCH_MAX_ROUTES: int = 9
+  FLIGHT_RANKING_MAX_RESULTS: int = 5
+  FLIGHT_RANKING_PRICE_WEIGHT: float = 0.6
+  FLIGHT_RANKING_DURATION_WEIGHT: float = 0.3
+  FLIGHT_RANKING_STOPS_WEIGHT: float = 0.1
+
+class LazySettings:
+  """Settings loaded from the environment on first attribute access.
+
+  Importing a module that reads settings at call time therefore does not
+  parse the environment or the .env file.
+  """
+  def __init__(self):
+    self._settings: Optional[Settings] = None
+
+  def _load(self) -> Settings:
+    if self._settings is None:
+      self._settings = Settings()
+    return self._settings
+
+  def __getattr__(self, name: str):
+    return getattr(self._load(), name)
+
+  def __setattr__(self, name: str, value) -> None:
+    if name == "_settings":
+      object.__setattr__(self, name, value)
+    else:
+      setattr(self._load(), name, value)
 
-settings = Settings()
\ No newline at end of file
+settings = LazySettings()
\ No newline at end of file
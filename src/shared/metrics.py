@@ -0,0 +1,133 @@
+"""In-process metrics registry exposed in the Prometheus text format."""
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+DEFAULT_BUCKETS = (0.1, 0.25, 0.5, 0.75, 0.9, 1.0)
+
+@dataclass
+class _Histogram:
+  buckets: Tuple[float, ...]
+  counts: List[int] = field(default_factory=list)
+  count: int = 0
+  total: float = 0.0
+
+  def __post_init__(self):
+    self.counts = [0] * len(self.buckets)
+
+  def observe(self, value: float) -> None:
+    self.count += 1
+    self.total += value
+    for position, bound in enumerate(self.buckets):
+      if value <= bound:
+        self.counts[position] += 1
+
+class MetricsRegistry:
+  """Thread-safe registry of counters, gauges and histograms.
+
+  Metrics are created on first use and identified by name and labels.
+  """
+  def __init__(self):
+    """Initialize an empty registry."""
+    self._lock = threading.Lock()
+    self._help: Dict[str, str] = {}
+    self._counters: Dict[str, Dict[LabelSet, float]] = {}
+    self._gauges: Dict[str, Dict[LabelSet, float]] = {}
+    self._histograms: Dict[str, Dict[LabelSet, _Histogram]] = {}
+    self._buckets: Dict[str, Tuple[float, ...]] = {}
+
+  @staticmethod
+  def _labels(labels: Dict[str, str]) -> LabelSet:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+  def describe(self, name: str, help_text: str, buckets: Optional[Tuple[float, ...]] = None) -> None:
+    """Set the help text, and the buckets of a histogram, of a metric.
+
+    Args:
+      name: Metric name
+      help_text: One-line description
+      buckets: Upper bounds of the histogram buckets
+    """
+    with self._lock:
+      self._help[name] = help_text
+      if buckets is not None:
+        self._buckets[name] = tuple(sorted(buckets))
+
+  def increment(self, name: str, value: float = 1.0, **labels: str) -> None:
+    """Add to a counter.
+
+    Args:
+      name: Counter name
+      value: Amount to add
+      **labels: Label values
+    """
+    key = self._labels(labels)
+    with self._lock:
+      series = self._counters.setdefault(name, {})
+      series[key] = series.get(key, 0.0) + value
+
+  def set_gauge(self, name: str, value: float, **labels: str) -> None:
+    """Set a gauge to a value.
+
+    Args:
+      name: Gauge name
+      value: Current value
+      **labels: Label values
+    """
+    key = self._labels(labels)
+    with self._lock:
+      self._gauges.setdefault(name, {})[key] = value
+
+  def observe(self, name: str, value: float, **labels: str) -> None:
+    """Record a value in a histogram.
+
+    Args:
+      name: Histogram name
+      value: Observed value
+      **labels: Label values
+    """
+    key = self._labels(labels)
+    with self._lock:
+      series = self._histograms.setdefault(name, {})
+      if key not in series:
+        series[key] = _Histogram(self._buckets.get(name, DEFAULT_BUCKETS))
+      series[key].observe(value)
+
+  def counter_value(self, name: str, **labels: str) -> float:
+    """Current value of a counter (0 if never incremented)."""
+    with self._lock:
+      return self._counters.get(name, {}).get(self._labels(labels), 0.0)
+
+  def render(self) -> str:
+    """Render every metric in the Prometheus text exposition format."""
+    def format_labels(labels: LabelSet, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+      pairs = [*labels, *extra]
+      if not pairs:
+        return ""
+      return "{" + ",".join(f'{key}="{value}"' for key, value in pairs) + "}"
+
+    lines = []
+    with self._lock:
+      for kind, metrics_of_kind in (("counter", self._counters), ("gauge", self._gauges)):
+        for name, series in sorted(metrics_of_kind.items()):
+          if name in self._help:
+            lines.append(f"# HELP {name} {self._help[name]}")
+          lines.append(f"# TYPE {name} {kind}")
+          for labels, value in sorted(series.items()):
+            lines.append(f"{name}{format_labels(labels)} {value:g}")
+      for name, series in sorted(self._histograms.items()):
+        if name in self._help:
+          lines.append(f"# HELP {name} {self._help[name]}")
+        lines.append(f"# TYPE {name} histogram")
+        for labels, histogram in sorted(series.items()):
+          for bound, count in zip(histogram.buckets, histogram.counts):
+            lines.append(f"{name}_bucket{format_labels(labels, (('le', f'{bound:g}'),))} {count}")
+          lines.append(f"{name}_bucket{format_labels(labels, (('le', '+Inf'),))} {histogram.count}")
+          lines.append(f"{name}_sum{format_labels(labels)} {histogram.total:g}")
+          lines.append(f"{name}_count{format_labels(labels)} {histogram.count}")
+    return "\n".join(lines) + "\n"
+
+# Global metrics registry
+metrics = MetricsRegistry()
@@ -0,0 +1,177 @@
+"""Quota management for upstream APIs.
+
+Quotas are enforced per upstream and model, the way providers count them,
+rather than per caller. Each upstream has a request budget; Gemini also has
+an input token budget. Both are GCRA buckets kept in the shared rate limit
+backend, so the budgets hold across worker processes when that backend is
+shared.
+"""
+import asyncio
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from .config import settings
+from .logging import setup_logger
+from .metrics import metrics
+from .rate_limit_backends import RateLimitBackend, get_rate_limit_backend
+
+@dataclass(frozen=True)
+class QuotaLimits:
+  """Budgets of one upstream over a time window."""
+  max_requests: int
+  window_seconds: float
+  max_tokens: Optional[int] = None
+
+@dataclass
+class QuotaReservation:
+  """Capacity admitted for one upstream call."""
+  upstream: str
+  model: str
+  estimated_tokens: int = 0
+
+class QuotaManager:
+  """Admits upstream calls within their request and token budgets.
+
+  Limits of an upstream are read from its {UPSTREAM}_RATE_LIMIT_* settings
+  unless given, and scaled by QUOTA_HEADROOM so that usage stays just under
+  the provider's quota. Calls are spread at that sustained rate, and up to
+  QUOTA_BURST_RATIO of the budget may additionally go out at once after an
+  idle period. With the defaults and 10 Gemini requests per minute, steady
+  load runs at 9.5 calls per minute and the 4-5 calls of one query go out
+  back to back. The burst is the price of that latency: a window that starts
+  with a full burst can admit up to burst - 1 calls more than the sustained
+  budget, so keep the ratio small for upstreams that reject any overshoot.
+  A call is admitted once both budgets allow it; the token bucket is charged
+  with the estimated prompt tokens, then corrected with the actual usage
+  reported by the provider.
+  """
+  def __init__(self, limits: Optional[Dict[str, QuotaLimits]] = None, backend: Optional[RateLimitBackend] = None,
+               headroom: Optional[float] = None, burst_ratio: Optional[float] = None):
+    """Initialize the quota manager.
+
+    Args:
+      limits: Limits per upstream (read from settings for the others)
+      backend: State backend (the shared RATE_LIMIT_BACKEND if omitted)
+      headroom: Fraction of each quota to use (QUOTA_HEADROOM if omitted)
+      burst_ratio: Fraction of a budget usable at once (QUOTA_BURST_RATIO if omitted)
+    """
+    self._limits = limits or {}
+    self._backend = backend
+    self._headroom = headroom
+    self._burst_ratio = burst_ratio
+    self.logger = setup_logger("quota_manager")
+    metrics.describe("quota_wait_seconds", "Time upstream calls waited for quota", buckets=(0.0, 0.1, 0.5, 1.0, 5.0, 15.0, 60.0))
+    metrics.describe("quota_estimated_tokens_total", "Prompt tokens estimated before upstream calls")
+    metrics.describe("quota_actual_tokens_total", "Input tokens reported by upstreams")
+
+  @property
+  def backend(self) -> RateLimitBackend:
+    if self._backend is None:
+      self._backend = get_rate_limit_backend()
+    return self._backend
+
+  @property
+  def headroom(self) -> float:
+    return self._headroom if self._headroom is not None else settings.QUOTA_HEADROOM
+
+  @property
+  def burst_ratio(self) -> float:
+    return self._burst_ratio if self._burst_ratio is not None else settings.QUOTA_BURST_RATIO
+
+  def limits(self, upstream: str) -> QuotaLimits:
+    """Limits of an upstream, from its {UPSTREAM}_RATE_LIMIT_* settings if not given."""
+    if upstream in self._limits:
+      return self._limits[upstream]
+    prefix = f"{upstream.upper()}_RATE_LIMIT_"
+    return QuotaLimits(
+      max_requests=getattr(settings, f"{prefix}MAX_REQUESTS"),
+      window_seconds=getattr(settings, f"{prefix}WINDOW_SECONDS"),
+      max_tokens=getattr(settings, f"{prefix}MAX_TOKENS", None)
+    )
+
+  @staticmethod
+  def _key(upstream: str, model: str, budget: str) -> str:
+    return f"quota:{upstream}:{model}:{budget}"
+
+  def _gcra(self, budget: int, window_seconds: float, cost: float) -> Tuple[float, float]:
+    """Emission interval and burst tolerance of a budget for a call of the given cost.
+
+    The budget N is spread over the window (interval W / N), and a burst of
+    B units may go out ahead of that schedule. The tolerance leaves room for
+    the call's own cost, so a call is admitted only if it fits entirely in
+    the burst.
+    """
+    capacity = max(1.0, budget * self.headroom)
+    burst = max(1.0, capacity * self.burst_ratio)
+    interval = window_seconds / capacity
+    return interval, max(0.0, (burst - cost) * interval)
+
+  def _buckets(self, reservation: QuotaReservation, tokens: int) -> List[Tuple[str, float, float, float]]:
+    """Keys, intervals, tolerances and costs charged for a call."""
+    limits = self.limits(reservation.upstream)
+    buckets = [(self._key(reservation.upstream, reservation.model, "requests"),
+                *self._gcra(limits.max_requests, limits.window_seconds, 1), 1)]
+    if limits.max_tokens and tokens > 0:
+      buckets.append((self._key(reservation.upstream, reservation.model, "tokens"),
+                      *self._gcra(limits.max_tokens, limits.window_seconds, tokens), tokens))
+    return buckets
+
+  async def acquire(self, upstream: str, model: str = "", tokens: int = 0) -> QuotaReservation:
+    """Wait until a call fits in the upstream's request and token budgets.
+
+    Capacity is reserved atomically in the backend and the wait happens
+    outside any lock; a cancelled wait gives the capacity back.
+
+    Args:
+      upstream: Upstream API, e.g. "gemini" or "amadeus"
+      model: Model the call is sent to (quotas are per model)
+      tokens: Estimated input tokens of the call
+
+    Returns:
+      Reservation to reconcile with the actual usage
+    """
+    reservation = QuotaReservation(upstream=upstream, model=model, estimated_tokens=tokens)
+    buckets = self._buckets(reservation, tokens)
+    waits = [await self.backend.reserve(key, interval, tolerance, cost) for key, interval, tolerance, cost in buckets]
+    wait_time = max(waits)
+    metrics.observe("quota_wait_seconds", wait_time, upstream=upstream)
+    if tokens:
+      metrics.increment("quota_estimated_tokens_total", tokens, upstream=upstream, model=model)
+    if wait_time <= 0:
+      return reservation
+    self.logger.warning(f"Quota reached for {upstream} {model} ({tokens} tokens). Waiting {wait_time:.2f} seconds...")
+    try:
+      await asyncio.sleep(wait_time)
+    except asyncio.CancelledError:
+      await asyncio.shield(self._refund(buckets))
+      raise
+    return reservation
+
+  async def _refund(self, buckets: List[Tuple[str, float, float, float]]) -> None:
+    for key, interval, _, cost in buckets:
+      await self.backend.refund(key, interval, cost)
+
+  async def reconcile(self, reservation: QuotaReservation, actual_tokens: Optional[int]) -> None:
+    """Correct the token budget with the usage reported by the upstream.
+
+    Underestimates are charged to the budget, delaying the next calls;
+    overestimates are given back.
+
+    Args:
+      reservation: Reservation returned by acquire
+      actual_tokens: Input tokens reported by the upstream (None if unknown)
+    """
+    if actual_tokens is None:
+      return
+    metrics.increment("quota_actual_tokens_total", actual_tokens, upstream=reservation.upstream, model=reservation.model)
+    limits = self.limits(reservation.upstream)
+    difference = actual_tokens - reservation.estimated_tokens
+    if not limits.max_tokens or difference == 0:
+      return
+    key = self._key(reservation.upstream, reservation.model, "tokens")
+    interval, tolerance = self._gcra(limits.max_tokens, limits.window_seconds, abs(difference))
+    if difference > 0:
+      await self.backend.reserve(key, interval, tolerance, difference)
+    else:
+      await self.backend.refund(key, interval, -difference)
+
+quota_manager = QuotaManager()
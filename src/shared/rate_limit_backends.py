@@ -0,0 +1,224 @@
+"""Storage backends of the GCRA quota buckets.
+
+A backend keeps the theoretical arrival time of every key and updates it
+atomically. The memory backend limits one process. The SQLite backend
+shares the limits between the worker processes of a host. The Redis
+backend shares them between hosts; it needs the optional ``redis``
+dependency (``pip install flightsearchagent[redis]``) and works against
+any server speaking the Redis protocol with Lua scripting.
+"""
+import asyncio
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Optional
+from .config import resolve_project_path, settings
+from .logging import setup_logger
+
+logger = setup_logger("rate_limit_backends")
+
+class RateLimitBackend(ABC):
+  """Atomic store of the theoretical arrival time of each rate limited key."""
+  @abstractmethod
+  async def reserve(self, key: str, interval: float, tolerance: float, cost: float) -> float:
+    """Reserve a slot for a request.
+
+    Args:
+      key: Rate limited key
+      interval: Seconds between requests at the sustained rate
+      tolerance: Burst tolerance in seconds
+      cost: Number of requests the call counts for
+
+    Returns:
+      Seconds to wait before the reserved request may be sent
+    """
+
+  @abstractmethod
+  async def refund(self, key: str, interval: float, cost: float) -> None:
+    """Give back a reservation that will not be used."""
+
+  async def aclose(self) -> None:
+    """Release the backend's connections."""
+
+class MemoryRateLimitBackend(RateLimitBackend):
+  """Per-process backend; every call is constant time under a short lock."""
+  def __init__(self):
+    self._arrival_times: Dict[str, float] = {}
+    self._lock = threading.Lock()
+
+  async def reserve(self, key: str, interval: float, tolerance: float, cost: float) -> float:
+    with self._lock:
+      now = time.monotonic()
+      arrival = max(self._arrival_times.get(key, now), now)
+      self._arrival_times[key] = arrival + interval * cost
+    return max(0.0, arrival - tolerance - now)
+
+  async def refund(self, key: str, interval: float, cost: float) -> None:
+    with self._lock:
+      if key in self._arrival_times:
+        self._arrival_times[key] = max(time.monotonic(), self._arrival_times[key] - interval * cost)
+
+class SQLiteRateLimitBackend(RateLimitBackend):
+  """Backend shared by the processes of one host through a SQLite file.
+
+  Each reservation is one atomic upsert, serialized by SQLite's write lock.
+  SQLite older than 3.35 lacks ``RETURNING``; there the read and the write
+  run in one immediate transaction instead. Arrival times are wall-clock,
+  so that every process reads the same clock.
+  """
+  def __init__(self, path: Path):
+    """Open (and create if needed) the database.
+
+    Args:
+      path: SQLite file shared by the worker processes (relative paths are
+        resolved against the project root)
+    """
+    self.path = resolve_project_path(path)
+    self.path.parent.mkdir(parents=True, exist_ok=True)
+    self._supports_returning = sqlite3.sqlite_version_info >= (3, 35, 0)
+    self._lock = threading.Lock()
+    self._connection = sqlite3.connect(self.path, check_same_thread=False, timeout=5.0, isolation_level=None)
+    with self._lock:
+      self._connection.execute("PRAGMA journal_mode=WAL")
+      self._connection.execute("CREATE TABLE IF NOT EXISTS rate_limits (key TEXT PRIMARY KEY, arrival REAL NOT NULL)")
+
+  def _reserve(self, key: str, interval: float, tolerance: float, cost: float) -> float:
+    increment = interval * cost
+    with self._lock:
+      now = time.time()
+      if self._supports_returning:
+        (new_arrival,) = self._connection.execute(
+          "INSERT INTO rate_limits (key, arrival) VALUES (?1, ?2 + ?3) "
+          "ON CONFLICT(key) DO UPDATE SET arrival = max(arrival, ?2) + ?3 RETURNING arrival",
+          (key, now, increment)
+        ).fetchone()
+      else:
+        new_arrival = self._reserve_in_transaction(key, now, increment)
+    return max(0.0, new_arrival - increment - tolerance - now)
+
+  def _reserve_in_transaction(self, key: str, now: float, increment: float) -> float:
+    """Read and advance the arrival time under SQLite's write lock, without RETURNING."""
+    self._connection.execute("BEGIN IMMEDIATE")
+    try:
+      row = self._connection.execute("SELECT arrival FROM rate_limits WHERE key = ?", (key,)).fetchone()
+      new_arrival = max(row[0] if row else now, now) + increment
+      self._connection.execute("INSERT OR REPLACE INTO rate_limits (key, arrival) VALUES (?, ?)", (key, new_arrival))
+      self._connection.execute("COMMIT")
+    except BaseException:
+      self._connection.execute("ROLLBACK")
+      raise
+    return new_arrival
+
+  def _refund(self, key: str, interval: float, cost: float) -> None:
+    with self._lock:
+      self._connection.execute(
+        "UPDATE rate_limits SET arrival = max(?2, arrival - ?3) WHERE key = ?1",
+        (key, time.time(), interval * cost)
+      )
+
+  async def reserve(self, key: str, interval: float, tolerance: float, cost: float) -> float:
+    return await asyncio.to_thread(self._reserve, key, interval, tolerance, cost)
+
+  async def refund(self, key: str, interval: float, cost: float) -> None:
+    await asyncio.to_thread(self._refund, key, interval, cost)
+
+  async def aclose(self) -> None:
+    with self._lock:
+      self._connection.close()
+
+# Arrival times use the server clock, so that every client reads the same clock.
+# Numbers are returned as strings: Lua numbers are truncated to integers in replies.
+_RESERVE_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local interval, tolerance, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local arrival = tonumber(redis.call('GET', KEYS[1])) or now
+if arrival < now then arrival = now end
+local new_arrival = arrival + interval * cost
+redis.call('SET', KEYS[1], string.format('%.6f', new_arrival), 'PX', math.ceil((new_arrival - now) * 1000) + 1000)
+return string.format('%.6f', math.max(0, arrival - tolerance - now))
+"""
+
+_REFUND_SCRIPT = """
+local arrival = tonumber(redis.call('GET', KEYS[1]))
+if not arrival then return 0 end
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local new_arrival = math.max(now, arrival - tonumber(ARGV[1]))
+redis.call('SET', KEYS[1], string.format('%.6f', new_arrival), 'PX', math.ceil((new_arrival - now) * 1000) + 1000)
+return 1
+"""
+
+class RedisRateLimitBackend(RateLimitBackend):
+  """Backend shared across hosts through Redis; each call is one Lua script."""
+  def __init__(self, url: Optional[str] = None, key_prefix: str = "", client=None):
+    """Initialize the backend.
+
+    Args:
+      url: Redis URL (ignored if a client is given)
+      key_prefix: Prefix of the Redis keys
+      client: Existing redis.asyncio client
+
+    Raises:
+      ImportError: If the redis package is not installed
+    """
+    if client is None:
+      try:
+        import redis.asyncio as redis
+      except ImportError as e:
+        raise ImportError("The redis rate limit backend needs the redis extra: pip install flightsearchagent[redis]") from e
+      client = redis.Redis.from_url(url)
+    self.client = client
+    self.key_prefix = key_prefix
+    self._reserve_script = client.register_script(_RESERVE_SCRIPT)
+    self._refund_script = client.register_script(_REFUND_SCRIPT)
+
+  async def reserve(self, key: str, interval: float, tolerance: float, cost: float) -> float:
+    wait = await self._reserve_script(keys=[self.key_prefix + key], args=[repr(interval), repr(tolerance), repr(cost)])
+    return float(wait)
+
+  async def refund(self, key: str, interval: float, cost: float) -> None:
+    await self._refund_script(keys=[self.key_prefix + key], args=[repr(interval * cost)])
+
+  async def aclose(self) -> None:
+    await self.client.aclose()
+
+def create_rate_limit_backend(kind: Optional[str] = None) -> RateLimitBackend:
+  """Create the backend selected by RATE_LIMIT_BACKEND.
+
+  Args:
+    kind: "memory", "sqlite" or "redis" (RATE_LIMIT_BACKEND if omitted)
+
+  Returns:
+    Rate limit backend
+
+  Raises:
+    ValueError: If the backend kind is unknown
+  """
+  kind = (kind or settings.RATE_LIMIT_BACKEND).lower()
+  logger.info(f"Creating {kind} rate limit backend")
+  if kind == "memory":
+    return MemoryRateLimitBackend()
+  if kind == "sqlite":
+    return SQLiteRateLimitBackend(Path(settings.RATE_LIMIT_SQLITE_PATH))
+  if kind == "redis":
+    return RedisRateLimitBackend(settings.RATE_LIMIT_REDIS_URL, key_prefix=settings.RATE_LIMIT_REDIS_KEY_PREFIX)
+  raise ValueError(f"Unknown rate limit backend: {kind}")
+
+_shared_backend: Optional[RateLimitBackend] = None
+
+def get_rate_limit_backend() -> RateLimitBackend:
+  """Get or create the backend selected by RATE_LIMIT_BACKEND, shared by all quotas."""
+  global _shared_backend
+  if _shared_backend is None:
+    _shared_backend = create_rate_limit_backend()
+  return _shared_backend
+
+async def aclose_rate_limit_backend() -> None:
+  """Close the shared backend's connections."""
+  global _shared_backend
+  if _shared_backend is not None:
+    await _shared_backend.aclose()
+    _shared_backend = None
@@ -0,0 +1,59 @@
+"""Request coalescing for concurrent identical calls."""
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+from .logging import setup_logger
+
+T = TypeVar("T")
+
+class SingleFlight:
+  """Coalesces concurrent calls that share a key into a single execution.
+
+  The first caller for a key starts the call; callers arriving while it is
+  still in flight await the same result (or exception) instead of issuing
+  their own. Nothing is kept once the call completes, so results are never
+  stale.
+  """
+  def __init__(self, name: str = "default"):
+    """Initialize the single-flight group.
+
+    Args:
+      name: Identifier used in log messages
+    """
+    self.name = name
+    self._inflight: Dict[Hashable, asyncio.Task] = {}
+    self.logger = setup_logger("single_flight")
+
+  async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+    """Run ``call`` for ``key`` unless an identical call is already in flight.
+
+    Args:
+      key: Hashable identity of the call
+      call: Zero-argument coroutine function performing the work
+
+    Returns:
+      Result of the shared call
+    """
+    task = self._inflight.get(key)
+    if task is None:
+      task = asyncio.ensure_future(call())
+      self._inflight[key] = task
+      task.add_done_callback(lambda done: self._forget(key, done))
+    else:
+      self.logger.debug(f"Coalescing {self.name} call for key {key}")
+    # Shielded so that one cancelled caller does not cancel the shared call.
+    return await asyncio.shield(task)
+
+  def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+    if self._inflight.get(key) is task:
+      del self._inflight[key]
+    if not task.cancelled():
+      # Mark the exception as retrieved even when every caller was cancelled.
+      task.exception()
+
+  def __contains__(self, key: Hashable) -> bool:
+    return key in self._inflight
+
+  @property
+  def inflight(self) -> int:
+    """Number of distinct calls currently in flight."""
+    return len(self._inflight)
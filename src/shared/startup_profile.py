@@ -0,0 +1,70 @@
+"""Import-time profile of the application startup.
+
+Imports a module in a fresh interpreter with ``-X importtime`` and lists
+the most expensive imports, so that cold-start regressions can be traced
+to the package that introduced them.
+"""
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import List
+
+@dataclass
+class ImportTiming:
+  """Import time of one module, in microseconds."""
+  module: str
+  self_us: int
+  cumulative_us: int
+  depth: int
+
+def profile_imports(module: str) -> List[ImportTiming]:
+  """Import a module in a child interpreter and collect its import times.
+  
+  Args:
+    module: Dotted name of the module to import
+    
+  Returns:
+    Timing of every module imported, in import order
+    
+  Raises:
+    RuntimeError: If the import fails
+  """
+  result = subprocess.run(
+    [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+    capture_output=True, text=True
+  )
+  if result.returncode != 0:
+    raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+  timings = []
+  for line in result.stderr.splitlines():
+    if not line.startswith("import time:") or "self [us]" in line:
+      continue
+    self_us, cumulative_us, name = line[len("import time:"):].split("|")
+    depth = (len(name) - len(name.lstrip())) // 2
+    timings.append(ImportTiming(name.strip(), int(self_us), int(cumulative_us), depth))
+  return timings
+
+def format_report(module: str, timings: List[ImportTiming], top: int = 20) -> str:
+  """Render the import hotspots of a module.
+  
+  Args:
+    module: Profiled module
+    timings: Timings returned by profile_imports
+    top: Number of entries per section
+    
+  Returns:
+    Report text
+  """
+  total = next((timing.cumulative_us for timing in timings if timing.module == module), 0)
+  lines = [f"Import profile of {module}: {total / 1000:.1f} ms, {len(timings)} modules", ""]
+  packages: dict = {}
+  for timing in timings:
+    package = timing.module.split(".")[0]
+    packages[package] = packages.get(package, 0) + timing.self_us
+  lines.append(f"Top {top} packages by total self time:")
+  for package, self_us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]:
+    lines.append(f"  {self_us / 1000:9.1f} ms  {package}")
+  lines += ["", f"Top {top} modules by self time:"]
+  for timing in sorted(timings, key=lambda timing: timing.self_us, reverse=True)[:top]:
+    lines.append(f"  {timing.self_us / 1000:9.1f} ms  {timing.module} (cumulative {timing.cumulative_us / 1000:.1f} ms)")
+  return "\n".join(lines)
@@ -0,0 +1,101 @@
+"""Bounded in-memory cache with per-entry TTL and LRU eviction."""
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Dict, Generic, Hashable, Optional, TypeVar
+
+V = TypeVar("V")
+
+@dataclass
+class CacheEntry(Generic[V]):
+  """A cached value with its freshness deadlines (monotonic clock)."""
+  value: V
+  expires_at: float
+  stale_until: float
+
+  def is_fresh(self, now: float) -> bool:
+    return now < self.expires_at
+
+  def is_usable(self, now: float) -> bool:
+    return now < self.stale_until
+
+@dataclass
+class CacheStats:
+  """Counters describing cache effectiveness."""
+  hits: int = 0
+  stale_hits: int = 0
+  misses: int = 0
+  evictions: int = 0
+  expirations: int = 0
+
+  def as_dict(self) -> Dict[str, int]:
+    return asdict(self)
+
+class TTLCache(Generic[V]):
+  """LRU cache whose entries expire after a per-entry TTL.
+
+  Entries may have a stale window after their TTL during which they are
+  still returned (flagged as stale) so callers can serve them while
+  revalidating in the background.
+  """
+  def __init__(self, max_entries: int):
+    """Initialize the cache.
+
+    Args:
+      max_entries: Maximum number of entries before the least recently used is evicted
+    """
+    self.max_entries = max_entries
+    self.stats = CacheStats()
+    self._entries: "OrderedDict[Hashable, CacheEntry[V]]" = OrderedDict()
+
+  def get(self, key: Hashable) -> Optional[CacheEntry[V]]:
+    """Look up a usable entry and mark it as recently used.
+
+    Args:
+      key: Cache key
+
+    Returns:
+      The fresh or stale entry, or None on a miss
+    """
+    now = time.monotonic()
+    entry = self._entries.get(key)
+    if entry is not None and not entry.is_usable(now):
+      del self._entries[key]
+      self.stats.expirations += 1
+      entry = None
+    if entry is None:
+      self.stats.misses += 1
+      return None
+    self._entries.move_to_end(key)
+    if entry.is_fresh(now):
+      self.stats.hits += 1
+    else:
+      self.stats.stale_hits += 1
+    return entry
+
+  def set(self, key: Hashable, value: V, ttl: float, stale_ttl: float = 0.0) -> None:
+    """Store a value.
+
+    Args:
+      key: Cache key
+      value: Value to store
+      ttl: Seconds during which the entry is fresh
+      stale_ttl: Extra seconds during which the entry may be served stale
+    """
+    now = time.monotonic()
+    self._entries[key] = CacheEntry(value=value, expires_at=now + ttl, stale_until=now + ttl + stale_ttl)
+    self._entries.move_to_end(key)
+    while len(self._entries) > self.max_entries:
+      self._entries.popitem(last=False)
+      self.stats.evictions += 1
+
+  def invalidate(self, key: Hashable) -> None:
+    """Remove an entry if present."""
+    self._entries.pop(key, None)
+
+  def clear(self) -> None:
+    """Remove all entries."""
+    self._entries.clear()
+
+  def __len__(self) -> int:
+    return len(self._entries)
@@ -16,3 +16,23 @@ def has_query_extracted_info(state: ConversationState) -> bool:
   ])
   logger.debug(f"Checking if all info extracted: {has_all_info}")
   return has_all_info
+
+def is_query_preparsed(state: ConversationState) -> bool:
+  preparsed = bool(state.get("valid_query", False)) and has_query_extracted_info(state)
+  logger.debug(f"Checking if query was pre-parsed: {preparsed}")
+  return preparsed
+
+def route_validated_query(state: ConversationState) -> str:
+  if not state.get("valid_query", False):
+    route = "invalid"
+  elif has_query_extracted_info(state):
+    route = "extracted"
+  else:
+    route = "incomplete"
+  logger.debug(f"Routing validated query: {route}")
+  return route
+
+def has_location_codes(state: ConversationState) -> bool:
+  has_codes = bool(state.get("origin_code") and state.get("destination_code"))
+  logger.debug(f"Checking if location codes resolved: {has_codes}")
+  return has_codes
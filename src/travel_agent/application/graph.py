@@ -2,57 +2,105 @@ from langgraph.graph import StateGraph, START, END
 from langgraph.prebuilt import tools_condition
 
 from travel_agent.application.state import ConversationState
-from travel_agent.application.conditions import has_valid_query, has_query_extracted_info
+from travel_agent.application.conditions import has_valid_query, has_query_extracted_info, has_location_codes, route_validated_query, is_query_preparsed
 from shared.logging import setup_logger
 
 logger = setup_logger("workflow_graph")
 
-def create_graph(workflow_nodes) -> StateGraph:  
+def create_graph(workflow_nodes, direct_location_lookup: bool = False, fused_query_validation: bool = False,
+                 rule_based_preparse: bool = False) -> StateGraph:  
+  """Build the travel agent workflow graph.
+
+  Args:
+    workflow_nodes: Node implementations
+    direct_location_lookup: Resolve origin and destination codes with direct
+      concurrent lookups, using the LLM location tool loop only as a fallback
+    fused_query_validation: Validate the query and extract its details with a
+      single LLM call, using the extractor only if details are still missing
+    rule_based_preparse: Try the rule-based query parser first and skip the
+      LLM validation and extraction when it is confident
+
+  Returns:
+    Uncompiled workflow graph
+  """
   graph = StateGraph(ConversationState)
 
   graph.add_node("location_search_tools_node", workflow_nodes.location_search_tools_node)
   graph.add_node("flight_search_tools_node", workflow_nodes.flight_search_tools_node)
-  graph.add_node("check_user_query", workflow_nodes.check_user_query)
   graph.add_node("extractor_node", workflow_nodes.extractor_node)
   graph.add_node("location_search_node", workflow_nodes.location_search_node)
-  graph.add_node("process_location_results", workflow_nodes.process_location_results)
+  graph.add_node("resolve_location_results", workflow_nodes.resolve_location_results)
   graph.add_node("flight_search_node", workflow_nodes.flight_search_node)
-  graph.add_node("process_flight_results", workflow_nodes.process_flight_results)
+  graph.add_node("rank_flight_results", workflow_nodes.rank_flight_results)
   graph.add_node("proposal_node", workflow_nodes.proposal_node)
 
-  graph.add_edge(START, "check_user_query")
-  graph.add_conditional_edges(
-    "check_user_query", has_valid_query,
-    {
-      True: "extractor_node", 
-      False: END
-    }
-  )
+  location_entry = "lookup_locations" if direct_location_lookup else "location_search_node"
+  query_entry = "validate_and_extract_node" if fused_query_validation else "check_user_query"
+  if rule_based_preparse:
+    graph.add_node("preparse_query", workflow_nodes.preparse_query)
+    graph.add_edge(START, "preparse_query")
+    graph.add_conditional_edges(
+      "preparse_query", is_query_preparsed,
+      {
+        True: location_entry,
+        False: query_entry
+      }
+    )
+  else:
+    graph.add_edge(START, query_entry)
+  if fused_query_validation:
+    graph.add_node("validate_and_extract_node", workflow_nodes.validate_and_extract_node)
+    graph.add_conditional_edges(
+      "validate_and_extract_node", route_validated_query,
+      {
+        "extracted": location_entry,
+        "incomplete": "extractor_node",
+        "invalid": END
+      }
+    )
+  else:
+    graph.add_node("check_user_query", workflow_nodes.check_user_query)
+    graph.add_conditional_edges(
+      "check_user_query", has_valid_query,
+      {
+        True: "extractor_node", 
+        False: END
+      }
+    )
   graph.add_conditional_edges(
     "extractor_node", has_query_extracted_info,
     {
-      True: "location_search_node", 
+      True: location_entry, 
       False: "extractor_node"
     }
   )
+  if direct_location_lookup:
+    graph.add_node("lookup_locations", workflow_nodes.lookup_locations)
+    graph.add_conditional_edges(
+      "lookup_locations", has_location_codes,
+      {
+        True: "flight_search_node",
+        False: "location_search_node"
+      }
+    )
   graph.add_conditional_edges(
     "location_search_node", tools_condition,
     {
       "tools": "location_search_tools_node",
-      "__end__": "process_location_results"
+      "__end__": "resolve_location_results"
     }
   )
   graph.add_edge("location_search_tools_node", "location_search_node")
-  graph.add_edge("process_location_results", "flight_search_node")
+  graph.add_edge("resolve_location_results", "flight_search_node")
   graph.add_conditional_edges(
     "flight_search_node", tools_condition,
     {
       "tools": "flight_search_tools_node", 
-      "__end__": "process_flight_results"
+      "__end__": "rank_flight_results"
     }
   )
   graph.add_edge("flight_search_tools_node", "flight_search_node")
-  graph.add_edge("process_flight_results", "proposal_node")
+  graph.add_edge("rank_flight_results", "proposal_node")
   graph.add_edge("proposal_node", END)
   
   logger.info("Travel agent workflow graph created successfully")
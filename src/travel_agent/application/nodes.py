@@ -1,46 +1,128 @@
-from typing import Any
-from langchain_core.messages import AIMessage
+import asyncio
+from typing import Any, List, Optional
+from langchain_core.messages import AIMessage, ToolMessage
 from langgraph.prebuilt import ToolNode
 from langchain_core.tools import BaseTool
 from travel_agent.application.state import ConversationState
+from flights.domain.flights_entities import BatchFlightResult, Flight, FlightSearchResult, PriceMatrix
+from flights.domain.flight_ranking import RankingWeights, rank_flights, summarize_ranking
+from locations.domain.location_entities import LocationSearchRequest, LocationSearchResult, normalize_keyword
+from locations.domain.location_resolver import resolve_location_code
+from locations.application.search_locations import SearchLocations
 from llms.domain.llm_service import LLMService
+from llms.domain.llm_entities import LLMChain, LLMChainRequest
+from llms.domain.token_usage import estimate_prompt_tokens, track_usage
+from travel_agent.domain.entities import IsValid, QueryExtractedInfo, ValidatedQueryInfo
+from travel_agent.domain.prompts import (
+  CHECK_USER_QUERY_PROMPT, EXTRACT_QUERY_INFO_PROMPT, FLIGHT_SEARCH_PROMPT, LOCATION_SEARCH_PROMPT,
+  PROCESS_FLIGHT_RESULTS_PROMPT, PROCESS_LOCATION_RESULTS_PROMPT, PROPOSE_TRAVEL_PLAN_PROMPT,
+  VALIDATE_AND_EXTRACT_QUERY_PROMPT
+)
 from shared.logging import setup_logger, log_function_call, log_function_result, log_function_error
-from shared.rate_limiter import rate_limiter
+from shared.quota_manager import quota_manager
+from shared.metrics import metrics
+from travel_agent.domain.query_parser import QueryParser
 from shared.config import Settings
 
 class WorkflowNodes:
-  def __init__(self, llm_service: LLMService, location_tool: BaseTool, flight_tool: BaseTool):
+  def __init__(self, llm_service: LLMService, location_tool: BaseTool, flight_tool: BaseTool,
+               extra_flight_tools: Optional[List[BaseTool]] = None,
+               ranking_weights: RankingWeights = RankingWeights(), ranking_limit: int = 5,
+               search_locations: Optional[SearchLocations] = None,
+               query_parser: Optional[QueryParser] = None, preparse_threshold: float = 0.9):
     self.llm_service = llm_service
+    self.query_parser = query_parser
+    self.preparse_threshold = preparse_threshold
+    self.search_locations = search_locations
+    self.ranking_weights = ranking_weights
+    self.ranking_limit = ranking_limit
     self.location_tool = location_tool
     self.flight_tool = flight_tool
+    self.flight_tools = [self.flight_tool, *(extra_flight_tools or [])]
     
     self.location_search_tools_node = ToolNode([self.location_tool])
-    self.flight_search_tools_node = ToolNode([self.flight_tool])
+    self.flight_search_tools_node = ToolNode(self.flight_tools)
+    self.chain_requests = self._build_chain_requests()
 
     self.logger = setup_logger("workflow_nodes")
+    metrics.describe("query_preparser_queries_total", "Queries seen by the rule-based parser, by outcome (hit skips the LLM)")
+    metrics.describe("query_preparser_confidence", "Confidence of the rule-based parser per query")
+    metrics.describe("query_preparser_confidence_threshold", "Confidence needed to skip the LLM validation and extraction")
+    metrics.set_gauge("query_preparser_confidence_threshold", self.preparse_threshold)
   
+  def _build_chain_requests(self) -> dict[str, LLMChainRequest]:
+    """LLM chain configuration of each node; static, so the chains can be built ahead of time."""
+    return {
+      "check_user_query": LLMChainRequest(prompt=CHECK_USER_QUERY_PROMPT.prompt, structured_output=IsValid, temperature=0.0),
+      "validate_and_extract_node": LLMChainRequest(prompt=VALIDATE_AND_EXTRACT_QUERY_PROMPT.prompt, structured_output=ValidatedQueryInfo, temperature=0.0),
+      "extractor_node": LLMChainRequest(prompt=EXTRACT_QUERY_INFO_PROMPT.prompt, structured_output=QueryExtractedInfo, temperature=0.0),
+      "location_search_node": LLMChainRequest(prompt=LOCATION_SEARCH_PROMPT.prompt, tools=[self.location_tool], temperature=0.0),
+      "process_location_results": LLMChainRequest(prompt=PROCESS_LOCATION_RESULTS_PROMPT.prompt, structured_output=LocationSearchResult, temperature=0.0),
+      "flight_search_node": LLMChainRequest(prompt=FLIGHT_SEARCH_PROMPT.prompt, tools=self.flight_tools, temperature=0.0),
+      "process_flight_results": LLMChainRequest(prompt=PROCESS_FLIGHT_RESULTS_PROMPT.prompt, structured_output=FlightSearchResult, temperature=0.0),
+      "proposal_node": LLMChainRequest(prompt=PROPOSE_TRAVEL_PLAN_PROMPT.prompt, temperature=0.0)
+    }
+
+  async def _invoke_chain(self, response_chain: LLMChain, inputs: dict[str, Any]) -> Any:
+    """Invoke a chain within the Gemini request and token quotas.
+
+    The prompt is rendered once; its tokens are estimated before admission
+    and the estimate is reconciled with the usage reported by the model.
+    """
+    prompt = await response_chain.prompt.ainvoke(inputs)
+    tokens = estimate_prompt_tokens(prompt.to_messages()) + response_chain.schema_tokens
+    reservation = await quota_manager.acquire("gemini", response_chain.model, tokens)
+    with track_usage() as usage:
+      response = await response_chain.after_prompt.ainvoke(prompt)
+    await quota_manager.reconcile(reservation, usage.input_tokens)
+    return response
+
+  async def preparse_query(self, state: ConversationState) -> dict[str, Any]:
+    """Fill the travel details with the rule-based parser when it is confident.
+
+    Returns no update otherwise, so the graph continues with the LLM
+    validation and extraction.
+    """
+    self.logger.info("Starting preparse_query node")
+    user_query = state.get("user_query", "")
+    if self.query_parser is None:
+      return {}
+
+    parsed = self.query_parser.parse(user_query)
+    hit = parsed.is_complete() and parsed.confidence >= self.preparse_threshold
+    metrics.observe("query_preparser_confidence", parsed.confidence)
+    metrics.increment("query_preparser_queries_total", outcome="hit" if hit else "miss")
+    log_function_result(self.logger, "preparse_query", {
+      "confidence": parsed.confidence,
+      "hit": hit,
+      "issues": parsed.issues
+    })
+    if not hit:
+      return {}
+    return {
+      "valid_query": True,
+      "budget": parsed.budget,
+      "origin": parsed.origin,
+      "destination": parsed.destination,
+      "start_date": parsed.start_date,
+      "end_date": parsed.end_date,
+      "messages": [AIMessage(content=f"Extracted: {parsed.origin} -> {parsed.destination} ({parsed.start_date} to {parsed.end_date})")]
+    }
+
   async def check_user_query(self, state: ConversationState) -> dict[str, Any]:
     self.logger.info("Starting check_user_query node")
     log_function_call(self.logger, "check_user_query", {"user_query": state.get("user_query", "")})
 
-    from travel_agent.domain.prompts import CHECK_USER_QUERY_PROMPT
-    from llms.domain.llm_entities import LLMChainRequest
-    from travel_agent.domain.entities import IsValid
-    
     user_query = state.get("user_query", "")
     
-    chain_request = LLMChainRequest(
-      prompt=CHECK_USER_QUERY_PROMPT.prompt,
-      structured_output=IsValid,
-      temperature=0.0,
-    )
+    chain_request = self.chain_requests["check_user_query"]
     
-    await rate_limiter.wait_if_needed("check_user_query")
     response_chain = await self.llm_service.get_chain(chain_request)
     try:
       self.logger.info("Invoking response chain")
       log_function_call(self.logger, "invoke_response_chain", {"user_query": user_query})
-      response = await response_chain.chain.ainvoke(
+      response = await self._invoke_chain(
+        response_chain,
         {
           "messages": state["messages"],
           "user_query": user_query
@@ -57,25 +139,59 @@ class WorkflowNodes:
       log_function_error(self.logger, "invoke_response_chain", e, {"user_query": user_query})
       raise
 
+  async def validate_and_extract_node(self, state: ConversationState) -> dict[str, Any]:
+    """Validate the user query and extract its travel details with a single LLM call."""
+    self.logger.info("Starting validate_and_extract_node")
+    log_function_call(self.logger, "validate_and_extract_node", {"user_query": state.get("user_query", "")})
+
+    user_query = state.get("user_query", "")
+
+    chain_request = self.chain_requests["validate_and_extract_node"]
+
+    response_chain = await self.llm_service.get_chain(chain_request)
+    try:
+      self.logger.info("Invoking response chain for query validation and extraction")
+      response = await self._invoke_chain(
+        response_chain,
+        {
+          "messages": state["messages"],
+          "user_query": user_query
+        }
+      )
+      log_function_result(self.logger, "validate_and_extract_node", {"response": str(response)})
+      valid = response.is_valid == 'True'
+      result = {
+        "valid_query": valid,
+        "reason": response.reason,
+        "user_query": user_query
+      }
+      if valid:
+        result.update({
+          "budget": response.budget,
+          "origin": response.origin,
+          "destination": response.destination,
+          "start_date": response.start_date,
+          "end_date": response.end_date,
+          "messages": [AIMessage(content=f"Extracted: {response.origin} -> {response.destination} ({response.start_date} to {response.end_date})")]
+        })
+      else:
+        result["messages"] = [AIMessage(content=response.reason or "")]
+      return result
+    except Exception as e:
+      log_function_error(self.logger, "validate_and_extract_node", e, {"user_query": user_query})
+      raise
+
   async def extractor_node(self,state: ConversationState) -> dict[str, Any]:
     self.logger.info("Starting extractor_node")
     log_function_call(self.logger, "extractor_node", {"messages_count": len(state.get("messages", []))})
     
-    from travel_agent.domain.prompts import EXTRACT_QUERY_INFO_PROMPT
-    from llms.domain.llm_entities import LLMChainRequest
-    from travel_agent.domain.entities import QueryExtractedInfo
+    chain_request = self.chain_requests["extractor_node"]
     
-    chain_request = LLMChainRequest(
-      prompt=EXTRACT_QUERY_INFO_PROMPT.prompt,
-      structured_output=QueryExtractedInfo,
-      temperature=0.0,
-    )
-    
-    await rate_limiter.wait_if_needed("extractor_node")  
     response_chain = await self.llm_service.get_chain(chain_request)
     try:
       self.logger.info("Invoking response chain for query information extraction")
-      response = await response_chain.chain.ainvoke(
+      response = await self._invoke_chain(
+        response_chain,
         {
           "messages": state["messages"],
           "user_query": state["user_query"]
@@ -104,6 +220,46 @@ class WorkflowNodes:
       log_function_error(self.logger, "extractor_node", e, {"messages_count": len(state.get("messages", []))})
       return {"messages": [AIMessage(content=f"Error: {e}")]}
       
+  async def _lookup_location_code(self, city: str) -> Optional[str]:
+    """Search one city and pick its code, None if the lookup fails or is ambiguous."""
+    try:
+      locations = await self.search_locations.execute(LocationSearchRequest(city=city))
+    except Exception as e:
+      self.logger.warning(f"Direct location lookup failed for {city}: {e}")
+      return None
+    return resolve_location_code(city, locations) if locations else None
+
+  async def lookup_locations(self, state: ConversationState) -> dict[str, Any]:
+    """Resolve origin and destination codes concurrently, without an LLM call.
+
+    Leaves the codes unset when either lookup fails or is ambiguous, so the
+    graph can fall back to the LLM tool loop.
+    """
+    self.logger.info("Starting lookup_locations")
+    log_function_call(self.logger, "lookup_locations", {
+      "origin": state.get("origin"),
+      "destination": state.get("destination")
+    })
+    if self.search_locations is None:
+      return {}
+
+    origin_code, destination_code = await asyncio.gather(
+      self._lookup_location_code(state.get("origin") or ""),
+      self._lookup_location_code(state.get("destination") or "")
+    )
+    log_function_result(self.logger, "lookup_locations", {
+      "origin_code": origin_code,
+      "destination_code": destination_code
+    })
+    if not origin_code or not destination_code:
+      self.logger.info("Direct location lookup incomplete, falling back to the location search tool loop")
+      return {}
+    return {
+      "origin_code": origin_code,
+      "destination_code": destination_code,
+      "messages": [AIMessage(content=f"origin_code='{origin_code}' destination_code='{destination_code}'")]
+    }
+
   async def location_search_node(self, state: ConversationState) -> dict[str, Any]:
     self.logger.info("Starting location_search_node")
     log_function_call(self.logger, "location_search_node", {
@@ -112,21 +268,13 @@ class WorkflowNodes:
       "messages_count": len(state.get("messages", []))
     })
     
-    from travel_agent.domain.prompts import LOCATION_SEARCH_PROMPT
-    from llms.domain.llm_entities import LLMChainRequest
-    
-    chain_request = LLMChainRequest(
-      prompt=LOCATION_SEARCH_PROMPT.prompt,
-      tools=[self.location_tool],
-      temperature=0.0,
-    )
-    
-    await rate_limiter.wait_if_needed("location_search_node")
+    chain_request = self.chain_requests["location_search_node"]
     
     response_chain = await self.llm_service.get_chain(chain_request)
     try:
       self.logger.info("Invoking response chain for location search")
-      response = await response_chain.chain.ainvoke(
+      response = await self._invoke_chain(
+        response_chain,
         {
           "messages": state["messages"],
           "origin": state.get("origin"),
@@ -152,28 +300,66 @@ class WorkflowNodes:
       })
       return {"messages": [AIMessage(content=f"Error: {e}")]}
     
+  def _location_artifacts(self, state: ConversationState) -> dict:
+    """Map each searched city (normalized) to the locations the tool returned for it."""
+    searched = {}
+    for message in state.get("messages", []):
+      for tool_call in getattr(message, "tool_calls", None) or []:
+        if tool_call["name"] == self.location_tool.name:
+          searched[tool_call["id"]] = tool_call["args"].get("city", "")
+
+    results = {}
+    for message in state.get("messages", []):
+      if isinstance(message, ToolMessage) and message.tool_call_id in searched and message.artifact is not None:
+        results[normalize_keyword(searched[message.tool_call_id])] = message.artifact
+    return results
+
+  async def resolve_location_results(self, state: ConversationState) -> dict[str, Any]:
+    """Pick origin and destination codes from the location tool results.
+
+    The codes are chosen deterministically when the results are
+    unambiguous; otherwise the LLM-based process_location_results decides.
+    """
+    self.logger.info("Starting resolve_location_results")
+    log_function_call(self.logger, "resolve_location_results", {
+      "origin": state.get("origin"),
+      "destination": state.get("destination")
+    })
+
+    results = self._location_artifacts(state)
+    codes = {}
+    for field in ("origin", "destination"):
+      city = state.get(field) or ""
+      locations = results.get(normalize_keyword(city))
+      codes[field] = resolve_location_code(city, locations) if locations else None
+
+    if not codes["origin"] or not codes["destination"]:
+      self.logger.info(f"Ambiguous location results {codes}, falling back to LLM processing")
+      return await self.process_location_results(state)
+
+    log_function_result(self.logger, "resolve_location_results", {
+      "origin_code": codes["origin"],
+      "destination_code": codes["destination"]
+    })
+    return {
+      "origin_code": codes["origin"],
+      "destination_code": codes["destination"],
+      "messages": [AIMessage(content=f"origin_code='{codes['origin']}' destination_code='{codes['destination']}'")]
+    }
+
   async def process_location_results(self, state: ConversationState) -> dict[str, Any]:
     self.logger.info("Starting process_location_results")
     log_function_call(self.logger, "process_location_results", {
       "messages_count": len(state.get("messages", []))
     })
     
-    from travel_agent.domain.prompts import PROCESS_LOCATION_RESULTS_PROMPT
-    from llms.domain.llm_entities import LLMChainRequest
-    from locations.domain.location_entities import LocationSearchResult
-    
-    chain_request = LLMChainRequest(
-      prompt=PROCESS_LOCATION_RESULTS_PROMPT.prompt,
-      structured_output=LocationSearchResult,
-      temperature=0.0,
-    )
-    
-    await rate_limiter.wait_if_needed("process_location_results")
+    chain_request = self.chain_requests["process_location_results"]
     
     response_chain = await self.llm_service.get_chain(chain_request)
     try:
       self.logger.info("Invoking response chain for location results processing")
-      response = await response_chain.chain.ainvoke(
+      response = await self._invoke_chain(
+        response_chain,
         {
           "messages": state["messages"],
           "origin_code": state.get("origin_code"),
@@ -209,20 +395,12 @@ class WorkflowNodes:
       "messages_count": len(state.get("messages", []))
     })
     
-    from travel_agent.domain.prompts import FLIGHT_SEARCH_PROMPT
-    from llms.domain.llm_entities import LLMChainRequest
-    
-    chain_request = LLMChainRequest(
-      prompt=FLIGHT_SEARCH_PROMPT.prompt,
-      tools=[self.flight_tool],
-      temperature=0.0,
-    )
-    await rate_limiter.wait_if_needed("flight_search_node")
-    
+    chain_request = self.chain_requests["flight_search_node"]
     response_chain = await self.llm_service.get_chain(chain_request)
     try:
       self.logger.info("Invoking response chain for flight search")
-      response = await response_chain.chain.ainvoke(
+      response = await self._invoke_chain(
+        response_chain,
         {
           "messages": state["messages"],
           "origin_code": str(state.get("origin_code")),
@@ -254,27 +432,66 @@ class WorkflowNodes:
       })
       return {"messages": [AIMessage(content=f"Error: {e}")]}
 
+  def _flight_artifacts(self, state: ConversationState) -> Optional[List[Flight]]:
+    """Collect the flights returned as artifacts by the flight tools.
+
+    Returns:
+      The flights, or None if no flight tool message carried an artifact
+    """
+    tool_names = {tool.name for tool in self.flight_tools}
+    flights: Optional[List[Flight]] = None
+    for message in state.get("messages", []):
+      if not isinstance(message, ToolMessage) or message.name not in tool_names or message.artifact is None:
+        continue
+      flights = flights if flights is not None else []
+      artifact = message.artifact
+      if isinstance(artifact, PriceMatrix):
+        flights.extend(cell.flight for cell in artifact.cells if cell.flight)
+      elif isinstance(artifact, BatchFlightResult):
+        flights.extend(artifact.flights)
+      else:
+        flights.extend(artifact)
+    return flights
+
+  async def rank_flight_results(self, state: ConversationState) -> dict[str, Any]:
+    """Rank the flight tool results deterministically and summarize them.
+
+    Falls back to the LLM-based process_flight_results when the tool
+    results are not available as artifacts.
+    """
+    self.logger.info("Starting rank_flight_results")
+    log_function_call(self.logger, "rank_flight_results", {
+      "messages_count": len(state.get("messages", []))
+    })
+
+    flights = self._flight_artifacts(state)
+    if flights is None:
+      self.logger.info("No flight artifacts found, falling back to LLM processing")
+      return await self.process_flight_results(state)
+
+    ranked = rank_flights(flights, self.ranking_weights)
+    summary = summarize_ranking(ranked[:self.ranking_limit], total=len(ranked))
+    log_function_result(self.logger, "rank_flight_results", {
+      "flights_count": len(flights),
+      "unique_count": len(ranked)
+    })
+    return {
+      "flight_results": summary,
+      "messages": [AIMessage(content=summary)]
+    }
+
   async def process_flight_results(self, state: ConversationState) -> dict[str, Any]:
     self.logger.info("Starting process_flight_results")
     log_function_call(self.logger, "process_flight_results", {
       "messages_count": len(state.get("messages", []))
     })
     
-    from travel_agent.domain.prompts import PROCESS_FLIGHT_RESULTS_PROMPT
-    from llms.domain.llm_entities import LLMChainRequest
-    from flights.domain.flights_entities import FlightSearchResult
-    
-    chain_request = LLMChainRequest(
-      prompt=PROCESS_FLIGHT_RESULTS_PROMPT.prompt,
-      structured_output=FlightSearchResult,
-      temperature=0.0,
-    )
-    await rate_limiter.wait_if_needed("process_flight_results")
-    
+    chain_request = self.chain_requests["process_flight_results"]
     response_chain = await self.llm_service.get_chain(chain_request)
     try:
       self.logger.info("Invoking response chain for flight results processing")
-      response = await response_chain.chain.ainvoke(
+      response = await self._invoke_chain(
+        response_chain,
         {
           "messages": state["messages"],
           "flight_results": state.get("flight_results")
@@ -307,19 +524,12 @@ class WorkflowNodes:
       "messages_count": len(state.get("messages", []))
     })
     
-    from travel_agent.domain.prompts import PROPOSE_TRAVEL_PLAN_PROMPT
-    from llms.domain.llm_entities import LLMChainRequest
-    
-    chain_request = LLMChainRequest(
-      prompt=PROPOSE_TRAVEL_PLAN_PROMPT.prompt,
-      temperature=0.0,
-    ) 
-    await rate_limiter.wait_if_needed("proposal_node")
-    
+    chain_request = self.chain_requests["proposal_node"]
     response_chain = await self.llm_service.get_chain(chain_request)
     try:
       self.logger.info("Invoking response chain for travel proposal generation")
-      response = await response_chain.chain.ainvoke(
+      response = await self._invoke_chain(
+        response_chain,
         {
           "messages": state["messages"],
           "budget": str(state["budget"]),
@@ -13,4 +13,14 @@ class QueryExtractedInfo(BaseModel):
   origin: str = Field(description="The origin city or location (e.g., 'New York', 'Medellin')")
   destination: str = Field(description="The destination city or location (e.g., 'Paris', 'Tokyo')")
   start_date: str = Field(description="The departure date. Format: YYYY-MM-DD")
-  end_date: str = Field(description="The return date. Format: YYYY-MM-DD")
\ No newline at end of file
+  end_date: str = Field(description="The return date. Format: YYYY-MM-DD")
+
+class ValidatedQueryInfo(BaseModel):
+  """Validation result and extracted travel information from user queries."""
+  is_valid: str = Field(description="The validity of the user's query. It can be 'True' or 'False'.")
+  reason: Optional[str] = Field(default=None, description="What is missing from the query when it is not valid.")
+  budget: Optional[Union[float, str]] = Field(default=None, description="The maximum price (optional). If not mentioned, set this to null.")
+  origin: Optional[str] = Field(default=None, description="The origin city or location (e.g., 'New York', 'Medellin'). If not mentioned, set this to null.")
+  destination: Optional[str] = Field(default=None, description="The destination city or location (e.g., 'Paris', 'Tokyo'). If not mentioned, set this to null.")
+  start_date: Optional[str] = Field(default=None, description="The departure date. Format: YYYY-MM-DD. If not mentioned, set this to null.")
+  end_date: Optional[str] = Field(default=None, description="The return date. Format: YYYY-MM-DD. If not mentioned, set this to null.")
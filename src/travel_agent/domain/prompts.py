@@ -38,6 +38,20 @@ When you have all the information, you must output it *only* in the `QueryExtrac
 """
 EXTRACT_QUERY_INFO_PROMPT = Prompt("EXTRACT_QUERY_INFO_PROMPT", EXTRACT_QUERY_INFO_PROMPT_MESSAGE)
 
+VALIDATE_AND_EXTRACT_QUERY_PROMPT_MESSAGE = """
+You are a travel query validator and information extraction agent. Your task is to check the user's query and extract its travel details in one step: {{user_query}}.
+Scan the user's messages for the following four pieces of information:
+1. `origin`: The origin city or location (e.g., 'New York', 'Medellin').
+2. `destination`: The destination city or location (e.g., 'Paris', 'Tokyo').
+3. `start_date`: The departure date, formatted as YYYY-MM-DD.
+4. `end_date`: The return date, formatted as YYYY-MM-DD.
+A **budget** is optional and not required for validation; extract it when mentioned.
+- If all four pieces of information are present, set `is_valid` to 'True' and fill in every field.
+- If *any* of the four pieces of information are missing, set `is_valid` to 'False', provide a `reason` explaining *exactly* what is missing, and fill in the fields that are present.
+You must respond *only* with the `ValidatedQueryInfo` structured output format. Do not add any conversational text.
+"""
+VALIDATE_AND_EXTRACT_QUERY_PROMPT = Prompt("VALIDATE_AND_EXTRACT_QUERY_PROMPT", VALIDATE_AND_EXTRACT_QUERY_PROMPT_MESSAGE)
+
 LOCATION_SEARCH_PROMPT_MESSAGE = """
 You are a location code specialist. Your goal is to find the IATA city codes for the origin and destination provided by the user: {{origin}} - {{destination}}.
 
@@ -76,6 +90,8 @@ FLIGHT_SEARCH_PROMPT_MESSAGE = """
   2. Use the start and end dates to search for flight options: {{start_date}} - {{end_date}}.
   3. Use the max price to search for flight options: {{budget}}.
   4. Use the flight_search tool to search for flight options for the user's trip.
+     If the user's dates are approximate or flexible (e.g. "around mid-March"), call the flexible_date_flight_search tool once instead of calling flight_search for several dates.
+     If the user accepts several origin or destination airports, or wants to compare destinations, call the flight_batch_search tool once with all of them instead of calling flight_search for each route.
   5. From the tool results, select the top 3-5 most relevant flight options.
   6. Present the results clearly showing the flight options.
   Do not add any conversational text.
@@ -0,0 +1,188 @@
+"""Rule-based parsing of travel queries with a predictable shape.
+
+Handles queries such as "from Madrid to Paris, 2025-03-01 to 2025-03-10,
+under $800" or "flights to Tokyo from London next friday for 7 days"
+without an LLM. Each query gets a confidence score. The LLM validation and
+extraction steps are skipped only when the score reaches the configured
+threshold.
+"""
+import re
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Callable, List, Optional, Tuple
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+_ISO_DATE = re.compile(r"\b(\d{4})-(\d{2})-(\d{2})\b")
+_RELATIVE_DATE = re.compile(
+  r"\b(?:(?P<today>today)|(?P<after>day after tomorrow)|(?P<tomorrow>tomorrow)"
+  r"|in (?P<count>\d+) (?P<unit>days?|weeks?)"
+  r"|next (?P<weekday>" + "|".join(WEEKDAYS) + r")|(?P<next_week>next week))\b"
+)
+_STAY = re.compile(r"\bfor (?P<count>\d+) (?P<unit>days?|nights?|weeks?)\b")
+_LIMIT = r"\b(?:under|below|less than|(?:no|not) more than|max(?:imum)?|budget(?: of)?|up to|at most)"
+_UNITS = (
+  r"(?:stops?|layovers?|connections?|hours?|hrs?|h\b|minutes?|mins?|passengers?|adults?|child(?:ren)?|kids?|infants?"
+  r"|people|persons?|travell?ers?|nights?|days?|weeks?|bags?|seats?|tickets?)"
+)
+_CURRENCIES = r"(?:€|£|¥|₹|eur|euros?|gbp|pounds?|jpy|yen|inr|rupees?|chf|francs?|cad|aud|mxn|pesos?)"
+_AMOUNT = r"(?P<{name}>\d[\d,]*(?:\.\d+)?)(?:\s*(?P<{name}_thousands>k|thousand)\b)?"
+# Amounts after "under", "max"... are quantities, not prices, when a unit follows ("max 1 stop");
+# any other letter right after the number ("1.5m") is a suffix the rules cannot read, and
+# "up to 2025-03-10" is a date
+_NOT_DATE = r"(?![\d,.]*-\d)"
+_NOT_PRICE = r"(?!\d)" + _NOT_DATE + r"(?![\d,.]*[^\W\d_])(?![\d,.]*\s*(?:" + _UNITS + "|" + _CURRENCIES + "))"
+_BUDGET = re.compile(
+  r"(?:" + _LIMIT + r"\s*(?:usd|us\$|\$)?\s*" + _AMOUNT.format(name="amount") + _NOT_PRICE + ")"
+  r"|(?:\$\s*" + _AMOUNT.format(name="dollars") + r"(?![\d,.]*[^\W\d_]))"
+  r"|(?:\b" + _AMOUNT.format(name="usd") + r"\s*(?:usd|dollars)\b)"
+)
+_LIMITED_AMOUNT = re.compile(_LIMIT + r"\s*(?:usd|us\$|\$)?\s*\d+" + _NOT_DATE)
+_QUANTITY_LIMIT = re.compile(
+  _LIMIT + r"\s*\d[\d,.]*\s*" + _UNITS
+  + r"|\b\d[\d,.]*\s*" + _UNITS + r"\s*(?:max(?:imum)?|at most|or (?:less|fewer)|tops)\b"
+  + r"|\b\d+\s*(?:stops?|layovers?|connections?)\b"
+)
+_OTHER_CURRENCY = re.compile(r"[€£¥₹]|\b" + _CURRENCIES + r"\b")
+# Wording that amends an earlier part of the query, which the rules cannot apply
+_CORRECTION = re.compile(
+  r"\b(?:actually|instead|rather|scratch that|i mean|correction|change (?:it|that)|make it|wait|sorry|"
+  r"no,? (?:to|from)|not (?:to|from))\b"
+)
+_CITY = r"(?P<{name}>[^\W\d_][\w .'-]*?)"
+_CITY_END = r"(?=\s*(?:[,.;!?]|$|\s(?:on|from|to|between|departing|leaving|returning|for|under|below|with|in|next|tomorrow|today|and|max|budget|up)\b|\s\d))"
+_FROM_TO = re.compile(r"\bfrom\s+" + _CITY.format(name="origin") + r"\s+to\s+" + _CITY.format(name="destination") + _CITY_END)
+_TO_FROM = re.compile(r"\bto\s+" + _CITY.format(name="destination") + r"\s+from\s+" + _CITY.format(name="origin") + _CITY_END)
+
+@dataclass
+class ParsedQuery:
+  """Travel details recognized in a query, with the parser's confidence (0-1)."""
+  origin: Optional[str] = None
+  destination: Optional[str] = None
+  start_date: Optional[str] = None
+  end_date: Optional[str] = None
+  budget: Optional[float] = None
+  confidence: float = 0.0
+  issues: List[str] = field(default_factory=list)
+
+  def is_complete(self) -> bool:
+    """Whether every required field was recognized."""
+    return all([self.origin, self.destination, self.start_date, self.end_date])
+
+class QueryParser:
+  """Deterministic parser for travel queries."""
+  def __init__(self, is_known_location: Optional[Callable[[str], bool]] = None, today: Optional[Callable[[], date]] = None):
+    """Initialize the parser.
+
+    Args:
+      is_known_location: Tells whether a city name is a known location;
+        without it, cities cannot be verified and confidence stays low
+      today: Returns the reference date of relative dates
+    """
+    self.is_known_location = is_known_location
+    self.today = today or date.today
+
+  def _relative_date(self, match: re.Match, today: date) -> date:
+    if match.group("today"):
+      return today
+    if match.group("tomorrow"):
+      return today + timedelta(days=1)
+    if match.group("after"):
+      return today + timedelta(days=2)
+    if match.group("count"):
+      days = int(match.group("count")) * (7 if match.group("unit").startswith("week") else 1)
+      return today + timedelta(days=days)
+    if match.group("weekday"):
+      ahead = (WEEKDAYS.index(match.group("weekday")) - today.weekday()) % 7 or 7
+      return today + timedelta(days=ahead)
+    return today + timedelta(days=7 - today.weekday())
+
+  def _dates(self, text: str, today: date) -> List[Tuple[int, date]]:
+    found = []
+    for match in _ISO_DATE.finditer(text):
+      try:
+        found.append((match.start(), date(int(match.group(1)), int(match.group(2)), int(match.group(3)))))
+      except ValueError:
+        continue
+    for match in _RELATIVE_DATE.finditer(text):
+      found.append((match.start(), self._relative_date(match, today)))
+    return sorted(found)
+
+  def _city_score(self, city: Optional[str]) -> float:
+    if not city:
+      return 0.0
+    if self.is_known_location is None or not self.is_known_location(city):
+      return 0.1
+    return 0.25
+
+  def parse(self, query: str) -> ParsedQuery:
+    """Parse a query into travel details.
+
+    Args:
+      query: User query
+
+    Returns:
+      Recognized details and the parser's confidence
+    """
+    text = " ".join(query.split())
+    lowered = text.lower()
+    today = self.today()
+    parsed = ParsedQuery()
+
+    routes = [*_FROM_TO.finditer(text), *_TO_FROM.finditer(text)]
+    match = routes[0] if routes else None
+    if match:
+      parsed.origin = match.group("origin").strip()
+      parsed.destination = match.group("destination").strip()
+
+    dates = self._dates(lowered, today)
+    stay = _STAY.search(lowered)
+    if dates:
+      start = dates[0][1]
+      end = dates[1][1] if len(dates) > 1 else None
+      if end is None and stay:
+        count = int(stay.group("count"))
+        end = start + timedelta(days=count * 7 if stay.group("unit").startswith("week") else count)
+      parsed.start_date = start.isoformat()
+      parsed.end_date = end.isoformat() if end else None
+
+    other_currency = _OTHER_CURRENCY.search(lowered)
+    budget = _BUDGET.search(lowered)
+    if budget and not other_currency:
+      name = next(name for name in ("amount", "dollars", "usd") if budget.group(name))
+      parsed.budget = float(budget.group(name).replace(",", ""))
+      if budget.group(f"{name}_thousands"):
+        parsed.budget *= 1000
+
+    confidence = self._city_score(parsed.origin) + self._city_score(parsed.destination)
+    if parsed.start_date:
+      confidence += 0.25
+    if parsed.end_date:
+      confidence += 0.25
+    if parsed.start_date and parsed.start_date < today.isoformat():
+      parsed.issues.append("start date is in the past")
+      confidence -= 0.25
+    if parsed.start_date and parsed.end_date and parsed.end_date < parsed.start_date:
+      parsed.issues.append("end date is before start date")
+      confidence -= 0.25
+    if len(dates) > 2:
+      parsed.issues.append("more than two dates mentioned")
+      confidence -= 0.25
+    if parsed.origin and parsed.destination and parsed.origin.casefold() == parsed.destination.casefold():
+      parsed.issues.append("origin and destination are the same")
+      confidence -= 0.5
+    if other_currency:
+      parsed.issues.append("budget in a currency other than USD")
+      confidence -= 0.5
+    quantity_limit = _QUANTITY_LIMIT.search(lowered)
+    if quantity_limit:
+      parsed.issues.append("query limits stops, duration or passengers")
+      confidence -= 0.5
+    if parsed.budget is None and not other_currency and not quantity_limit and _LIMITED_AMOUNT.search(lowered):
+      parsed.issues.append("budget amount not understood")
+      confidence -= 0.5
+    if _CORRECTION.search(lowered) or len(routes) > 1:
+      parsed.issues.append("query corrects or repeats its route")
+      confidence -= 0.5
+    parsed.confidence = round(max(confidence, 0.0), 2)
+    return parsed
@@ -2,11 +2,23 @@
 from llms.infrastructure.google_service import GoogleService
 from locations.infrastructure.search_locations_tools import SearchLocationTools
 from flights.infrastructure.search_flights_tools import SearchFlightsTools
+from flights.infrastructure.search_flexible_dates_tools import SearchFlexibleDatesTools
+from flights.infrastructure.search_flights_batch_tools import SearchFlightsBatchTools
 from locations.application.search_locations import SearchLocations
 from flights.application.search_flights import SearchFlights
+from flights.application.search_flexible_dates import SearchFlexibleDates
 from locations.infrastructure.search_locations_repository import SearchLocationsRepository
+from locations.infrastructure.cached_locations_repository import CachedLocationRepository
+from locations.infrastructure.sqlite_location_cache import SQLiteLocationCache
+from locations.infrastructure.offline_locations_repository import OfflineLocationRepository
+from locations.infrastructure.location_index import DEFAULT_SOURCE_PATH, load_location_index
+from locations.domain.location_repository import LocationRepository
 from flights.infrastructure.search_flights_repository import SearchFlightsRepository
+from flights.infrastructure.cached_flights_repository import CachedFlightRepository
+from flights.domain.flights_repository import FlightRepository
+from travel_agent.domain.query_parser import QueryParser
 from amadeus.infrastructure.amadeus_client import AmadeusClient
+from shared.config import settings
 from shared.logging import setup_logger
 
 logger = setup_logger("dependency_container")
@@ -17,6 +29,13 @@ class DependencyContainer:
     """Initialize the dependency container."""
     self._amadeus_client = None
     self._llm_service = None
+    self._location_repository = None
+    self._offline_location_repository = None
+    self._flight_repository = None
+    self._search_locations = None
+    self._search_flights = None
+    self._search_flexible_dates = None
+    self._query_parser = None
     
     logger.info("Initializing dependency container")
   
@@ -42,6 +61,73 @@ class DependencyContainer:
         self._llm_service = GoogleService()
     return self._llm_service
   
+  def get_location_repository(self) -> LocationRepository:
+    """Get or create the location repository.
+    
+    Shared so that concurrent requests coalesce identical location searches
+    and reuse the persistent location cache.
+    
+    Returns:
+      Singleton location repository, cached when LOCATION_CACHE_ENABLED is set
+    """
+    if self._location_repository is None:
+        logger.info("Creating SearchLocationsRepository")
+        repository = SearchLocationsRepository(self.get_amadeus_client())
+        if settings.LOCATION_CACHE_ENABLED:
+          logger.info("Wrapping location repository with CachedLocationRepository")
+          repository = CachedLocationRepository(
+            repository,
+            cache=SQLiteLocationCache(settings.LOCATION_CACHE_PATH, max_memory_entries=settings.LOCATION_CACHE_MEMORY_MAX_ENTRIES),
+            ttl_seconds=settings.LOCATION_CACHE_TTL_DAYS * 24 * 3600,
+            negative_ttl_seconds=settings.LOCATION_CACHE_NEGATIVE_TTL_SECONDS
+          )
+          if settings.LOCATION_CACHE_WARM_LOAD:
+            repository.warm_load()
+        self._location_repository = repository
+    return self._location_repository
+  
+  def get_offline_location_repository(self) -> OfflineLocationRepository:
+    """Get or create the offline location repository.
+    
+    Builds the location index on first use if it is missing or outdated.
+    
+    Returns:
+      Singleton OfflineLocationRepository instance
+    """
+    if self._offline_location_repository is None:
+        logger.info("Loading offline location index")
+        index = load_location_index(
+          settings.LOCATION_INDEX_PATH,
+          source_path=settings.LOCATION_INDEX_SOURCE_PATH or DEFAULT_SOURCE_PATH,
+          fuzzy_cutoff=settings.LOCATION_INDEX_FUZZY_CUTOFF
+        )
+        self._offline_location_repository = OfflineLocationRepository(index)
+    return self._offline_location_repository
+  
+  def get_flight_repository(self) -> FlightRepository:
+    """Get or create the flight repository.
+    
+    Shared so that concurrent requests coalesce identical flight searches
+    and reuse cached results.
+    
+    Returns:
+      Singleton flight repository, cached when FLIGHT_CACHE_ENABLED is set
+    """
+    if self._flight_repository is None:
+        logger.info("Creating SearchFlightsRepository")
+        repository = SearchFlightsRepository(self.get_amadeus_client())
+        if settings.FLIGHT_CACHE_ENABLED:
+          logger.info("Wrapping flight repository with CachedFlightRepository")
+          repository = CachedFlightRepository(
+            repository,
+            max_entries=settings.FLIGHT_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.FLIGHT_CACHE_TTL_SECONDS,
+            stale_seconds=settings.FLIGHT_CACHE_STALE_SECONDS,
+            negative_ttl_seconds=settings.FLIGHT_CACHE_NEGATIVE_TTL_SECONDS
+          )
+        self._flight_repository = repository
+    return self._flight_repository
+  
   def get_location_tool(self):
     """Create a location search tool.
     
@@ -50,12 +136,46 @@ class DependencyContainer:
     """
     logger.info("Creating location search tool provider")
     
-    amadeus_client = self.get_amadeus_client()
+    return SearchLocationTools(self.get_search_locations())
+  
+  def get_search_locations(self) -> SearchLocations:
+    """Get or create the location search use case.
+    
+    Returns:
+      Singleton SearchLocations instance, backed by the offline index when enabled
+    """
+    if self._search_locations is None:
+        logger.info("Creating SearchLocations use case")
+        if settings.LOCATION_INDEX_ENABLED:
+          offline_repository = self.get_offline_location_repository()
+          # Exact index hits first, then Amadeus, and fuzzy index matches only
+          # when Amadeus knows no such city either.
+          self._search_locations = SearchLocations(
+            offline_repository,
+            fallback_repository=self.get_location_repository(),
+            last_resort_repository=OfflineLocationRepository(offline_repository.index, fuzzy=True)
+          )
+        else:
+          self._search_locations = SearchLocations(self.get_location_repository())
+    return self._search_locations
+  
+  def get_query_parser(self) -> QueryParser:
+    """Get or create the rule-based query parser.
     
-    repository = SearchLocationsRepository(amadeus_client)
-    service = SearchLocations(repository)
+    Cities are verified against the offline location index when it is
+    enabled; otherwise the parser cannot reach a high confidence.
     
-    return SearchLocationTools(service)
+    Returns:
+      Singleton QueryParser instance
+    """
+    if self._query_parser is None:
+        logger.info("Creating QueryParser")
+        is_known_location = None
+        if settings.LOCATION_INDEX_ENABLED:
+          index = self.get_offline_location_repository().index
+          is_known_location = lambda name: bool(index.lookup(name, fuzzy=False))
+        self._query_parser = QueryParser(is_known_location=is_known_location)
+    return self._query_parser
   
   def get_flight_tool(self):
     """Create a flight search tool.
@@ -65,12 +185,68 @@ class DependencyContainer:
     """
     logger.info("Creating flight search tool provider")
     
-    amadeus_client = self.get_amadeus_client()
+    return SearchFlightsTools(self.get_search_flights())
+  
+  def get_search_flights(self) -> SearchFlights:
+    """Get or create the flight search use case.
+    
+    Shared so that the batch search concurrency budget is global.
+    
+    Returns:
+      Singleton SearchFlights instance
+    """
+    if self._search_flights is None:
+        logger.info("Creating SearchFlights use case")
+        self._search_flights = SearchFlights(
+          self.get_flight_repository(),
+          max_concurrency=settings.FLIGHT_BATCH_MAX_CONCURRENCY,
+          max_batch_routes=settings.FLIGHT_BATCH_MAX_ROUTES
+        )
+    return self._search_flights
+  
+  def get_flight_batch_tool(self):
+    """Create a multi-route batch flight search tool.
+    
+    Returns:
+      Configured batch flight search tool
+    """
+    logger.info("Creating batch flight search tool provider")
+    
+    return SearchFlightsBatchTools(self.get_search_flights())
+  
+  def get_flexible_date_flight_tool(self):
+    """Create a flexible-date flight search tool.
+    
+    The use case is shared so that its concurrency cap applies across requests.
+    
+    Returns:
+      Configured flexible-date flight search tool
+    """
+    logger.info("Creating flexible-date flight search tool provider")
     
-    repository = SearchFlightsRepository(amadeus_client)
-    service = SearchFlights(repository)
+    if self._search_flexible_dates is None:
+        self._search_flexible_dates = SearchFlexibleDates(
+          self.get_flight_repository(),
+          max_concurrency=settings.FLEXIBLE_SEARCH_MAX_CONCURRENCY
+        )
     
-    return SearchFlightsTools(service)
+    return SearchFlexibleDatesTools(self._search_flexible_dates)
+
+  async def aclose(self) -> None:
+    """Release the connections and files held by the shared dependencies.
+    
+    The container must not be used afterwards.
+    """
+    logger.info("Closing dependency container")
+    if self._amadeus_client is not None:
+        await self._amadeus_client.aclose()
+    if self._llm_service is not None:
+        await self._llm_service.aclose()
+    cache = getattr(self._location_repository, "cache", None)
+    if cache is not None:
+        cache.close()
+    if self._offline_location_repository is not None:
+        self._offline_location_repository.index.close()
 
 _container = None
 
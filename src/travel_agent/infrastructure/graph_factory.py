@@ -1,16 +1,30 @@
+from typing import Optional
+from langgraph.graph.state import CompiledStateGraph
 from travel_agent.application.graph import create_graph
-from travel_agent.infrastructure.dependency_injection import get_container
+from travel_agent.infrastructure.dependency_injection import DependencyContainer, get_container
 from travel_agent.infrastructure.workflow_factory import create_travel_agent_workflow
+from shared.config import settings
 
-def get_compiled_graph():
-  container = get_container()
+def get_compiled_graph(container: Optional[DependencyContainer] = None) -> CompiledStateGraph:
+  """Build the workflow nodes and compile the travel agent graph.
   
-  nodes = create_travel_agent_workflow(container)
+  Compiling is a startup cost: callers keep the compiled graph and share it
+  across requests.
   
-  graph = create_graph(nodes)
-  compiled_graph = graph.compile()
+  Args:
+    container: Dependency container (global container if omitted)
+    
+  Returns:
+    Compiled travel agent graph
+  """
+  container = container or get_container()
   
-  from IPython.display import Image, display  
-  display(Image(compiled_graph.get_graph(xray=True).draw_mermaid_png()))
+  nodes = create_travel_agent_workflow(container)
   
-  return compiled_graph
\ No newline at end of file
+  graph = create_graph(
+    nodes,
+    direct_location_lookup=settings.LOCATION_DIRECT_LOOKUP,
+    fused_query_validation=settings.FUSED_QUERY_VALIDATION,
+    rule_based_preparse=settings.QUERY_PREPARSER_ENABLED
+  )
+  return graph.compile()
@@ -0,0 +1,39 @@
+"""Render the travel agent graph offline.
+
+Usage:
+  python -m travel_agent.infrastructure.render_graph --output graph.mmd
+  python -m travel_agent.infrastructure.render_graph --output graph.png
+
+Mermaid source is rendered locally. PNG rendering goes through the
+mermaid.ink service, as LangGraph does by default.
+"""
+import argparse
+from pathlib import Path
+from travel_agent.infrastructure.graph_factory import get_compiled_graph
+
+def render_graph(output: Path, xray: bool = True) -> Path:
+  """Write the compiled graph as Mermaid source or a PNG image.
+  
+  Args:
+    output: Destination file; a .png suffix renders an image
+    xray: Whether to expand subgraphs
+    
+  Returns:
+    Path of the written file
+  """
+  drawable = get_compiled_graph().get_graph(xray=xray)
+  if output.suffix.lower() == ".png":
+    output.write_bytes(drawable.draw_mermaid_png())
+  else:
+    output.write_text(drawable.draw_mermaid(), encoding="utf-8")
+  return output
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description="Render the travel agent workflow graph.")
+  parser.add_argument("--output", type=Path, default=Path("graph.mmd"), help="Output file (.mmd or .png)")
+  parser.add_argument("--no-xray", action="store_true", help="Do not expand subgraphs")
+  args = parser.parse_args()
+  print(render_graph(args.output, xray=not args.no_xray))
+
+if __name__ == "__main__":
+  main()
@@ -1,5 +1,7 @@
 from travel_agent.application.nodes import WorkflowNodes
 from travel_agent.infrastructure.dependency_injection import DependencyContainer
+from flights.domain.flight_ranking import RankingWeights
+from shared.config import settings
 from shared.logging import setup_logger
 
 logger = setup_logger("workflow_factory")
@@ -10,8 +12,21 @@ def create_travel_agent_workflow(container: DependencyContainer) -> WorkflowNode
   nodes = WorkflowNodes(
       llm_service=container.get_llm_service(),  
       location_tool=container.get_location_tool(),
-      flight_tool=container.get_flight_tool()
+      search_locations=container.get_search_locations(),
+      flight_tool=container.get_flight_tool(),
+      extra_flight_tools=[container.get_flexible_date_flight_tool(), container.get_flight_batch_tool()],
+      ranking_weights=RankingWeights(
+        price=settings.FLIGHT_RANKING_PRICE_WEIGHT,
+        duration=settings.FLIGHT_RANKING_DURATION_WEIGHT,
+        stops=settings.FLIGHT_RANKING_STOPS_WEIGHT
+      ),
+      ranking_limit=settings.FLIGHT_RANKING_MAX_RESULTS,
+      query_parser=container.get_query_parser(),
+      preparse_threshold=settings.QUERY_PREPARSER_CONFIDENCE_THRESHOLD
   )
   
+  if settings.LLM_CHAIN_CACHE_ENABLED:
+    container.get_llm_service().warm_up(nodes.chain_requests.values())
+  
   logger.info("Travel agent workflow created successfully")
   return nodes
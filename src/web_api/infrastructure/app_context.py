@@ -0,0 +1,114 @@
+"""Application context shared by every API request.
+
+Only the standard library and the settings are imported here. The graph,
+the LLM stack and the tracing client are imported when the context is
+prepared. Startup is therefore cheap when LAZY_STARTUP defers that work to
+a background task.
+"""
+import asyncio
+from typing import TYPE_CHECKING, Optional
+from shared.config import settings
+from shared.logging import setup_logger
+
+if TYPE_CHECKING:
+  from langgraph.graph.state import CompiledStateGraph
+  from travel_agent.infrastructure.dependency_injection import DependencyContainer
+  from web_api.infrastructure.handle_request import HandleRequest
+
+logger = setup_logger("app_context")
+
+class AppContext:
+  """Compiled graph and dependencies built once per process."""
+  def __init__(self):
+    """Initialize an empty context; call start() to prepare it."""
+    self.container: Optional["DependencyContainer"] = None
+    self.graph: Optional["CompiledStateGraph"] = None
+    self.handler: Optional["HandleRequest"] = None
+    self._preparing: Optional[asyncio.Task] = None
+    self._background: set[asyncio.Task] = set()
+
+  @classmethod
+  async def start(cls, lazy: Optional[bool] = None) -> "AppContext":
+    """Create the context.
+    
+    The Langfuse handshake always runs in the background. The graph and the
+    Gemini connection are ready on return in eager mode. In lazy mode they
+    are prepared by a background task that the first request waits for.
+    
+    Args:
+      lazy: Defer the preparation to a background task (LAZY_STARTUP if omitted)
+      
+    Returns:
+      Application context
+    """
+    lazy = settings.LAZY_STARTUP if lazy is None else lazy
+    logger.info(f"Starting application context ({'lazy' if lazy else 'eager'})")
+    context = cls()
+    context._spawn(context._warm_up_tracing())
+    context._preparing = asyncio.create_task(context._prepare())
+    if not lazy:
+      await context._preparing
+    return context
+
+  def _spawn(self, coroutine) -> None:
+    task = asyncio.create_task(coroutine)
+    self._background.add(task)
+    task.add_done_callback(self._background.discard)
+
+  async def _warm_up_tracing(self) -> None:
+    from observability.infrastructure.langfuse_client import warm_up_langfuse
+    await warm_up_langfuse()
+
+  def _build(self) -> None:
+    """Import the application stack and compile the graph (blocking)."""
+    from travel_agent.infrastructure.dependency_injection import get_container
+    from travel_agent.infrastructure.graph_factory import get_compiled_graph
+    from web_api.infrastructure.handle_request import HandleRequest
+
+    container = get_container()
+    graph = get_compiled_graph(container)
+    self.container, self.graph, self.handler = container, graph, HandleRequest(graph)
+
+  async def _prepare(self) -> None:
+    """Build the dependencies, compile the graph and warm up connections."""
+    try:
+      # Imports and compilation are CPU-bound; keep the event loop free for other requests
+      await asyncio.to_thread(self._build)
+      container = self.container
+      if settings.GEMINI_WARM_UP_ENABLED:
+        await container.get_llm_service().warm_up_connections()
+    except Exception as e:
+      logger.error(f"Application context preparation failed: {e}")
+      raise
+    logger.info("Application context ready")
+
+  @property
+  def ready(self) -> bool:
+    """Whether the graph is compiled."""
+    return self.handler is not None
+
+  async def get_handler(self) -> "HandleRequest":
+    """Return the request handler, waiting for the preparation if needed.
+    
+    A failed preparation is retried by the next request.
+    
+    Returns:
+      Request handler sharing the compiled graph
+    """
+    if self.handler is None:
+      failed = self._preparing is not None and self._preparing.done() and (self._preparing.cancelled() or self._preparing.exception() is not None)
+      if self._preparing is None or failed:
+        self._preparing = asyncio.create_task(self._prepare())
+      await asyncio.shield(self._preparing)
+    return self.handler
+
+  async def aclose(self) -> None:
+    """Cancel the background work and release the connections held by the dependencies."""
+    logger.info("Closing application context")
+    for task in [self._preparing, *self._background]:
+      if task is not None and not task.done():
+        task.cancel()
+    if self.container is not None:
+      await self.container.aclose()
+    from shared.rate_limit_backends import aclose_rate_limit_backend
+    await aclose_rate_limit_backend()
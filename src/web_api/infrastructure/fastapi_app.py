@@ -1,29 +1,57 @@
 """FastAPI application for the Travel Agent API."""
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
 import uvicorn
 from shared.logging import setup_logger
-
-app = FastAPI(title="Travel Agent API")
+from shared.metrics import metrics
 
 logger = setup_logger("web_api")
-from web_api.infrastructure.handle_request import HandleRequest
+from web_api.infrastructure.app_context import AppContext
 from web_api.domain.entities import APIRequest
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+  """Build the application context once and release it on shutdown."""
+  app.state.context = await AppContext.start()
+  try:
+    yield
+  finally:
+    await app.state.context.aclose()
+
+app = FastAPI(title="Travel Agent API", lifespan=lifespan)
+
 @app.post("/generate-response")
-async def generate_response_endpoint(user_query: str):
+async def generate_response_endpoint(user_query: str, http_request: Request):
   """Generate a response to a user query using the travel agent.
   
   Args:
     user_query: The user's travel query
+    http_request: Incoming HTTP request, giving access to the application context
     
   Returns:
     Dictionary containing the response and state
   """
-  use_case = HandleRequest()
+  use_case = await http_request.app.state.context.get_handler()
   request = APIRequest(user_query=user_query)
   result = await use_case.execute(request)
   return {"response": result.response, "state": result.state}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+  """Expose the application metrics in the Prometheus text format."""
+  return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
-  logger.info("Starting FastAPI application")
-  uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+  import argparse
+  parser = argparse.ArgumentParser(description="Travel Agent API")
+  parser.add_argument("--profile-startup", action="store_true", help="Print the import-time hotspots of the app and exit")
+  parser.add_argument("--top", type=int, default=20, help="Entries per section of the startup profile")
+  args = parser.parse_args()
+  if args.profile_startup:
+    from shared.startup_profile import format_report, profile_imports
+    module = "web_api.infrastructure.fastapi_app"
+    print(format_report(module, profile_imports(module), top=args.top))
+  else:
+    logger.info("Starting FastAPI application")
+    uvicorn.run(app, host="0.0.0.0", port=8000)
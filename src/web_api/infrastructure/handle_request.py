@@ -1,16 +1,20 @@
 """Request handler for web API."""
 from web_api.domain.entities import APIRequest, APIResponse
-from travel_agent.infrastructure.graph_factory import get_compiled_graph
+from langgraph.graph.state import CompiledStateGraph
 from travel_agent.application.state import ConversationState
-from observability.infrastructure.langfuse_client import langfuse_handler
+from observability.infrastructure.langfuse_client import get_langfuse_handler
 from shared.logging import setup_logger, log_function_call, log_function_result, log_function_error
 from langchain_core.messages import HumanMessage
 
 class HandleRequest:
   """Handles incoming API requests and processes them through the travel agent workflow."""
-  def __init__(self):
-    """Initialize the request handler with the compiled workflow graph."""
-    self.graph = get_compiled_graph()
+  def __init__(self, graph: CompiledStateGraph):
+    """Initialize the request handler.
+    
+    Args:
+      graph: Compiled workflow graph, shared across requests
+    """
+    self.graph = graph
     self.logger = setup_logger("web_api_handle_request")
     
   async def execute(self, request: APIRequest) -> APIResponse:
@@ -50,7 +54,7 @@ class HandleRequest:
       output  = await self.graph.ainvoke(
         input=initial_state,
         config={
-          "callbacks": [langfuse_handler]
+          "callbacks": [get_langfuse_handler()]
         }
       )
       response = output["messages"][-1]
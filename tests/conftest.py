@@ -0,0 +1,5 @@
+"""Shared pytest configuration: make the ``src`` packages importable."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
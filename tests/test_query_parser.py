@@ -0,0 +1,109 @@
+"""Table-driven tests of the rule-based query parser."""
+from datetime import date
+import pytest
+from travel_agent.domain.query_parser import QueryParser
+
+# Wednesday
+TODAY = date(2025, 1, 1)
+KNOWN_LOCATIONS = {"madrid", "paris", "london", "tokyo", "new york"}
+THRESHOLD = 0.9
+
+@pytest.fixture
+def parser():
+  return QueryParser(is_known_location=lambda city: city.casefold() in KNOWN_LOCATIONS, today=lambda: TODAY)
+
+@pytest.mark.parametrize("query, origin, destination, start_date, end_date, budget", [
+  ("from Madrid to Paris, 2025-03-01 to 2025-03-10, under $800", "Madrid", "Paris", "2025-03-01", "2025-03-10", 800.0),
+  ("flights to Tokyo from London next friday for 7 days", "London", "Tokyo", "2025-01-03", "2025-01-10", None),
+  ("from New York to London tomorrow for 2 weeks", "New York", "London", "2025-01-02", "2025-01-16", None),
+  ("from Madrid to Paris in 3 days for 5 nights, budget 1,200", "Madrid", "Paris", "2025-01-04", "2025-01-09", 1200.0),
+  ("from Madrid to Paris today to next week", "Madrid", "Paris", "2025-01-01", "2025-01-06", None),
+  ("from Madrid to Paris 2025-03-01 to 2025-03-10 up to 900 usd", "Madrid", "Paris", "2025-03-01", "2025-03-10", 900.0),
+  ("from Madrid to Paris 2025-03-01 to 2025-03-10, 750 dollars", "Madrid", "Paris", "2025-03-01", "2025-03-10", 750.0),
+  ("from  Madrid   to Paris 2025-03-01 to 2025-03-10 for 2 adults", "Madrid", "Paris", "2025-03-01", "2025-03-10", None),
+  ("from Madrid to Paris 2025-03-01 to 2025-03-10 under 1.5k", "Madrid", "Paris", "2025-03-01", "2025-03-10", 1500.0),
+  ("from Madrid to Paris 2025-03-01 to 2025-03-10 under $2k", "Madrid", "Paris", "2025-03-01", "2025-03-10", 2000.0),
+  ("from Madrid to Paris 2025-03-01 to 2025-03-10, budget 3 thousand", "Madrid", "Paris", "2025-03-01", "2025-03-10", 3000.0),
+  ("from Madrid to Paris 2025-03-01 to 2025-03-10, no more than $700", "Madrid", "Paris", "2025-03-01", "2025-03-10", 700.0),
+  ("from Madrid to Paris 2025-03-01 up to 2025-03-10", "Madrid", "Paris", "2025-03-01", "2025-03-10", None),
+])
+def test_well_formed_queries_skip_the_llm(parser, query, origin, destination, start_date, end_date, budget):
+  parsed = parser.parse(query)
+
+  assert (parsed.origin, parsed.destination, parsed.start_date, parsed.end_date, parsed.budget) == (
+    origin, destination, start_date, end_date, budget
+  )
+  assert parsed.is_complete()
+  assert parsed.issues == []
+  assert parsed.confidence >= THRESHOLD
+
+@pytest.mark.parametrize("query, issue", [
+  ("from Madrid to Madrid 2025-03-01 to 2025-03-10", "origin and destination are the same"),
+  ("from Madrid to Paris 2024-03-01 to 2024-03-10", "start date is in the past"),
+  ("from Madrid to Paris 2025-03-10 to 2025-03-01", "end date is before start date"),
+  ("from Madrid to Paris 2025-03-01, 2025-03-05 or 2025-03-10", "more than two dates mentioned"),
+  ("from Madrid to Paris 2025-03-01 to 2025-03-10, actually to London", "query corrects or repeats its route"),
+  ("from Madrid to Paris 2025-03-01 to 2025-03-10 or from Madrid to London", "query corrects or repeats its route"),
+  ("from Madrid to Paris 2025-03-01 to 2025-03-10 under 1.5m", "budget amount not understood"),
+])
+def test_suspicious_queries_go_to_the_llm(parser, query, issue):
+  parsed = parser.parse(query)
+
+  assert issue in parsed.issues
+  assert parsed.confidence < THRESHOLD
+
+@pytest.mark.parametrize("query", [
+  "I want to go somewhere warm",
+  "from Madrid to Paris on 2025-03-01",
+  "from Madrid to Atlantis 2025-03-01 to 2025-03-10",
+  "from Madrid to Paris 2025-02-30 to 2025-03-10",
+  "Madrid Paris March",
+])
+def test_incomplete_or_unverified_queries_go_to_the_llm(parser, query):
+  assert parser.parse(query).confidence < THRESHOLD
+
+def test_cities_cannot_be_verified_without_a_location_lookup():
+  parsed = QueryParser(today=lambda: TODAY).parse("from Madrid to Paris 2025-03-01 to 2025-03-10")
+
+  assert parsed.is_complete()
+  assert parsed.confidence < THRESHOLD
+
+@pytest.mark.parametrize("query", [
+  "from Madrid to Paris 2025-03-01 to 2025-03-10 max 2 stops",
+  "from Madrid to Paris 2025-03-01 to 2025-03-10 max 1 stop",
+  "from Madrid to Paris 2025-03-01 to 2025-03-10 under 10 hours",
+  "from Madrid to Paris 2025-03-01 to 2025-03-10 under 10h",
+  "from Madrid to Paris 2025-03-01 to 2025-03-10 at most 3 passengers",
+  "from Madrid to Paris 2025-03-01 to 2025-03-10 up to 2 layovers",
+  "from Madrid to Paris 2025-03-01 to 2025-03-10 maximum 1 connection",
+  "from Madrid to Paris 2025-03-01 to 2025-03-10 with 2 stops max",
+  "from Madrid to Paris 2025-03-01 to 2025-03-10 with 1 stop",
+  "from Madrid to Paris 2025-03-01 to 2025-03-10, 12 hours or less",
+  "from Madrid to Paris 2025-03-01 to 2025-03-10 no more than 1 layover",
+])
+def test_quantity_limits_are_not_read_as_budgets(parser, query):
+  parsed = parser.parse(query)
+
+  assert parsed.budget is None
+  assert "query limits stops, duration or passengers" in parsed.issues
+  assert parsed.confidence < THRESHOLD
+
+def test_quantity_limit_next_to_a_dollar_budget_keeps_the_budget(parser):
+  parsed = parser.parse("from Madrid to Paris 2025-03-01 to 2025-03-10 max 1 stop, under $900")
+
+  assert parsed.budget == 900.0
+  assert parsed.confidence < THRESHOLD
+
+@pytest.mark.parametrize("query", [
+  "from Madrid to Paris 2025-03-01 to 2025-03-10 under 500 euros",
+  "from Madrid to Paris 2025-03-01 to 2025-03-10 under €500",
+  "from Madrid to Paris 2025-03-01 to 2025-03-10 budget £400",
+  "from Madrid to Paris 2025-03-01 to 2025-03-10 max 900 EUR",
+  "from Madrid to Paris 2025-03-01 to 2025-03-10 up to 20000 yen",
+])
+def test_foreign_currency_budgets_are_left_to_the_llm(parser, query):
+  parsed = parser.parse(query)
+
+  assert parsed.budget is None
+  assert "budget in a currency other than USD" in parsed.issues
+  assert parsed.confidence < THRESHOLD
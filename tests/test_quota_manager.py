@@ -0,0 +1,46 @@
+"""Tests of the quota manager's admission schedule."""
+import asyncio
+import pytest
+from shared.quota_manager import QuotaLimits, QuotaManager
+from shared.rate_limit_backends import MemoryRateLimitBackend
+
+MAX_REQUESTS = 10
+WINDOW_SECONDS = 60.0
+HEADROOM = 0.95
+
+def _scheduled_waits(monkeypatch, calls: int, burst_ratio: float) -> list:
+  """Seconds each of a run of back-to-back calls waits before it is sent."""
+  waits = []
+  async def record_sleep(delay):
+    waits[-1] = delay
+  monkeypatch.setattr(asyncio, "sleep", record_sleep)
+  manager = QuotaManager(
+    limits={"upstream": QuotaLimits(max_requests=MAX_REQUESTS, window_seconds=WINDOW_SECONDS)},
+    backend=MemoryRateLimitBackend(), headroom=HEADROOM, burst_ratio=burst_ratio
+  )
+  async def run():
+    for _ in range(calls):
+      waits.append(0.0)
+      await manager.acquire("upstream", "model")
+  asyncio.run(run())
+  return waits
+
+@pytest.mark.parametrize("burst_ratio", [0.0, 0.2, 0.5])
+def test_steady_throughput_matches_the_quota_after_headroom(monkeypatch, burst_ratio):
+  waits = _scheduled_waits(monkeypatch, 200, burst_ratio)
+
+  steady = [wait for wait in waits if 5 * WINDOW_SECONDS <= wait < 15 * WINDOW_SECONDS]
+  assert len(steady) / 10 == pytest.approx(MAX_REQUESTS * HEADROOM, abs=0.2)
+  assert waits[-1] - waits[-2] == pytest.approx(WINDOW_SECONDS / (MAX_REQUESTS * HEADROOM), rel=0.01)
+
+def test_one_query_worth_of_calls_goes_out_back_to_back(monkeypatch):
+  waits = _scheduled_waits(monkeypatch, 5, 0.5)
+
+  assert waits[:4] == [0.0] * 4
+  assert waits[4] < 2.0
+
+def test_without_burst_calls_are_spaced_at_the_sustained_rate(monkeypatch):
+  waits = _scheduled_waits(monkeypatch, 3, 0.0)
+
+  assert waits[0] == 0.0
+  assert waits[1] == pytest.approx(WINDOW_SECONDS / (MAX_REQUESTS * HEADROOM), abs=0.05)
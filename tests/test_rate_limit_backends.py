@@ -0,0 +1,89 @@
+"""Tests of the rate limit backends against a temporary SQLite file and fakeredis."""
+import asyncio
+from pathlib import Path
+import pytest
+from shared import config
+from shared.rate_limit_backends import MemoryRateLimitBackend, RedisRateLimitBackend, SQLiteRateLimitBackend
+
+INTERVAL = 1.0
+BURST = 3
+TOLERANCE = (BURST - 1) * INTERVAL
+
+def _memory_backend(tmp_path):
+  return MemoryRateLimitBackend()
+
+def _sqlite_backend(tmp_path):
+  return SQLiteRateLimitBackend(tmp_path / "rate_limits.sqlite3")
+
+def _sqlite_backend_without_returning(tmp_path):
+  backend = SQLiteRateLimitBackend(tmp_path / "rate_limits.sqlite3")
+  backend._supports_returning = False
+  return backend
+
+def _redis_backend(tmp_path):
+  fakeredis = pytest.importorskip("fakeredis")
+  pytest.importorskip("lupa")
+  return RedisRateLimitBackend(key_prefix="test:", client=fakeredis.FakeAsyncRedis())
+
+BACKENDS = [_memory_backend, _sqlite_backend, _sqlite_backend_without_returning, _redis_backend]
+
+async def _reserve_many(backend, count, cost=1.0):
+  try:
+    return [await backend.reserve("key", INTERVAL, TOLERANCE, cost) for _ in range(count)]
+  finally:
+    await backend.aclose()
+
+@pytest.mark.parametrize("make_backend", BACKENDS)
+def test_burst_is_admitted_then_requests_are_spaced_at_the_sustained_rate(make_backend, tmp_path):
+  waits = asyncio.run(_reserve_many(make_backend(tmp_path), BURST + 3))
+
+  assert waits[:BURST] == [0.0] * BURST
+  for extra, wait in enumerate(waits[BURST:], start=1):
+    assert wait == pytest.approx(extra * INTERVAL, abs=0.05)
+
+@pytest.mark.parametrize("make_backend", BACKENDS)
+def test_cost_advances_the_arrival_time_by_several_intervals(make_backend, tmp_path):
+  waits = asyncio.run(_reserve_many(make_backend(tmp_path), 3, cost=2.0))
+
+  assert waits[0] == 0.0
+  assert waits[1] == 0.0
+  assert waits[2] == pytest.approx(4 * INTERVAL - TOLERANCE, abs=0.05)
+
+@pytest.mark.parametrize("make_backend", BACKENDS)
+def test_refund_gives_capacity_back(make_backend, tmp_path):
+  async def scenario(backend):
+    try:
+      for _ in range(BURST):
+        await backend.reserve("key", INTERVAL, TOLERANCE, 1.0)
+      await backend.refund("key", INTERVAL, 1.0)
+      return await backend.reserve("key", INTERVAL, TOLERANCE, 1.0)
+    finally:
+      await backend.aclose()
+
+  assert asyncio.run(scenario(make_backend(tmp_path))) == 0.0
+
+def test_sqlite_limits_are_shared_between_connections(tmp_path):
+  async def scenario():
+    first = SQLiteRateLimitBackend(tmp_path / "rate_limits.sqlite3")
+    second = SQLiteRateLimitBackend(tmp_path / "rate_limits.sqlite3")
+    try:
+      waits = [await backend.reserve("key", INTERVAL, TOLERANCE, 1.0) for backend in (first, second) * 2]
+    finally:
+      await first.aclose()
+      await second.aclose()
+    return waits
+
+  waits = asyncio.run(scenario())
+
+  assert waits[:BURST] == [0.0] * BURST
+  assert waits[BURST] == pytest.approx(INTERVAL, abs=0.05)
+
+def test_sqlite_relative_path_is_resolved_against_the_project_root(tmp_path, monkeypatch):
+  monkeypatch.setattr(config, "PROJECT_ROOT", tmp_path / "project")
+  monkeypatch.chdir(tmp_path)
+  backend = SQLiteRateLimitBackend(Path("cache/rate_limits.sqlite3"))
+  try:
+    assert backend.path == tmp_path / "project" / "cache" / "rate_limits.sqlite3"
+    assert backend.path.exists()
+  finally:
+    asyncio.run(backend.aclose())
@@ -0,0 +1,55 @@
+"""Tests of the SQLite location cache's in-memory layer and path handling."""
+from pathlib import Path
+from shared import config
+from locations.domain.location_entities import Location
+from locations.infrastructure.sqlite_location_cache import SQLiteLocationCache
+
+PARIS = [Location(name="Paris", iata_code="PAR", country="FR", subtype="CITY")]
+
+def test_memory_layer_keeps_only_the_most_recently_used_entries(tmp_path):
+  cache = SQLiteLocationCache(tmp_path / "locations.sqlite3", max_memory_entries=2)
+  try:
+    for keyword in ("paris", "lyon", "nice"):
+      cache.set(keyword, PARIS, ttl_seconds=60)
+
+    assert cache.get_cached("paris") is None
+    assert cache.get_cached("nice") == PARIS
+    assert cache.get("paris") == PARIS
+  finally:
+    cache.close()
+
+def test_expired_entries_are_dropped_on_read(tmp_path):
+  cache = SQLiteLocationCache(tmp_path / "locations.sqlite3")
+  try:
+    cache.set("paris", PARIS, ttl_seconds=-1)
+
+    assert cache.get_cached("paris") is None
+    assert cache.get_cached("paris") is None
+    assert len(cache._memory) == 0
+    assert cache.get("paris") is None
+  finally:
+    cache.close()
+
+def test_warm_load_fills_the_memory_layer_up_to_its_limit(tmp_path):
+  path = tmp_path / "locations.sqlite3"
+  writer = SQLiteLocationCache(path)
+  for keyword, ttl in (("paris", 60), ("lyon", 120), ("nice", 180)):
+    writer.set(keyword, PARIS, ttl_seconds=ttl)
+  writer.close()
+
+  cache = SQLiteLocationCache(path, max_memory_entries=2)
+  try:
+    assert cache.warm_load() == 2
+    assert cache.get_cached("paris") is None
+    assert cache.get_cached("nice") == PARIS
+  finally:
+    cache.close()
+
+def test_relative_path_is_resolved_against_the_project_root(tmp_path, monkeypatch):
+  monkeypatch.setattr(config, "PROJECT_ROOT", tmp_path / "project")
+  monkeypatch.chdir(tmp_path)
+  cache = SQLiteLocationCache(Path("cache/locations.sqlite3"))
+  try:
+    assert cache.path == tmp_path / "project" / "cache" / "locations.sqlite3"
+  finally:
+    cache.close()